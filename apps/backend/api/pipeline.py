@@ -0,0 +1,145 @@
+import asyncio
+import base64
+import json
+import logging
+import time
+from typing import Optional
+
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from config import config
+from api.pose_generation import fetch_pose
+from api.simplify_text import simplify
+from api.transcribe import transcribe_upload_segments
+from services.segmentation import split_sentences
+
+# SignWriting translation is optional (see main.py); without it the pipeline skips that stage
+try:
+    from api.signwriting_translation_pytorch import translate_texts
+except ImportError:
+    translate_texts = None
+
+router = APIRouter()
+
+
+def _error_detail(exc: Exception) -> str:
+    return exc.detail if isinstance(exc, HTTPException) else str(exc)
+
+
+class _PipelineRun:
+    """Runs the per-segment stages and collects their events in completion order."""
+
+    def __init__(self, simplify_text: bool, generate_pose: bool, spoken_language: str, signed_language: str):
+        self.simplify_text = simplify_text
+        self.generate_pose = generate_pose
+        self.spoken_language = spoken_language
+        self.signed_language = signed_language
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.started = time.perf_counter()
+        self._slots = asyncio.Semaphore(config.PIPELINE_MAX_CONCURRENT_SEGMENTS)
+
+    def emit(self, stage: str, **payload) -> None:
+        elapsed_ms = round((time.perf_counter() - self.started) * 1000, 1)
+        self.events.put_nowait({"stage": stage, "elapsed_ms": elapsed_ms, **payload})
+
+    async def run_segment(self, index: int, text: str) -> None:
+        """Carry one segment through simplify -> translate -> pose.
+
+        Segments run concurrently, so while one segment waits on Groq another
+        can be translating; concurrent translations share a model batch.
+        """
+        async with self._slots:
+            stage = "simplify"
+            try:
+                if self.simplify_text:
+                    text = await simplify(text) or text
+                    self.emit("simplify", index=index, text=text)
+
+                stage = "translate"
+                if translate_texts is not None:
+                    signwriting = (await translate_texts([text]))[0]
+                    self.emit("translate", index=index, signwriting=signwriting)
+
+                stage = "pose"
+                if self.generate_pose and (config.POSE_API_URL or config.POSE_ENGINE != "remote"):
+                    pose_data = await fetch_pose(text, self.spoken_language, self.signed_language)
+                    self.emit(
+                        "pose",
+                        index=index,
+                        pose_data=base64.b64encode(pose_data).decode("utf-8"),
+                        data_format="binary_base64",
+                    )
+            except Exception as exc:
+                logging.warning(f"Pipeline {stage} failed for segment {index}: {exc}")
+                self.emit("error", index=index, failed_stage=stage, detail=_error_detail(exc))
+
+
+@router.post("/pipeline")
+async def pipeline(
+    audio: Optional[UploadFile] = File(None),
+    text: Optional[str] = Form(None),
+    simplify_text: bool = Form(False),
+    generate_pose: bool = Form(True),
+    spoken_language: str = Form("en"),
+    signed_language: str = Form("ase"),
+):
+    """
+    Run audio/text -> simplify -> SignWriting -> pose in one request.
+
+    Send either an `audio` file or `text`. The response is newline-delimited
+    JSON: one event per stage per sentence, written as soon as it is ready,
+    ending with a `done` event.
+    """
+    if audio is None and not (text and text.strip()):
+        raise HTTPException(status_code=400, detail="Provide an audio file or text.")
+    contents = await audio.read() if audio is not None else None
+    filename = audio.filename if audio is not None else None
+    run = _PipelineRun(simplify_text, generate_pose, spoken_language, signed_language)
+
+    async def produce() -> None:
+        if contents is not None:
+            try:
+                transcript = await transcribe_upload_segments(contents, filename)
+            except Exception as exc:
+                run.emit("error", failed_stage="transcribe", detail=_error_detail(exc))
+                return
+            run.emit("transcribe", text=transcript["text"])
+            # Whisper's own segments carry their position on the audio timeline
+            segments = [
+                {
+                    "index": i,
+                    "text": s["text"],
+                    "start": s["text_start"],
+                    "end": s["text_end"],
+                    "audio_start": s["start"],
+                    "audio_end": s["end"],
+                }
+                for i, s in enumerate(transcript["segments"])
+            ]
+        else:
+            segments = [
+                {"index": i, "text": s.text, "start": s.start, "end": s.end}
+                for i, s in enumerate(split_sentences(text))
+            ]
+
+        run.emit("segments", segments=segments)
+        await asyncio.gather(*(run.run_segment(s["index"], s["text"]) for s in segments))
+
+    async def stream():
+        producer = asyncio.create_task(produce())
+        # Marks the end of the event stream once every stage has finished
+        producer.add_done_callback(lambda _: run.events.put_nowait(None))
+        try:
+            while True:
+                event = await run.events.get()
+                if event is None:
+                    break
+                yield json.dumps(event) + "\n"
+            if not producer.cancelled() and producer.exception() is not None:
+                yield json.dumps({"stage": "error", "detail": str(producer.exception())}) + "\n"
+            yield json.dumps({"stage": "done", "elapsed_ms": round((time.perf_counter() - run.started) * 1000, 1)}) + "\n"
+        finally:
+            # The client went away (or we finished): stop any remaining work
+            producer.cancel()
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
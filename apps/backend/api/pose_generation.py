@@ -1,45 +1,262 @@
-import requests
-from fastapi import APIRouter, HTTPException
+import base64
+import json
+import logging
+from contextlib import AsyncExitStack
+from typing import List, Optional, Tuple
+import httpx
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from config import config
+from services.cache import get_cache, make_key, normalize_text
+from services.executors import inference_pool
+from services.http_client import pose_api
+from services.pose_lexicon import get_pose_lexicon
+from services.pose_synthesis import MissingSigns, lexicon_keys, synthesize_pose
+from services.segmentation import split_sentences
+from services.metrics import span
+from services.singleflight import get_singleflight
+from services.speculation import speculation
+
+# The offline engine needs the SignWriting translator (optional, see main.py)
+try:
+    from api.signwriting_translation_pytorch import translate_texts
+except ImportError:
+    translate_texts = None
 
 router = APIRouter()
 
+# Lists the FSW signs the offline engine skipped because the lexicon lacks them
+MISSING_SIGNS_HEADER = "X-Pose-Missing-Signs"
+# Accept values that opt in to raw pose bytes instead of the JSON/base64 envelope
+BINARY_MEDIA_TYPES = ("application/pose", "application/octet-stream")
+
 class PoseRequest(BaseModel):
     text: str
     spoken_language: str = "en"
     signed_language: str = "ase"
+    request_id: Optional[str] = None  # claims work started early by /simplify_text
+
+def speculation_key(text: str, spoken_language: str, signed_language: str) -> str:
+    return make_key(normalize_text(text), spoken_language, signed_language)
+
+def _pose_cache_key(text: str, spoken_language: str, signed_language: str) -> str:
+    return make_key(config.POSE_API_URL, spoken_language, signed_language, text)
+
+def _pose_params(text: str, spoken_language: str, signed_language: str) -> dict:
+    return {
+        'text': text,
+        'spoken': spoken_language,
+        'signed': signed_language
+    }
+
+def _offline_lexicon(spoken_language: str, signed_language: str):
+    """The lexicon to synthesize with, or None when the offline engine does not apply."""
+    if config.POSE_ENGINE not in ("offline", "auto"):
+        return None
+    lexicon = get_pose_lexicon()
+    usable = (
+        lexicon is not None
+        and translate_texts is not None
+        and spoken_language == config.SIGNWRITING_SPOKEN_LANGUAGE
+        and signed_language == config.SIGNWRITING_SIGNED_LANGUAGE == lexicon.signed_language
+    )
+    if usable:
+        return lexicon
+    if config.POSE_ENGINE == "offline":
+        raise HTTPException(
+            status_code=503,
+            detail=f"Offline pose generation is not available for {spoken_language} -> {signed_language}.",
+        )
+    return None
+
+def _uncoverable(detail: str, allow_missing: bool) -> None:
+    """Offline mode has nothing to fall back to; auto mode uses the pose API (None)."""
+    if allow_missing:
+        raise HTTPException(status_code=422, detail=detail)
+    return None
+
+async def _offline_pose(text: str, spoken_language: str, signed_language: str) -> Optional[Tuple[bytes, List[str]]]:
+    """Translate text to SignWriting and build the pose from the local sign lexicon.
+
+    Returns the pose and the signs skipped because the lexicon lacks them, or
+    None (so the caller falls back to the pose API) when the engine is "auto"
+    and the lexicon cannot be used or does not cover every sign.
+    """
+    lexicon = _offline_lexicon(spoken_language, signed_language)
+    if lexicon is None:
+        return None
+    allow_missing = config.POSE_ENGINE == "offline"
+    cache = get_cache("generate_pose")
+    cache_key = make_key("offline", str(lexicon.path), allow_missing, spoken_language, signed_language, text)
+    missing_key = make_key(cache_key, "missing")
+    # Set when the lexicon cannot cover the text, so it is not translated again on every request
+    uncoverable_key = make_key(cache_key, "uncoverable")
+    pose_data = await cache.aget(cache_key)
+    missing = await cache.aget(missing_key) if pose_data is not None else None
+    if missing is not None:
+        return pose_data, json.loads(missing)
+    uncoverable = await cache.aget(uncoverable_key)
+    if uncoverable is not None:
+        return _uncoverable(uncoverable, allow_missing)
+
+    async def synthesize() -> Optional[Tuple[bytes, List[str]]]:
+        sentences = [segment.text for segment in split_sentences(text)] or [text]
+        fsw = " ".join(await translate_texts(sentences))
+        try:
+            with span("pose_synthesize"):
+                pose_data = await inference_pool.run(synthesize_pose, lexicon, fsw, allow_missing)
+        except MissingSigns as exc:
+            logging.info(f"Offline pose engine could not cover the text: {exc}")
+            await cache.aset(uncoverable_key, str(exc))
+            return _uncoverable(str(exc), allow_missing)
+        _, missing = lexicon_keys(lexicon, fsw)
+        if missing:
+            logging.warning(f"Offline pose skipped {len(missing)} signs missing from the lexicon: {' '.join(missing)}")
+        await cache.aset(cache_key, pose_data)
+        await cache.aset(missing_key, json.dumps(missing))
+        return pose_data, missing
+
+    return await get_singleflight("generate_pose").do(cache_key, synthesize)
+
+async def _fetch_remote_pose(cache_key: str, text: str, spoken_language: str, signed_language: str) -> bytes:
+    # Make the API call - it returns binary pose data directly
+    params = _pose_params(text, spoken_language, signed_language)
+    with span("pose_fetch"):
+        response = await pose_api.request("GET", config.POSE_API_URL, params=params)
+    pose_data = response.content
+    await get_cache("generate_pose").aset(cache_key, pose_data)
+    return pose_data
+
+async def fetch_pose_result(text: str, spoken_language: str, signed_language: str) -> Tuple[bytes, List[str]]:
+    """The pose for text and the signs the offline engine skipped (none for the pose API)."""
+    text = normalize_text(text)
+    offline = await _offline_pose(text, spoken_language, signed_language)
+    if offline is not None:
+        return offline
+
+    cache = get_cache("generate_pose")
+    cache_key = _pose_cache_key(text, spoken_language, signed_language)
+    pose_data = await cache.aget(cache_key)
+
+    if pose_data is None:
+        # Concurrent requests for the same pose share one upstream call
+        pose_data = await get_singleflight("generate_pose").do(
+            cache_key, lambda: _fetch_remote_pose(cache_key, text, spoken_language, signed_language)
+        )
+    return pose_data, []
+
+async def fetch_pose(text: str, spoken_language: str = "en", signed_language: str = "ase") -> bytes:
+    """Fetch binary pose data for text; shared by /generate_pose and the pipeline endpoint."""
+    pose_data, _ = await fetch_pose_result(text, spoken_language, signed_language)
+    return pose_data
+
+def _missing_headers(missing: List[str]) -> dict:
+    return {MISSING_SIGNS_HEADER: " ".join(missing)} if missing else {}
+
+def _binary_media_type(accept: Optional[str]) -> Optional[str]:
+    for part in (accept or "").split(","):
+        media_type = part.split(";")[0].strip().lower()
+        if media_type in BINARY_MEDIA_TYPES:
+            return media_type
+    return None
+
+async def _stream_pose(request: PoseRequest, media_type: str) -> Response:
+    """Relay the upstream pose body to the client chunk by chunk.
+
+    The body is never buffered for the response itself; chunks are only kept
+    (up to POSE_STREAM_CACHE_MAX_BYTES) so the finished pose can be cached.
+    """
+    text = normalize_text(request.text)
+    offline = await _offline_pose(text, request.spoken_language, request.signed_language)
+    if offline is not None:
+        pose_data, missing = offline
+        return Response(content=pose_data, media_type=media_type, headers=_missing_headers(missing))
+
+    cache = get_cache("generate_pose")
+    cache_key = _pose_cache_key(text, request.spoken_language, request.signed_language)
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type=media_type)
+    flight = get_singleflight("generate_pose")
+    if flight.in_flight(cache_key):
+        # Another request is already fetching this pose; wait for it instead of streaming a second copy
+        pose_data = await flight.do(
+            cache_key, lambda: _fetch_remote_pose(cache_key, text, request.spoken_language, request.signed_language)
+        )
+        return Response(content=pose_data, media_type=media_type)
+
+    params = _pose_params(text, request.spoken_language, request.signed_language)
+    stack = AsyncExitStack()
+    try:
+        upstream = await stack.enter_async_context(pose_api.stream("GET", config.POSE_API_URL, params=params))
+    except BaseException:
+        await stack.aclose()
+        raise
+
+    async def relay():
+        chunks = []
+        size = 0
+        try:
+            async for chunk in upstream.aiter_bytes():
+                if chunks is not None:
+                    size += len(chunk)
+                    if size <= config.POSE_STREAM_CACHE_MAX_BYTES:
+                        chunks.append(chunk)
+                    else:
+                        chunks = None
+                yield chunk
+            if chunks is not None:
+                await cache.aset(cache_key, b"".join(chunks))
+        finally:
+            await stack.aclose()
+
+    headers = {}
+    # Only pass the length through when the body is relayed byte for byte
+    if "content-length" in upstream.headers and "content-encoding" not in upstream.headers:
+        headers["Content-Length"] = upstream.headers["content-length"]
+    return StreamingResponse(relay(), media_type=media_type, headers=headers)
 
 @router.post("/generate_pose")
-async def generate_pose(request: PoseRequest):
+async def generate_pose(request: PoseRequest, accept: Optional[str] = Header(None)):
     """
-    Generate pose data from text using the translate project's API
+    Generate pose data from text using the translate project's API, or the
+    local sign lexicon when POSE_ENGINE is "offline" or "auto"
+
+    Clients that send `Accept: application/pose` (or `application/octet-stream`)
+    get the binary pose streamed back; everyone else gets the JSON/base64 form.
+    Signs the offline engine skipped are listed in `missing_signs` (JSON) or
+    the X-Pose-Missing-Signs header (binary).
     """
     try:
-        # Construct the API URL
-        params = {
-            'text': request.text,
-            'spoken': request.spoken_language,
-            'signed': request.signed_language
-        }
-        
-        # Make the API call - it returns binary pose data directly
-        response = requests.get(config.POSE_API_URL, params=params)
-        response.raise_for_status()
-        
-        # The API returns binary pose data directly
-        pose_data = response.content
-        
-        # For now, we'll return the binary data as base64 encoded
-        import base64
+        media_type = _binary_media_type(accept)
+        result = None
+        if request.request_id:
+            key = speculation_key(request.text, request.spoken_language, request.signed_language)
+            _, result = await speculation.claim(request.request_id, "pose", key)
+
+        if media_type is not None:
+            if result is not None:
+                pose_data, missing = result
+                return Response(content=pose_data, media_type=media_type, headers=_missing_headers(missing))
+            return await _stream_pose(request, media_type)
+
+        if result is None:
+            result = await fetch_pose_result(request.text, request.spoken_language, request.signed_language)
+        pose_data, missing = result
         pose_data_b64 = base64.b64encode(pose_data).decode('utf-8')
         
-        return {
+        response = {
             "pose_data": pose_data_b64,
             "data_format": "binary_base64"
         }
+        if missing:
+            response["missing_signs"] = missing
+        return response
         
-    except requests.RequestException as e:
+    except HTTPException:
+        raise
+    except httpx.HTTPError as e:
         raise HTTPException(status_code=503, detail=f"Pose generation failed: {str(e)}")
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
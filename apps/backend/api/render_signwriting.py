@@ -0,0 +1,189 @@
+import base64
+import math
+from typing import List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
+from config import config
+from services.cache import get_cache, make_key
+from services.executors import inference_pool
+from services.metrics import span
+from services.signwriting_render import (
+    RenderOptions,
+    Sign,
+    check_color,
+    font_version,
+    layout_signs,
+    parse_signs,
+    png_unavailable_reason,
+    render_png,
+    render_svg,
+)
+from services.singleflight import get_singleflight
+
+router = APIRouter()
+
+MEDIA_TYPES = {"svg": "image/svg+xml", "png": "image/png"}
+# Bump when the same input starts rendering differently, so cached images and ETags change with it
+RENDER_VERSION = 1
+
+class RenderParams(BaseModel):
+    format: str = "svg"  # "svg" or "png"
+    scale: float = 1.0  # pixels per FSW unit
+    padding: int = 0  # FSW units around each sign
+    line_color: str = "black"
+    fill_color: str = "white"
+    background: str = "transparent"
+
+class SpriteRequest(RenderParams):
+    fsw: str  # a sentence, e.g. the `signwriting` string from /translate_signwriting
+    columns: int = 0  # signs per row; 0 puts the whole sentence on one row
+
+def _options(params: RenderParams) -> RenderOptions:
+    if params.format not in MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(MEDIA_TYPES)}")
+    if params.format == "png":
+        reason = png_unavailable_reason()
+        if reason:
+            raise HTTPException(status_code=503, detail=reason)
+    if not 0 < params.scale <= config.RENDER_MAX_SCALE:
+        raise HTTPException(status_code=400, detail=f"scale must be greater than 0 and at most {config.RENDER_MAX_SCALE}")
+    if not 0 <= params.padding <= 100:
+        raise HTTPException(status_code=400, detail="padding must be between 0 and 100")
+    try:
+        return RenderOptions(
+            scale=params.scale,
+            padding=params.padding,
+            line_color=check_color(params.line_color),
+            fill_color=check_color(params.fill_color),
+            background=check_color(params.background, allow_transparent=True),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+def _layout(signs: List[Sign], options: RenderOptions, columns: int) -> Tuple[List[Tuple[int, int]], int, int]:
+    positions, width, height = layout_signs(signs, options.padding, columns)
+    if width * height * options.scale ** 2 > config.RENDER_MAX_PIXELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Image would exceed RENDER_MAX_PIXELS ({config.RENDER_MAX_PIXELS}); lower scale or use columns",
+        )
+    return positions, width, height
+
+def _render_key(format: str, signs: List[Sign], options: RenderOptions, columns: int = 0) -> str:
+    """Content address of a rendering; also its strong ETag."""
+    return make_key(RENDER_VERSION, font_version(), format, [sign.fsw for sign in signs], list(options), columns)
+
+def _not_modified(if_none_match: Optional[str], etag: str) -> bool:
+    for tag in (if_none_match or "").split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
+
+def _cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": f"public, max-age={config.RENDER_CACHE_MAX_AGE_SECONDS}"}
+
+async def render(format: str, signs: List[Sign], options: RenderOptions, columns: int = 0) -> Union[str, bytes]:
+    """Render signs as one SVG document or PNG image, from the render cache when possible."""
+    positions, width, height = _layout(signs, options, columns)
+    cache = get_cache("render_signwriting")
+    cache_key = _render_key(format, signs, options, columns)
+    image = await cache.aget(cache_key)
+    if image is not None:
+        return image
+
+    async def draw() -> Union[str, bytes]:
+        draw_fn = render_png if format == "png" else render_svg
+        with span("signwriting_render"):
+            image = await inference_pool.run(draw_fn, signs, positions, width, height, options)
+        await cache.aset(cache_key, image)
+        return image
+
+    # Concurrent requests for the same rendering share one draw
+    return await get_singleflight("render_signwriting").do(cache_key, draw)
+
+@router.get("/render_signwriting")
+async def render_signwriting(
+    fsw: str,
+    params: RenderParams = Depends(),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    Render one FSW sign (or punctuation symbol) as SVG or PNG.
+
+    Responses carry a strong ETag derived from the sign and the rendering
+    options, so a matching If-None-Match is answered with 304 before anything
+    is drawn; rendered signs are kept in the "render_signwriting" cache.
+    """
+    options = _options(params)
+    signs = parse_signs(fsw)
+    if len(signs) != 1:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Expected one FSW sign, found {len(signs)}; use POST /render_signwriting/sprite for sentences",
+        )
+    etag = f'"{_render_key(params.format, signs, options)}"'
+    headers = _cache_headers(etag)
+    if _not_modified(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    try:
+        image = await render(params.format, signs, options)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rendering failed: {str(e)}")
+    return Response(content=image, media_type=MEDIA_TYPES[params.format], headers=headers)
+
+@router.post("/render_signwriting/sprite")
+async def render_signwriting_sprite(request: SpriteRequest):
+    """
+    Render every sign of an FSW sentence into a single sprite sheet.
+
+    Returns the sheet (SVG text, or base64 PNG) with one frame per sign, in
+    reading order, giving its cell in the sheet in pixels. The response
+    carries the sheet's ETag so clients can key their own cache on it, but
+    being a POST it is always answered in full; the sheet itself comes from
+    the same render cache as GET /render_signwriting.
+    """
+    options = _options(request)
+    signs = parse_signs(request.fsw)
+    if not signs:
+        raise HTTPException(status_code=400, detail="No FSW signs found")
+    if len(signs) > config.RENDER_MAX_SIGNS:
+        raise HTTPException(status_code=400, detail=f"At most {config.RENDER_MAX_SIGNS} signs per sprite sheet")
+    if request.columns < 0:
+        raise HTTPException(status_code=400, detail="columns must not be negative")
+
+    etag = f'"{_render_key(request.format, signs, options, request.columns)}"'
+    try:
+        image = await render(request.format, signs, options, request.columns)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rendering failed: {str(e)}")
+
+    scale = options.scale
+    positions, width, height = layout_signs(signs, options.padding, request.columns)
+    frames = [
+        {
+            "fsw": sign.fsw,
+            "x": round(x * scale),
+            "y": round(y * scale),
+            "width": round((sign.width + 2 * options.padding) * scale),
+            "height": round((sign.height + 2 * options.padding) * scale),
+        }
+        for sign, (x, y) in zip(signs, positions)
+    ]
+    body = {
+        "format": request.format,
+        "media_type": MEDIA_TYPES[request.format],
+        "width": max(1, math.ceil(width * scale)),
+        "height": max(1, math.ceil(height * scale)),
+        "frames": frames,
+    }
+    if request.format == "png":
+        body.update(image=base64.b64encode(image).decode("utf-8"), data_format="binary_base64")
+    else:
+        body.update(image=image, data_format="svg")
+    return JSONResponse(content=body, headers={"ETag": etag})
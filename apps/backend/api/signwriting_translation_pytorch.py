@@ -1,25 +1,168 @@
-import torch
+import asyncio
+import importlib.util
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from signwriting_translation.bin import load_sockeye_translator, tokenize_spoken_text, translate
+from services.cache import get_cache, make_key, normalize_text
+from config import config
+from services.phrase_lexicon import PhraseLexicon, get_phrase_lexicon
+from services.segmentation import split_sentences
+from services.singleflight import get_singleflight
+from services.speculation import speculation
+from services.translator_registry import translator_registry
+
+# Checked without importing them: torch and Sockeye are loaded with the model
+# (services.translator_registry), so importing this router stays cheap. With an
+# inference server the model runs there and this process needs neither.
+if not config.INFERENCE_SERVER_ADDRESS and (
+    importlib.util.find_spec("torch") is None or importlib.util.find_spec("signwriting_translation") is None
+):
+    raise ImportError("SignWriting translation requires torch and signwriting_translation")
 
 router = APIRouter()
 
 class TextRequest(BaseModel):
     text: str
+    split_sentences: bool = True
+    request_id: Optional[str] = None  # claims work started early by /simplify_text
+
+
+class BatchRequest(BaseModel):
+    texts: List[str]
+    split_sentences: bool = True
+
+
+async def _translate_with_model(normalized: List[str]) -> List[str]:
+    """Translate normalized texts with the default translator, serving repeats from the cache.
+
+    Identical segments already being translated for another request are
+    awaited rather than translated again.
+    """
+    translator = await translator_registry.get_async()
+    cache = get_cache("translate_signwriting")
+    # Outputs also depend on how the model decodes, and the disk tier outlives a settings change
+    settings = (
+        config.SIGNWRITING_INFERENCE_MODE.lower(),
+        getattr(translator.model, "optimizations", None),  # what was actually applied; unknown for a remote model
+        config.SIGNWRITING_BEAM_SIZE,
+        config.SIGNWRITING_MAX_OUTPUT_LENGTH,
+    )
+    keys = [
+        make_key(translator.model.model_path, translator.spoken_language, translator.signed_language, settings, text)
+        for text in normalized
+    ]
+    flight = get_singleflight("translate_signwriting")
+
+    async def translate_one(key: str, text: str) -> str:
+        # Segments still go through the micro-batcher, so a request's misses share one model call
+        output = (await translator.translate_batched([text]))[0]
+        await cache.aset(key, output)
+        return output
+
+    async def lookup(key: str, text: str) -> str:
+        output = await cache.aget(key)
+        if output is None:
+            output = await flight.do(key, lambda: translate_one(key, text))
+        return output
+
+    return list(await asyncio.gather(*(lookup(key, text) for key, text in zip(keys, normalized))))
+
+
+def _phrase_lexicon() -> Optional[PhraseLexicon]:
+    lexicon = get_phrase_lexicon()
+    if lexicon is None or (lexicon.spoken_language, lexicon.signed_language) != (
+        config.SIGNWRITING_SPOKEN_LANGUAGE, config.SIGNWRITING_SIGNED_LANGUAGE
+    ):
+        return None
+    return lexicon
+
+
+async def translate_texts(texts: List[str]) -> List[str]:
+    """Translate texts to FSW, one output per input.
+
+    Known phrases from the phrase lexicon are answered without the model;
+    only the remaining stretches of each text are translated neurally.
+    """
+    normalized = [normalize_text(text) for text in texts]
+    lexicon = _phrase_lexicon()
+    if lexicon is None:
+        return await _translate_with_model(normalized)
+
+    plans = [lexicon.segment(text, config.PHRASE_LEXICON_PARTIAL) for text in normalized]
+    unknown = [piece.text for plan in plans for piece in plan if piece.signwriting is None]
+    translated = iter(await _translate_with_model(unknown) if unknown else [])
+    outputs = []
+    for plan in plans:
+        parts = (piece.signwriting if piece.signwriting is not None else next(translated) for piece in plan)
+        outputs.append(" ".join(part.strip() for part in parts if part.strip()))
+    return outputs
+
+
+def speculation_key(text: str, split: bool = True) -> str:
+    return make_key(normalize_text(text), split)
+
+
+async def translate_document(text: str, split: bool = True) -> dict:
+    """Translate text sentence by sentence and build the /translate_signwriting response."""
+    segments = split_sentences(text) if split else []
+    if not segments:
+        segments = [(text, 0, len(text))]
+    outputs = await translate_texts([segment[0] for segment in segments])
+    return {
+        "signwriting": " ".join(output.strip() for output in outputs if output.strip()),
+        "segments": [
+            {"text": segment_text, "start": start, "end": end, "signwriting": output}
+            for (segment_text, start, end), output in zip(segments, outputs)
+        ],
+    }
+
 
 @router.post("/translate_signwriting")
 async def translate_signwriting(request: TextRequest):
+    """
+    Translate text to SignWriting (FSW).
+
+    Multi-sentence input is split into sentences that are translated together
+    in one batch; `segments` carries each sentence's output and its character
+    offsets in the request text.
+    """
     try:
-        model_path = "sign/sockeye-text-to-factored-signwriting"
-        spoken_language = "en"
-        signed_language = "ase"
-
-        translator, tokenizer_path = load_sockeye_translator(model_path)
-        tokenized_text = tokenize_spoken_text(request.text)
-        model_input = f"${spoken_language} ${signed_language} {tokenized_text}"
-        outputs = translate(translator, [model_input])
-        return {"signwriting": outputs[0]}
+        if request.request_id:
+            key = speculation_key(request.text, request.split_sentences)
+            found, result = await speculation.claim(request.request_id, "translate", key)
+            if found:
+                return result
+        return await translate_document(request.text, request.split_sentences)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
+
+@router.post("/translate_signwriting/batch")
+async def translate_signwriting_batch(request: BatchRequest):
+    """
+    Translate a list of texts to SignWriting (FSW).
+
+    Returns `results` in request order, each shaped like a
+    /translate_signwriting response. Texts are fed to the model in groups of
+    TRANSLATE_MAX_BATCH_SIZE so a large batch cannot flood the translation queue.
+    """
+    if len(request.texts) > config.TRANSLATE_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {config.TRANSLATE_BATCH_MAX_TEXTS} texts per batch; use the bulk runner for more.",
+        )
+    try:
+        results = []
+        step = config.TRANSLATE_MAX_BATCH_SIZE
+        for start in range(0, len(request.texts), step):
+            chunk = request.texts[start:start + step]
+            results.extend(await asyncio.gather(
+                *(translate_document(text, request.split_sentences) for text in chunk)
+            ))
+        return {"results": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
@@ -1,33 +1,91 @@
-import requests
+from typing import Optional
+import httpx
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from config import config
+from services.cache import get_cache, make_key, normalize_text
+from services.http_client import groq_chat
+from services.metrics import span
+from services.singleflight import get_singleflight
+from services.speculation import speculation
+from api import pose_generation
+
+# SignWriting translation is optional (see main.py); without it only the pose is speculated
+try:
+    from api import signwriting_translation_pytorch as signwriting_translation
+except ImportError:
+    signwriting_translation = None
 
 router = APIRouter()
 
+GROQ_SIMPLIFY_MODEL = "llama-3.3-70b-versatile"
+
 class TextRequest(BaseModel):
     text: str
+    # When set, translation and pose generation of the unsimplified text start
+    # right away; /translate_signwriting and /generate_pose calls with the same
+    # id reuse that work if they ask for the same text
+    request_id: Optional[str] = None
+    # The languages the follow-up /generate_pose will ask for; the pose is
+    # only speculated when both are given
+    spoken_language: Optional[str] = None
+    signed_language: Optional[str] = None
 
-@router.post("/simplify_text")
-async def simplify_text(request: TextRequest):
+async def simplify(text: str) -> str:
+    """Simplify text with Groq; shared by /simplify_text and the pipeline endpoint."""
     # Offline-friendly fallback: if no real key is configured, just return the original text.
     if (not config.GROQ_API_KEY) or (config.GROQ_API_KEY.strip().lower() in {"", "your_groq_api_key_here"}):
-        return {"simplified_text": request.text}
+        return text
+    cache = get_cache("simplify_text")
+    cache_key = make_key(config.GROQ_API_URL, GROQ_SIMPLIFY_MODEL, normalize_text(text))
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        return cached
     headers = {
         "Authorization": f"Bearer {config.GROQ_API_KEY}",
         "Content-Type": "application/json"
     }
     payload = {
-        "model": "llama-3.3-70b-versatile",
+        "model": GROQ_SIMPLIFY_MODEL,
         "messages": [
             {"role": "system", "content": "You are a helpful assistant that simplifies English text for better translation into Sign Language. Return ONLY the simplified text, no preamble or formatting."},
-            {"role": "user", "content": f"Simplify this text: {request.text}"}
+            {"role": "user", "content": f"Simplify this text: {text}"}
         ]
     }
-    try:
-        response = requests.post(config.GROQ_API_URL, json=payload, headers=headers)
-        response.raise_for_status()
-        simplified_text = response.json().get("choices", [{}])[0].get("message", {}).get("content", "")
-        return {"simplified_text": simplified_text}
-    except requests.RequestException as e:
-        raise HTTPException(status_code=503, detail=f"Groq API request failed: {str(e)}")
+
+    async def request_simplification() -> str:
+        try:
+            with span("groq_simplify"):
+                response = await groq_chat.request("POST", config.GROQ_API_URL, json=payload, headers=headers)
+            simplified_text = response.json().get("choices", [{}])[0].get("message", {}).get("content", "")
+            if simplified_text:
+                await cache.aset(cache_key, simplified_text)
+            return simplified_text
+        except httpx.HTTPError as e:
+            raise HTTPException(status_code=503, detail=f"Groq API request failed: {str(e)}")
+
+    # Identical texts simplified concurrently share one Groq call
+    return await get_singleflight("simplify_text").do(cache_key, request_simplification)
+
+def _speculate(request: TextRequest) -> None:
+    """Start translating and posing the original text while Groq simplifies it."""
+    text = request.text
+    jobs = {}
+    if signwriting_translation is not None:
+        jobs["translate"] = (
+            signwriting_translation.speculation_key(text),
+            lambda: signwriting_translation.translate_document(text),
+        )
+    spoken, signed = request.spoken_language, request.signed_language
+    if spoken and signed and (config.POSE_API_URL or config.POSE_ENGINE != "remote"):
+        jobs["pose"] = (
+            pose_generation.speculation_key(text, spoken, signed),
+            lambda: pose_generation.fetch_pose_result(text, spoken, signed),
+        )
+    speculation.start(request.request_id, jobs)
+
+@router.post("/simplify_text")
+async def simplify_text(request: TextRequest):
+    if request.request_id:
+        _speculate(request)
+    return {"simplified_text": await simplify(request.text)}
@@ -1,131 +1,213 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 import os
-import tempfile
+import hashlib
 import logging
-import re
-import stat
-from pathlib import Path
-import requests
-import shutil
+import mimetypes
+from typing import Optional
+import httpx
 from config import config
+from services import whisper_pool
+from services.audio import SAMPLE_RATE, AudioDecodeError, decode_audio_bytes, encode_wav, probe_duration
+from services.chunking import transcribe_chunked
+from services.executors import io_pool
+from services.cache import make_key
+from services.http_client import groq_transcription
+from services.metrics import span
+from services.singleflight import get_singleflight
+from services.transcript import TIMESTAMP_GRANULARITIES, assign_words, build_transcript, make_segment
 
 router = APIRouter()
 
-BACKEND_DIR = Path(__file__).resolve().parents[1]
-
-GROQ_TRANSCRIPTIONS_URL = "https://api.groq.com/openai/v1/audio/transcriptions"
 GROQ_WHISPER_MODEL = "whisper-large-v3-turbo"
+# Upper end of common speech encodings (256 kb/s): an upload of unknown length
+# is only certainly long when it is bigger than the threshold at this rate
+MAX_SPEECH_BYTES_PER_SECOND = 32_000
 
 logging.basicConfig(level=getattr(logging, config.LOG_LEVEL))
 
 
-def _ensure_ffmpeg_on_path() -> None:
-    """Ensure Whisper can invoke the ffmpeg CLI.
+async def _groq_request(content: bytes, filename: str, data: dict) -> httpx.Response:
+    name = filename or "audio.wav"
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    files = {"file": (name, content, content_type)}
+    try:
+        with span("groq_transcribe"):
+            return await groq_transcription.request(
+                "POST",
+                config.GROQ_TRANSCRIPTIONS_URL,
+                headers={"Authorization": f"Bearer {config.GROQ_API_KEY}"},
+                files=files,
+                data={"model": GROQ_WHISPER_MODEL, **data},
+            )
+    except httpx.HTTPError as exc:
+        raise HTTPException(status_code=503, detail=f"Groq transcription request failed: {exc}")
 
-    Whisper calls the literal command name `ffmpeg`. On Windows, the binary
-    provided by `imageio-ffmpeg` isn't always named `ffmpeg.exe`, so we create
-    a shim copy with the expected name and add it to PATH.
-    """
 
-    if shutil.which("ffmpeg"):
-        return
+async def _transcribe_via_groq(content: bytes, filename: str) -> str:
+    """Use Groq Whisper API for transcription (no local Whisper needed)."""
+    resp = await _groq_request(content, filename, {"response_format": "text"})
+    return (resp.text or "").strip()
 
+
+async def _transcribe_via_groq_segments(content: bytes, filename: str, word_timestamps: bool) -> dict:
+    """Groq `verbose_json` transcription, converted to the local Whisper segment format."""
+    granularities = ["segment", "word"] if word_timestamps else ["segment"]
+    resp = await _groq_request(
+        content, filename, {"response_format": "verbose_json", "timestamp_granularities[]": granularities}
+    )
+    body = resp.json()
+    segments = [make_segment(s["start"], s["end"], s["text"]) for s in body.get("segments") or []]
+    if word_timestamps:
+        assign_words(segments, body.get("words") or [])
+    if not segments and body.get("text"):
+        # No segment data came back; keep the text as one untimed segment
+        segments = [make_segment(0, body.get("duration") or 0, body["text"])]
+    return build_transcript(segments, body.get("language"))
+
+
+def _is_long(samples) -> bool:
+    return len(samples) > config.LONG_AUDIO_THRESHOLD_SECONDS * SAMPLE_RATE
+
+
+async def _transcribe_long(samples, transcribe_chunk, max_parallel: int, timestamps: Optional[str]):
+    """Transcribe long audio as overlapping chunks in parallel (see services.chunking)."""
+    transcript = await transcribe_chunked(
+        samples,
+        transcribe_chunk,
+        config.LONG_AUDIO_CHUNK_SECONDS,
+        config.LONG_AUDIO_OVERLAP_SECONDS,
+        config.LONG_AUDIO_SEARCH_SECONDS,
+        max_parallel,
+    )
+    return transcript if timestamps else transcript["text"]
+
+
+async def _transcribe_via_groq_long(contents: bytes, filename: str, timestamps: Optional[str]):
+    """Chunked Groq transcription for long uploads; None when the upload should be sent whole.
+
+    Each chunk is re-encoded as 16 kHz WAV, which also keeps every request
+    under Groq's upload size limit however long the recording is. Only
+    uploads whose probed (or, failing that, size-implied) duration is over
+    LONG_AUDIO_THRESHOLD_SECONDS are decoded.
+    """
+    if len(contents) < config.LONG_AUDIO_MIN_BYTES:
+        return None
+    # Decoding the whole upload costs a full ffmpeg pass, so first check from
+    # its header (or its size) that it is long enough to be worth chunking
+    try:
+        duration = await io_pool.run(probe_duration, contents)
+    except RuntimeError as exc:
+        logging.warning(f"Could not probe {filename} for chunking, sending it whole: {exc}")
+        return None
+    if duration is None:
+        if len(contents) < config.LONG_AUDIO_THRESHOLD_SECONDS * MAX_SPEECH_BYTES_PER_SECOND:
+            return None
+    elif duration <= config.LONG_AUDIO_THRESHOLD_SECONDS:
+        return None
+    suffix = os.path.splitext(filename or "")[-1] or ".wav"
     try:
-        from imageio_ffmpeg import get_ffmpeg_exe
+        samples = await io_pool.run(decode_audio_bytes, contents, suffix)
+    except (AudioDecodeError, RuntimeError) as exc:
+        # Without ffmpeg (or for a format it cannot read) Groq still gets the original file
+        logging.warning(f"Could not decode {filename} for chunking, sending it whole: {exc}")
+        return None
+    if not _is_long(samples):
+        return None
+    logging.info(f"Transcribing {len(samples) / SAMPLE_RATE:.0f}s of audio in chunks via Groq")
+    return await _transcribe_long(
+        samples,
+        lambda chunk: _transcribe_via_groq_segments(encode_wav(chunk), "chunk.wav", timestamps == "word"),
+        config.LONG_AUDIO_MAX_PARALLEL,
+        timestamps,
+    )
 
-        bundled_exe = Path(get_ffmpeg_exe())
-    except Exception as exc:
-        raise RuntimeError(
-            "ffmpeg not found on PATH and could not locate bundled ffmpeg from imageio-ffmpeg"
-        ) from exc
-
-    shim_dir = BACKEND_DIR / ".ffmpeg"
-    shim_dir.mkdir(parents=True, exist_ok=True)
-
-    shim_name = "ffmpeg.exe" if os.name == "nt" else "ffmpeg"
-    shim_path = shim_dir / shim_name
-
-    if bundled_exe.name.lower() == shim_name.lower():
-        os.environ["PATH"] = str(bundled_exe.parent) + os.pathsep + os.environ.get("PATH", "")
-        return
-
-    if not shim_path.exists():
-        shutil.copy2(bundled_exe, shim_path)
-        if os.name != "nt":
-            shim_path.chmod(
-                shim_path.stat().st_mode
-                | stat.S_IXUSR
-                | stat.S_IXGRP
-                | stat.S_IXOTH
+
+async def _transcribe_via_groq_any(contents: bytes, filename: str, timestamps: Optional[str]):
+    result = await _transcribe_via_groq_long(contents, filename, timestamps)
+    if result is not None:
+        return result
+    if timestamps:
+        return await _transcribe_via_groq_segments(contents, filename, timestamps == "word")
+    return await _transcribe_via_groq(contents, filename)
+
+
+async def _transcribe_locally(contents: bytes, filename: str, timestamps: Optional[str] = None):
+    """Decode the upload in memory and transcribe it on the local Whisper pool."""
+    if not whisper_pool.whisper_available():
+        raise HTTPException(
+            status_code=503,
+            detail="Transcription requires GROQ_API_KEY (set in Variables) or install openai-whisper for local dev.",
+        )
+    suffix = os.path.splitext(filename or "")[-1] or ".wav"
+    try:
+        audio = await io_pool.run(decode_audio_bytes, contents, suffix)
+        # Runs in a long-lived worker process that already has the model loaded
+        if _is_long(audio):
+            # One chunk per worker at a time so a single upload cannot fill the pool's queue
+            return await _transcribe_long(
+                audio,
+                lambda chunk: whisper_pool.transcribe_segments(chunk, word_timestamps=timestamps == "word"),
+                whisper_pool.max_parallel(),
+                timestamps,
             )
+        if timestamps:
+            return await whisper_pool.transcribe_segments(audio, word_timestamps=timestamps == "word")
+        return await whisper_pool.transcribe(audio)
+    except HTTPException:
+        raise
+    except AudioDecodeError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception as exc:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Local transcription failed: {exc}",
+        )
 
-    os.environ["PATH"] = str(shim_dir) + os.pathsep + os.environ.get("PATH", "")
 
+async def _transcribe(contents: bytes, filename: str, timestamps: Optional[str]):
+    if not contents:
+        raise HTTPException(status_code=400, detail="Empty audio file uploaded.")
+    logging.info(f"Transcribing uploaded file: {filename} ({len(contents)} bytes)")
 
-def _transcribe_via_groq(file_path: str, filename: str) -> str:
-    """Use Groq Whisper API for transcription (no local Whisper needed)."""
-    name = filename or "audio.wav"
-    with open(file_path, "rb") as f:
-        content = f.read()
-    files = {"file": (name, content, "audio/wav")}
-    data = {"model": GROQ_WHISPER_MODEL, "response_format": "text"}
-    resp = requests.post(
-        GROQ_TRANSCRIPTIONS_URL,
-        headers={"Authorization": f"Bearer {config.GROQ_API_KEY}"},
-        files=files,
-        data=data,
-        timeout=60,
-    )
-    resp.raise_for_status()
-    return (resp.text or "").strip()
+    # The same recording uploaded by several clients at once is transcribed once
+    flight = get_singleflight("transcribe")
+    key = make_key(hashlib.sha256(contents).hexdigest(), os.path.splitext(filename or "")[-1].lower(), timestamps)
+    if config.GROQ_API_KEY:
+        return await flight.do(key, lambda: _transcribe_via_groq_any(contents, filename or "audio.wav", timestamps))
+    return await flight.do(key, lambda: _transcribe_locally(contents, filename, timestamps))
 
 
-def _transcribe_via_local_whisper(file_path: str) -> str:
-    """Use local openai-whisper (for dev when GROQ_API_KEY not set)."""
-    import whisper
+async def transcribe_upload(contents: bytes, filename: str) -> str:
+    """Transcribe uploaded audio bytes; shared by /transcribe and the pipeline endpoint.
+
+    Audio never touches disk: Groq receives the original bytes, and for local
+    Whisper the upload is decoded in memory and passed to the worker as samples.
+    Long recordings are split into chunks that are transcribed in parallel.
+    """
+    return await _transcribe(contents, filename, None)
 
-    _ensure_ffmpeg_on_path()
 
-    model = whisper.load_model(config.WHISPER_MODEL)
-    result = model.transcribe(file_path)
-    text = result["text"].strip()
-    cleaned_lines = []
-    for line in text.splitlines():
-        cleaned = re.sub(r"\[\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}\]", "", line).strip()
-        if cleaned:
-            cleaned_lines.append(cleaned)
-    return " ".join(cleaned_lines)
+async def transcribe_upload_segments(contents: bytes, filename: str, word_timestamps: bool = False) -> dict:
+    """Transcribe uploaded audio into timed segments: ``{"text", "language", "segments"}``.
+
+    Each segment has ``start``/``end`` in seconds, its ``text`` and its
+    character offsets in the joined text; with ``word_timestamps`` it also
+    has ``words`` (each with ``word``, ``start``, ``end``).
+    """
+    return await _transcribe(contents, filename, "word" if word_timestamps else "segment")
 
 
 @router.post("/transcribe")
-async def transcribe(audio: UploadFile = File(...)):
-    input_filepath = None
-    try:
-        contents = await audio.read()
-        if not contents:
-            raise HTTPException(status_code=400, detail="Empty audio file uploaded.")
-        suffix = os.path.splitext(audio.filename or "")[-1] or ".wav"
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-            tmp.write(contents)
-            input_filepath = tmp.name
-        logging.info(f"Transcribing uploaded file: {input_filepath}")
-
-        if config.GROQ_API_KEY:
-            transcription = _transcribe_via_groq(input_filepath, audio.filename or "audio.wav")
-        else:
-            try:
-                transcription = _transcribe_via_local_whisper(input_filepath)
-            except ImportError:
-                raise HTTPException(
-                    status_code=503,
-                    detail="Transcription requires GROQ_API_KEY (set in Variables) or install openai-whisper for local dev.",
-                )
-            except Exception as exc:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Local transcription failed: {exc}",
-                )
-        return {"text": transcription}
-    finally:
-        if input_filepath and os.path.exists(input_filepath):
-            os.remove(input_filepath)
+async def transcribe(audio: UploadFile = File(...), timestamps: Optional[str] = Form(None)):
+    """
+    Transcribe an uploaded audio file.
+
+    Set `timestamps` to `segment` or `word` to also get the timed segments
+    (and word timings) alongside the text.
+    """
+    if timestamps is not None and timestamps not in TIMESTAMP_GRANULARITIES:
+        raise HTTPException(status_code=400, detail=f"timestamps must be one of {', '.join(TIMESTAMP_GRANULARITIES)}.")
+    contents = await audio.read()
+    if timestamps:
+        return await transcribe_upload_segments(contents, audio.filename, timestamps == "word")
+    return {"text": await transcribe_upload(contents, audio.filename)}
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+from typing import Optional
+
+import numpy as np
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from config import config
+from services import whisper_pool
+from services.audio import SAMPLE_RATE, AudioDecodeError, ensure_ffmpeg_on_path, pcm16_to_float32, resample
+from services.executors import PoolSaturated
+from services.vad import SpeechSegmenter
+
+router = APIRouter()
+
+# ffmpeg demuxer for each MediaRecorder container; naming it skips format probing on the pipe
+CONTAINER_FORMATS = {"webm": "matroska", "ogg": "ogg"}
+
+
+class _PcmDecoder:
+    """Raw little-endian 16-bit mono PCM frames at the client's sample rate."""
+
+    def __init__(self, sample_rate: int):
+        self.sample_rate = sample_rate
+        self._remainder = b""
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        data = self._remainder + data
+        usable = len(data) - len(data) % 2
+        self._remainder = data[usable:]
+        return resample(pcm16_to_float32(data[:usable]), self.sample_rate)
+
+    async def close(self) -> np.ndarray:
+        return np.zeros(0, dtype=np.float32)
+
+    def kill(self) -> None:
+        pass
+
+
+class _ContainerDecoder:
+    """MediaRecorder chunks (webm/opus, ogg/opus), decoded by one ffmpeg per session.
+
+    Chunks are piped into ffmpeg's stdin as they arrive and whatever PCM it has
+    produced so far is handed back, so each byte is decoded once and nothing
+    accumulates beyond the samples not yet returned.
+    """
+
+    def __init__(self, demuxer: str):
+        self.demuxer = demuxer
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pcm = bytearray()
+
+    async def _start(self) -> None:
+        await asyncio.to_thread(ensure_ffmpeg_on_path)
+        self._process = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-loglevel", "error", "-f", self.demuxer, "-i", "pipe:0",
+            "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(SAMPLE_RATE),
+            "-flush_packets", "1", "pipe:1",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(self._read())
+
+    async def _read(self) -> None:
+        while chunk := await self._process.stdout.read(65536):
+            self._pcm.extend(chunk)
+
+    def _take(self) -> np.ndarray:
+        usable = len(self._pcm) - len(self._pcm) % 2
+        data = bytes(self._pcm[:usable])
+        del self._pcm[:usable]
+        return pcm16_to_float32(data)
+
+    async def _failure(self) -> AudioDecodeError:
+        await self._process.wait()
+        stderr = await self._process.stderr.read()
+        return AudioDecodeError(f"Failed to decode audio: {stderr.decode(errors='ignore')[-500:]}")
+
+    async def feed(self, data: bytes) -> np.ndarray:
+        if self._process is None:
+            await self._start()
+        try:
+            self._process.stdin.write(data)
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            raise await self._failure()
+        return self._take()
+
+    async def close(self) -> np.ndarray:
+        """Flush ffmpeg at the end of the stream and return its last samples."""
+        if self._process is None:
+            return np.zeros(0, dtype=np.float32)
+        self._process.stdin.close()
+        await self._reader
+        if await self._process.wait() != 0:
+            raise await self._failure()
+        return self._take()
+
+    def kill(self) -> None:
+        if self._process is not None and self._process.returncode is None:
+            self._process.kill()
+        if self._reader is not None:
+            self._reader.cancel()
+
+
+class _StreamSession:
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.segment_index = 0
+        self.previous_text = ""
+        self._send_lock = asyncio.Lock()
+        self._partial_task: Optional[asyncio.Task] = None
+        self._partial_samples = 0
+        self._partial_interval = int(config.STREAM_PARTIAL_INTERVAL_MS * SAMPLE_RATE / 1000)
+        self._min_segment = int(config.STREAM_MIN_SEGMENT_MS * SAMPLE_RATE / 1000)
+
+    async def send(self, message: dict) -> None:
+        async with self._send_lock:
+            await self.websocket.send_text(json.dumps(message))
+
+    def maybe_partial(self, audio: np.ndarray) -> None:
+        """Transcribe the open segment again once enough new audio has arrived.
+
+        At most one partial runs at a time; partials are skipped while one is
+        still in flight or when the Whisper pool is saturated.
+        """
+        if self._partial_task is not None and not self._partial_task.done():
+            return
+        if len(audio) - self._partial_samples < self._partial_interval:
+            return
+        self._partial_samples = len(audio)
+        self._partial_task = asyncio.create_task(self._partial(self.segment_index, audio))
+
+    async def _partial(self, index: int, audio: np.ndarray) -> None:
+        try:
+            text = await whisper_pool.transcribe(audio, self.previous_text or None)
+        except PoolSaturated:
+            return
+        except Exception:
+            # Partials are best effort; the final transcript of the segment still follows
+            logging.warning("Partial transcription failed", exc_info=True)
+            return
+        if index == self.segment_index and text:
+            await self.send({"type": "partial", "segment": index, "text": text})
+
+    async def finalize(self, start: float, audio: np.ndarray) -> None:
+        self.cancel_partial()
+        self._partial_samples = 0
+        if len(audio) < self._min_segment:
+            return
+        index = self.segment_index
+        self.segment_index += 1
+        message = {
+            "type": "final",
+            "segment": index,
+            "start": round(start, 2),
+            "end": round(start + len(audio) / SAMPLE_RATE, 2),
+        }
+        try:
+            text = await whisper_pool.transcribe(audio, self.previous_text or None)
+        except PoolSaturated as exc:
+            # Keep the session going; the client can resend this stretch of audio later
+            await self.send({**message, "text": "", "error": exc.detail, "retryable": True})
+            return
+        if text:
+            self.previous_text = text
+        await self.send({**message, "text": text})
+
+    def cancel_partial(self) -> None:
+        if self._partial_task is not None:
+            self._partial_task.cancel()
+            self._partial_task = None
+
+
+def _is_stop(text: str) -> bool:
+    try:
+        message = json.loads(text)
+    except json.JSONDecodeError:
+        return text.strip().lower() == "stop"
+    return isinstance(message, dict) and message.get("type") == "stop"
+
+
+@router.websocket("/transcribe/stream")
+async def transcribe_stream(websocket: WebSocket, format: str = "pcm16", sample_rate: int = SAMPLE_RATE):
+    """
+    Stream audio in, get partial and final transcripts out.
+
+    Binary frames carry audio: `format=pcm16` (16-bit little-endian mono at
+    `sample_rate`) or `format=webm`/`ogg` (MediaRecorder chunks). Send the text
+    frame `{"type": "stop"}` to flush the last segment. The server replies with
+    `partial`, `final` and finally `done` JSON messages. A `final` message
+    with `"retryable": true` means the segment was dropped because the Whisper
+    pool was saturated.
+    """
+    await websocket.accept()
+    session = _StreamSession(websocket)
+
+    if format != "pcm16" and format not in CONTAINER_FORMATS:
+        await session.send({"type": "error", "detail": f"Unsupported audio format: {format}"})
+        await websocket.close(code=1003)
+        return
+    if not whisper_pool.whisper_available():
+        await session.send({"type": "error", "detail": "Streaming transcription requires openai-whisper on the server."})
+        await websocket.close(code=1011)
+        return
+
+    decoder = _PcmDecoder(sample_rate) if format == "pcm16" else _ContainerDecoder(CONTAINER_FORMATS[format])
+    segmenter = SpeechSegmenter(
+        threshold=config.STREAM_VAD_THRESHOLD,
+        min_silence_ms=config.STREAM_MIN_SILENCE_MS,
+        max_segment_s=config.STREAM_MAX_SEGMENT_SECONDS,
+        pre_roll_ms=config.STREAM_PRE_ROLL_MS,
+    )
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes"):
+                samples = await decoder.feed(message["bytes"])
+                for start, segment in segmenter.feed(samples):
+                    await session.finalize(start, segment)
+                if segmenter.in_speech:
+                    session.maybe_partial(segmenter.current)
+            elif message.get("text") and _is_stop(message["text"]):
+                break
+
+        for start, segment in segmenter.feed(await decoder.close()):
+            await session.finalize(start, segment)
+        closed = segmenter.flush()
+        if closed is not None:
+            await session.finalize(*closed)
+        await session.send({"type": "done", "segments": session.segment_index})
+        await websocket.close()
+    except WebSocketDisconnect:
+        return
+    except Exception as exc:
+        logging.exception("Streaming transcription failed")
+        await session.send({"type": "error", "detail": f"Streaming transcription failed: {exc}"})
+        await websocket.close(code=1011)
+    finally:
+        session.cancel_partial()
+        decoder.kill()
@@ -19,17 +19,114 @@ class Config:
     HOST: str = os.getenv("HOST", "127.0.0.1")
     PORT: int = int(os.getenv("PORT", "8080"))  # Cloud Run uses 8080 by default
     DEBUG: bool = os.getenv("DEBUG", "true").lower() == "true"
+    # "background" (serve /health at once, load models in the background; /ready gates traffic),
+    # "blocking" (load before accepting connections) or "lazy" (load on first use)
+    STARTUP_MODE: str = os.getenv("STARTUP_MODE", "background").lower()
+    # run_backend.py: >0 loads models once, then forks this many workers that share them copy-on-write
+    PREFORK_WORKERS: int = int(os.getenv("PREFORK_WORKERS", "0"))
+    # Unix socket path (or host:port) of `python -m services.inference_server`; when set, this
+    # process loads no models and forwards translation/transcription to that server
+    INFERENCE_SERVER_ADDRESS: str = os.getenv("INFERENCE_SERVER_ADDRESS", "")
+    # Required for host:port addresses, which must also be loopback unless INFERENCE_SERVER_ALLOW_REMOTE is set
+    INFERENCE_SERVER_AUTHKEY: str = os.getenv("INFERENCE_SERVER_AUTHKEY", "")
+    INFERENCE_SERVER_ALLOW_REMOTE: bool = os.getenv("INFERENCE_SERVER_ALLOW_REMOTE", "false").lower() == "true"
+    INFERENCE_SERVER_TIMEOUT_SECONDS: float = float(os.getenv("INFERENCE_SERVER_TIMEOUT_SECONDS", "300"))
     
     # API Keys and External Services
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     GROQ_API_URL: str = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+    GROQ_TRANSCRIPTIONS_URL: str = os.getenv("GROQ_TRANSCRIPTIONS_URL", "https://api.groq.com/openai/v1/audio/transcriptions")
     
     # Pose Generation API
     POSE_API_URL: str = os.getenv("POSE_API_URL", "")
+    POSE_STREAM_CACHE_MAX_BYTES: int = int(os.getenv("POSE_STREAM_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))  # larger streamed poses skip the cache
+    # "remote" (POSE_API_URL), "offline" (local sign lexicon) or "auto" (offline when the lexicon has every sign)
+    POSE_ENGINE: str = os.getenv("POSE_ENGINE", "remote").lower()
+    POSE_LEXICON_PATH: str = os.getenv("POSE_LEXICON_PATH", "")
+    POSE_TRANSITION_FRAMES: int = int(os.getenv("POSE_TRANSITION_FRAMES", "4"))  # interpolated frames between signs
+    POSE_PAUSE_MS: float = float(os.getenv("POSE_PAUSE_MS", "300"))  # hold at punctuation
+    
+    # SignWriting Rendering (/render_signwriting): PNG output needs Pillow and the Sutton Line/Fill
+    # fonts in SIGNWRITING_FONT_DIR (empty uses the frontend's public/fonts)
+    SIGNWRITING_FONT_DIR: str = os.getenv("SIGNWRITING_FONT_DIR") or str(signcast_dir / "apps" / "frontend" / "public" / "fonts")
+    RENDER_MAX_SIGNS: int = int(os.getenv("RENDER_MAX_SIGNS", "256"))  # per sprite sheet
+    RENDER_MAX_SCALE: float = float(os.getenv("RENDER_MAX_SCALE", "8"))
+    RENDER_MAX_PIXELS: int = int(os.getenv("RENDER_MAX_PIXELS", str(4096 * 4096)))
+    RENDER_GLYPH_CACHE_SIZE: int = int(os.getenv("RENDER_GLYPH_CACHE_SIZE", "4096"))  # rasterized symbols per process
+    RENDER_CACHE_MAX_AGE_SECONDS: int = int(os.getenv("RENDER_CACHE_MAX_AGE_SECONDS", "86400"))  # Cache-Control max-age
     
     # Whisper Model Configuration
     WHISPER_MODEL: str = os.getenv("WHISPER_MODEL", "base")
     WHISPER_DEVICE: str = os.getenv("WHISPER_DEVICE", "cpu")
+    WHISPER_WORKERS: int = int(os.getenv("WHISPER_WORKERS", "1"))  # worker processes, each with its own model
+    WHISPER_TORCH_THREADS: int = int(os.getenv("WHISPER_TORCH_THREADS", "0"))  # 0 keeps torch's default
+    WHISPER_MAX_PENDING: int = int(os.getenv("WHISPER_MAX_PENDING", "4"))
+    WHISPER_WARMUP: bool = os.getenv("WHISPER_WARMUP", "true").lower() == "true"
+    
+    # Long Audio (/transcribe): split into overlapping chunks cut at pauses, transcribed in parallel
+    LONG_AUDIO_THRESHOLD_SECONDS: float = float(os.getenv("LONG_AUDIO_THRESHOLD_SECONDS", "180"))
+    LONG_AUDIO_MIN_BYTES: int = int(os.getenv("LONG_AUDIO_MIN_BYTES", str(1024 * 1024)))  # smaller Groq uploads are sent as-is
+    LONG_AUDIO_CHUNK_SECONDS: float = float(os.getenv("LONG_AUDIO_CHUNK_SECONDS", "120"))
+    LONG_AUDIO_OVERLAP_SECONDS: float = float(os.getenv("LONG_AUDIO_OVERLAP_SECONDS", "2"))
+    LONG_AUDIO_SEARCH_SECONDS: float = float(os.getenv("LONG_AUDIO_SEARCH_SECONDS", "5"))  # how far a cut may move to find silence
+    LONG_AUDIO_MAX_PARALLEL: int = int(os.getenv("LONG_AUDIO_MAX_PARALLEL", "4"))  # concurrent Groq calls; local uses WHISPER_WORKERS
+    
+    # Streaming Transcription (WebSocket /transcribe/stream)
+    STREAM_VAD_THRESHOLD: float = float(os.getenv("STREAM_VAD_THRESHOLD", "0.01"))  # frame RMS counted as speech
+    STREAM_MIN_SILENCE_MS: int = int(os.getenv("STREAM_MIN_SILENCE_MS", "600"))  # silence that ends a segment
+    STREAM_MAX_SEGMENT_SECONDS: float = float(os.getenv("STREAM_MAX_SEGMENT_SECONDS", "15"))
+    STREAM_MIN_SEGMENT_MS: int = int(os.getenv("STREAM_MIN_SEGMENT_MS", "250"))
+    STREAM_PRE_ROLL_MS: int = int(os.getenv("STREAM_PRE_ROLL_MS", "200"))
+    STREAM_PARTIAL_INTERVAL_MS: int = int(os.getenv("STREAM_PARTIAL_INTERVAL_MS", "1000"))
+    
+    # SignWriting Translation Configuration
+    SIGNWRITING_MODEL_PATH: str = os.getenv("SIGNWRITING_MODEL_PATH", "sign/sockeye-text-to-factored-signwriting")
+    SIGNWRITING_SPOKEN_LANGUAGE: str = os.getenv("SIGNWRITING_SPOKEN_LANGUAGE", "en")
+    SIGNWRITING_SIGNED_LANGUAGE: str = os.getenv("SIGNWRITING_SIGNED_LANGUAGE", "ase")
+    SIGNWRITING_WARMUP: bool = os.getenv("SIGNWRITING_WARMUP", "true").lower() == "true"
+    # CPU inference: fp32, int8 (dynamic quantization), compile (torch.compile) or int8+compile
+    SIGNWRITING_INFERENCE_MODE: str = os.getenv("SIGNWRITING_INFERENCE_MODE", "fp32")
+    SIGNWRITING_TORCH_THREADS: int = int(os.getenv("SIGNWRITING_TORCH_THREADS", "0"))  # 0 = torch default
+    SIGNWRITING_BEAM_SIZE: int = int(os.getenv("SIGNWRITING_BEAM_SIZE", "0"))  # 0 = model default (5)
+    SIGNWRITING_MAX_OUTPUT_LENGTH: int = int(os.getenv("SIGNWRITING_MAX_OUTPUT_LENGTH", "0"))  # 0 = model default
+    # Phrase -> FSW lexicon consulted before the model (build with `python -m services.phrase_lexicon`)
+    PHRASE_LEXICON_PATH: str = os.getenv("PHRASE_LEXICON_PATH", "")
+    PHRASE_LEXICON_PARTIAL: bool = os.getenv("PHRASE_LEXICON_PARTIAL", "true").lower() == "true"  # mix lexicon and model within a sentence
+    TRANSLATE_MAX_BATCH_SIZE: int = int(os.getenv("TRANSLATE_MAX_BATCH_SIZE", "16"))
+    TRANSLATE_MAX_WAIT_MS: float = float(os.getenv("TRANSLATE_MAX_WAIT_MS", "10"))
+    TRANSLATE_MAX_PENDING: int = int(os.getenv("TRANSLATE_MAX_PENDING", "256"))  # queued sentences before 503
+    TRANSLATE_BATCH_MAX_TEXTS: int = int(os.getenv("TRANSLATE_BATCH_MAX_TEXTS", "256"))  # per /translate_signwriting/batch call
+    PIPELINE_MAX_CONCURRENT_SEGMENTS: int = int(os.getenv("PIPELINE_MAX_CONCURRENT_SEGMENTS", "4"))
+    # Speculative translate/pose started by /simplify_text requests that carry a request_id
+    SPECULATION_TTL_SECONDS: float = float(os.getenv("SPECULATION_TTL_SECONDS", "30"))
+    SPECULATION_MAX_PENDING: int = int(os.getenv("SPECULATION_MAX_PENDING", "256"))  # request ids
+    SEGMENT_MAX_CHARS: int = int(os.getenv("SEGMENT_MAX_CHARS", "200"))  # longer sentences are split at clauses
+    
+    # Worker Pools: CPU inference and blocking outbound I/O run on separate bounded pools.
+    # Once a pool has MAX_PENDING jobs queued or running, new requests get 503 + Retry-After.
+    INFERENCE_POOL_WORKERS: int = int(os.getenv("INFERENCE_POOL_WORKERS", "2"))
+    INFERENCE_POOL_MAX_PENDING: int = int(os.getenv("INFERENCE_POOL_MAX_PENDING", "8"))
+    IO_POOL_WORKERS: int = int(os.getenv("IO_POOL_WORKERS", "16"))
+    IO_POOL_MAX_PENDING: int = int(os.getenv("IO_POOL_MAX_PENDING", "64"))
+    POOL_RETRY_AFTER_SECONDS: int = int(os.getenv("POOL_RETRY_AFTER_SECONDS", "1"))
+    
+    # Outbound HTTP (shared pooled client for Groq and the pose API)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+    HTTP_RETRIES: int = int(os.getenv("HTTP_RETRIES", "2"))
+    HTTP_RETRY_BACKOFF_MS: float = float(os.getenv("HTTP_RETRY_BACKOFF_MS", "200"))
+    UPSTREAM_MAX_CONCURRENCY: int = int(os.getenv("UPSTREAM_MAX_CONCURRENCY", "32"))  # per upstream
+    GROQ_TIMEOUT_SECONDS: float = float(os.getenv("GROQ_TIMEOUT_SECONDS", "30"))
+    GROQ_TRANSCRIBE_TIMEOUT_SECONDS: float = float(os.getenv("GROQ_TRANSCRIBE_TIMEOUT_SECONDS", "60"))
+    POSE_TIMEOUT_SECONDS: float = float(os.getenv("POSE_TIMEOUT_SECONDS", "30"))
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))  # consecutive failures
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+    
+    # Result Cache Configuration (translation, simplification and pose results)
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_TTL_SECONDS: float = float(os.getenv("CACHE_TTL_SECONDS", "86400"))
+    CACHE_DIR: str = os.getenv("CACHE_DIR", "")  # set to keep a SQLite copy of each cache across restarts
     
     # CORS Configuration
     @classmethod
@@ -50,13 +147,16 @@ class Config:
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG")
     
+    # Metrics: Prometheus text format on /metrics
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    
     @classmethod
     def validate(cls) -> None:
         """Validate required configuration values"""
         if not cls.GROQ_API_KEY:
             print("Warning: GROQ_API_KEY not set. Text simplification will not work.")
         
-        if not cls.POSE_API_URL:
+        if not cls.POSE_API_URL and cls.POSE_ENGINE != "offline":
             print("Warning: POSE_API_URL not set. Pose generation will not work.")
     
     @classmethod
@@ -1,5 +1,6 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware  # pyright: ignore[reportMissingImports]
+from fastapi.responses import JSONResponse  # pyright: ignore[reportMissingImports]
 import subprocess
 import uuid
 import os
@@ -9,17 +10,23 @@ import tempfile
 import logging
 import asyncio
 
-from fastapi import FastAPI, UploadFile, File, HTTPException  # pyright: ignore[reportMissingImports]
-from fastapi.middleware.cors import CORSMiddleware  # pyright: ignore[reportMissingImports]
-import os
-import tempfile
-import logging
-import asyncio
-
 from api.simplify_text import router as simplify_text_router
 from api.pose_generation import router as pose_generation_router
 from api.transcribe import router as transcribe_router
+from api.render_signwriting import router as render_signwriting_router
 from config import config
+from services.cache import cache_stats
+from services.executors import pool_stats, pools
+from services.http_client import close_client, upstream_stats
+from services.inference_client import InferenceServerUnavailable, get_inference_client, inference_client_stats
+from services import metrics
+from services.phrase_lexicon import get_phrase_lexicon, phrase_lexicon_stats
+from services.pose_lexicon import get_pose_lexicon, lexicon_status
+from services.signwriting_render import glyph_cache_stats
+from services.singleflight import singleflight_stats
+from services.speculation import speculation
+from services.translator_registry import translator_registry
+from services import whisper_pool
 
 app = FastAPI()
 
@@ -31,7 +38,49 @@ def root():
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        "startup": config.STARTUP_MODE,
+        "signwriting": translator_registry.status(),
+        "pose": lexicon_status(),
+    }
+
+
+@app.get("/stats")
+def stats():
+    return {
+        "caches": cache_stats(),
+        "pools": pool_stats(),
+        "upstreams": upstream_stats(),
+        "speculation": speculation.stats(),
+        "coalescing": singleflight_stats(),
+        "phrase_lexicon": phrase_lexicon_stats(),
+        "inference_server": inference_client_stats(),
+        "signwriting_glyphs": glyph_cache_stats(),
+    }
+
+if config.METRICS_ENABLED:
+    from fastapi.responses import PlainTextResponse
+
+    # The existing /stats counters, exported alongside the request and stage histograms
+    for name, stats_fn, label in (
+        ("cache", cache_stats, "cache"),
+        ("pool", pool_stats, "pool"),
+        ("upstream", upstream_stats, "upstream"),
+        ("coalescing", singleflight_stats, "group"),
+        ("speculation", speculation.stats, None),
+        ("phrase_lexicon", phrase_lexicon_stats, None),
+        ("inference_server", inference_client_stats, None),
+        ("signwriting_glyphs", glyph_cache_stats, None),
+        ("model", lambda: translator_registry.status()["models"], "model"),
+    ):
+        metrics.register_collector(metrics.stats_collector(name, stats_fn, label))
+
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics():
+        return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+    app.add_middleware(metrics.MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -49,12 +98,23 @@ logging.basicConfig(level=getattr(logging, config.LOG_LEVEL))
 app.include_router(transcribe_router)
 app.include_router(simplify_text_router)
 app.include_router(pose_generation_router)
+app.include_router(render_signwriting_router)
+
+# End-to-end audio/text -> SignWriting -> pose pipeline built from the routers above
+from api.pipeline import router as pipeline_router
+app.include_router(pipeline_router)
+
+# Streaming transcription; it needs Whisper (local or on the inference server) only once a client connects
+from api.transcribe_stream import router as transcribe_stream_router
+app.include_router(transcribe_stream_router)
 
 # SignWriting translation (torch + signwriting_translation) is optional for free-tier deploy (<4 GB image).
 try:
     from api.signwriting_translation_pytorch import router as signwriting_translation_pytorch_router
     app.include_router(signwriting_translation_pytorch_router)
+    signwriting_available = True
 except ImportError:
+    signwriting_available = False
     from fastapi import APIRouter
     from pydantic import BaseModel
     _stub = APIRouter()
@@ -69,5 +129,121 @@ except ImportError:
         )
     app.include_router(_stub)
 
+
+def preload_models() -> None:
+    """Load every configured model synchronously, without running inference.
+
+    Used by the pre-fork server (run_backend.py) in the master process, so
+    forked workers share the loaded weights copy-on-write.
+    """
+    if signwriting_available and config.SIGNWRITING_WARMUP and get_inference_client() is None:
+        try:
+            translator_registry.get()
+        except Exception:
+            logging.exception("SignWriting translator failed to load")
+    if config.PHRASE_LEXICON_PATH:
+        get_phrase_lexicon()
+    if config.POSE_ENGINE != "remote":
+        get_pose_lexicon()
+
+
+async def _wait_for_inference_server() -> None:
+    """Wait until the inference server is up and has loaded its models.
+
+    Retries while the server cannot be reached; an error from the server
+    itself (e.g. its warm-up failed) is raised instead of waited on.
+    """
+    client = get_inference_client()
+    while True:
+        try:
+            await client.call("ready")
+            return
+        except InferenceServerUnavailable as exc:
+            logging.info(f"Waiting for the inference server: {exc.detail}")
+            await asyncio.sleep(1)
+        except HTTPException as exc:
+            raise RuntimeError(exc.detail)
+
+
+async def warm_up_models():
+    if get_inference_client() is not None:
+        # Models live in the inference server; this worker only needs it to be ready
+        await _wait_for_inference_server()
+    elif signwriting_available and config.SIGNWRITING_WARMUP:
+        # Load the Sockeye model once per process so requests never pay for deserialization.
+        await asyncio.to_thread(translator_registry.warm_up)
+    # Local Whisper is only used when Groq transcription is not configured
+    if not config.GROQ_API_KEY and config.WHISPER_WARMUP and whisper_pool.whisper_available():
+        await whisper_pool.warm_up()
+    if config.PHRASE_LEXICON_PATH:
+        await asyncio.to_thread(get_phrase_lexicon)
+    if config.POSE_ENGINE != "remote":
+        await asyncio.to_thread(get_pose_lexicon)
+
+
+_warm_up_task = None
+
+
+def _translator_expected() -> bool:
+    """Whether warm-up loads the SignWriting translator in this process, so /ready must wait for it."""
+    return (
+        signwriting_available
+        and config.SIGNWRITING_WARMUP
+        and config.STARTUP_MODE != "lazy"
+        and get_inference_client() is None
+    )
+
+
+def _log_warm_up_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logging.error("Background warm-up failed", exc_info=task.exception())
+
+
+@app.on_event("startup")
+async def start_warm_up():
+    """Warm up according to STARTUP_MODE.
+
+    ``blocking`` finishes loading before the server accepts connections;
+    ``background`` serves /health at once and loads in the background (/ready
+    answers 503 until it is done); ``lazy`` loads each model on first use.
+    """
+    global _warm_up_task
+    if config.STARTUP_MODE == "blocking":
+        await warm_up_models()
+    elif config.STARTUP_MODE == "background":
+        _warm_up_task = asyncio.create_task(warm_up_models())
+        _warm_up_task.add_done_callback(_log_warm_up_failure)
+
+
+@app.get("/ready")
+def ready():
+    """Readiness probe: 503 while background warm-up is still loading models, or after it failed.
+
+    A SignWriting translator that warm-up was meant to load but could not
+    also keeps the process unready.
+    """
+    if _warm_up_task is not None and not _warm_up_task.done():
+        return JSONResponse(
+            status_code=503,
+            content={"status": "loading"},
+            headers={"Retry-After": str(config.POOL_RETRY_AFTER_SECONDS)},
+        )
+    if _warm_up_task is not None and not _warm_up_task.cancelled() and _warm_up_task.exception() is not None:
+        return JSONResponse(status_code=503, content={"status": "failed", "detail": str(_warm_up_task.exception())})
+    if _translator_expected() and not translator_registry.is_ready():
+        error = translator_registry.warm_up_error
+        return JSONResponse(
+            status_code=503,
+            content={"status": "failed" if error else "loading", "signwriting": False, "detail": error},
+        )
+    return {"status": "ready", "signwriting": translator_registry.is_ready()}
+
+
+@app.on_event("shutdown")
+async def shutdown_pools():
+    for pool in list(pools.values()):
+        pool.shutdown()
+    await close_client()
+
 if __name__ == "__main__":
     uvicorn.run(app, host=config.HOST, port=config.PORT, reload=config.DEBUG)
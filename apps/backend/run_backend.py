@@ -1,5 +1,10 @@
+import gc
 import importlib.util
+import logging
 import os
+import signal
+import socket
+import time
 import uvicorn
 from config import config
 
@@ -15,5 +20,88 @@ main = importlib.util.module_from_spec(spec)
 spec.loader.exec_module(main)
 app = main.app
 
+logger = logging.getLogger("run_backend")
+
+
+def _listen(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _serve_worker(sock: socket.socket) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, log_level=config.LOG_LEVEL.lower()))
+    server.run(sockets=[sock])
+
+
+def serve_prefork(workers: int) -> None:
+    """Load the models once, then fork ``workers`` processes serving one listening socket.
+
+    Forked workers share the loaded weights copy-on-write, so memory grows
+    with the model once rather than once per worker (uvicorn's own
+    ``--workers`` spawns fresh interpreters that each load their own copy).
+    ``gc.freeze()`` keeps the collector from writing to, and so copying, the
+    objects created before the fork. No inference runs in the master: torch's
+    thread pools do not survive a fork, so each worker runs its own warm-up
+    sentence after it starts. Workers that exit unexpectedly are replaced.
+    """
+    if not hasattr(os, "fork"):
+        raise SystemExit("PREFORK_WORKERS requires os.fork (Linux or macOS)")
+
+    started = time.perf_counter()
+    main.preload_models()
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Models preloaded in {time.perf_counter() - started:.1f}s; forking {workers} workers")
+
+    sock = _listen(config.HOST, config.PORT)
+    children = set()
+    stopping = False
+
+    def spawn() -> None:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                _serve_worker(sock)
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            logger.warning(f"Worker {pid} exited with status {status}; starting a replacement")
+            time.sleep(1)
+            spawn()
+    sock.close()
+
+
 if __name__ == "__main__":
-    uvicorn.run("main:app", host=config.HOST, port=config.PORT, reload=config.DEBUG)
\ No newline at end of file
+    if config.PREFORK_WORKERS > 0:
+        serve_prefork(config.PREFORK_WORKERS)
+    else:
+        uvicorn.run("main:app", host=config.HOST, port=config.PORT, reload=config.DEBUG)
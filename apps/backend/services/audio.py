@@ -0,0 +1,198 @@
+import io
+import os
+import re
+import shutil
+import stat
+import subprocess
+import tempfile
+import wave
+from pathlib import Path
+from typing import Optional
+
+from services.metrics import span
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+SAMPLE_RATE = 16000
+
+# Containers ffmpeg can only read from a seekable file
+SEEKABLE_SUFFIXES = {".mp4", ".m4a", ".mov", ".3gp"}
+# How much of an upload ffmpeg sees when only its header is needed
+PROBE_BYTES = 512 * 1024
+
+_DURATION_RE = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+_BITRATE_RE = re.compile(r"Audio: [^\n]*?(\d+) kb/s")
+
+
+class AudioDecodeError(RuntimeError):
+    """ffmpeg could not decode the audio data."""
+
+
+def ensure_ffmpeg_on_path() -> None:
+    """Ensure Whisper can invoke the ffmpeg CLI.
+
+    Whisper calls the literal command name `ffmpeg`. On Windows, the binary
+    provided by `imageio-ffmpeg` isn't always named `ffmpeg.exe`, so we create
+    a shim copy with the expected name and add it to PATH.
+    """
+
+    if shutil.which("ffmpeg"):
+        return
+
+    try:
+        from imageio_ffmpeg import get_ffmpeg_exe
+
+        bundled_exe = Path(get_ffmpeg_exe())
+    except Exception as exc:
+        raise RuntimeError(
+            "ffmpeg not found on PATH and could not locate bundled ffmpeg from imageio-ffmpeg"
+        ) from exc
+
+    shim_dir = BACKEND_DIR / ".ffmpeg"
+    shim_dir.mkdir(parents=True, exist_ok=True)
+
+    shim_name = "ffmpeg.exe" if os.name == "nt" else "ffmpeg"
+    shim_path = shim_dir / shim_name
+
+    if bundled_exe.name.lower() == shim_name.lower():
+        os.environ["PATH"] = str(bundled_exe.parent) + os.pathsep + os.environ.get("PATH", "")
+        return
+
+    if not shim_path.exists():
+        shutil.copy2(bundled_exe, shim_path)
+        if os.name != "nt":
+            shim_path.chmod(
+                shim_path.stat().st_mode
+                | stat.S_IXUSR
+                | stat.S_IXGRP
+                | stat.S_IXOTH
+            )
+
+    os.environ["PATH"] = str(shim_dir) + os.pathsep + os.environ.get("PATH", "")
+
+
+def pcm16_to_float32(data: bytes):
+    """Convert little-endian signed 16-bit PCM bytes to float32 samples in [-1, 1]."""
+    import numpy as np
+
+    return np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+
+
+def resample(samples, source_rate: int, target_rate: int = SAMPLE_RATE):
+    """Linearly resample mono float32 samples; cheap enough for streaming speech."""
+    import numpy as np
+
+    if source_rate == target_rate or len(samples) == 0:
+        return samples
+    duration = len(samples) / source_rate
+    target_length = int(round(duration * target_rate))
+    source_times = np.arange(len(samples)) / source_rate
+    target_times = np.arange(target_length) / target_rate
+    return np.interp(target_times, source_times, samples).astype(np.float32)
+
+
+def _run_ffmpeg(source: str, sample_rate: int, data: Optional[bytes] = None) -> bytes:
+    """Decode ``source`` (a path, or ``pipe:0`` with ``data`` on stdin) to 16-bit PCM bytes."""
+    ensure_ffmpeg_on_path()
+    cmd = ["ffmpeg"] + (["-nostdin"] if data is None else []) + [
+        "-threads", "0", "-i", source,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate), "-",
+    ]
+    try:
+        return subprocess.run(cmd, input=data, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as exc:
+        raise AudioDecodeError(f"Failed to decode audio: {exc.stderr.decode(errors='ignore')[-500:]}") from exc
+
+
+def decode_audio_file(file_path: str, sample_rate: int = SAMPLE_RATE):
+    """Decode any ffmpeg-readable file to mono float32 samples at ``sample_rate``."""
+    return pcm16_to_float32(_run_ffmpeg(file_path, sample_rate))
+
+
+def decode_wav_bytes(data: bytes, sample_rate: int = SAMPLE_RATE):
+    """Decode 16-bit PCM mono WAV already at ``sample_rate`` natively; returns None for anything else.
+
+    Other rates and channel layouts go through ffmpeg, whose resampler filters
+    out aliasing that a linear interpolation would fold into the speech band.
+    """
+    if data[:4] != b"RIFF" or data[8:12] != b"WAVE":
+        return None
+    try:
+        with wave.open(io.BytesIO(data), "rb") as wav:
+            if (
+                wav.getsampwidth() != 2
+                or wav.getcomptype() != "NONE"
+                or wav.getnchannels() != 1
+                or wav.getframerate() != sample_rate
+            ):
+                return None
+            frames = wav.readframes(wav.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return pcm16_to_float32(frames)
+
+
+def probe_duration(data: bytes) -> Optional[float]:
+    """Duration of in-memory audio in seconds, without decoding it; None when unknown.
+
+    WAV headers are read in-process. Anything else gets one ffmpeg call on the
+    first PROBE_BYTES, which only parses the container: its duration when the
+    header records one, else the upload size over the stream bitrate.
+    """
+    if data[:4] == b"RIFF" and data[8:12] == b"WAVE":
+        try:
+            with wave.open(io.BytesIO(data), "rb") as wav:
+                return wav.getnframes() / wav.getframerate()
+        except (wave.Error, EOFError, ZeroDivisionError):
+            pass
+    ensure_ffmpeg_on_path()
+    # Without an output ffmpeg exits once the input is probed, after printing what it found
+    result = subprocess.run(["ffmpeg", "-hide_banner", "-i", "pipe:0"], input=data[:PROBE_BYTES], capture_output=True)
+    info = result.stderr.decode(errors="ignore")
+    duration = _DURATION_RE.search(info)
+    if duration:
+        hours, minutes, seconds = duration.groups()
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    bitrate = _BITRATE_RE.search(info)
+    if bitrate and int(bitrate.group(1)) > 0:
+        return len(data) * 8 / (int(bitrate.group(1)) * 1000)
+    return None
+
+
+def decode_audio_bytes(data: bytes, suffix: str = ".webm", sample_rate: int = SAMPLE_RATE):
+    """Decode in-memory audio to mono float32 samples without a disk round trip.
+
+    16 kHz mono PCM WAV is parsed in-process. Everything else is piped through ffmpeg
+    (stdin to stdout). Only formats that need a seekable input, such as MP4
+    with its index at the end, fall back to a temporary file.
+    """
+    with span("audio_decode"):
+        samples = decode_wav_bytes(data, sample_rate)
+        if samples is not None:
+            return samples
+        try:
+            return pcm16_to_float32(_run_ffmpeg("pipe:0", sample_rate, data))
+        except AudioDecodeError:
+            if suffix.lower() not in SEEKABLE_SUFFIXES:
+                raise
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+            tmp.write(data)
+            path = tmp.name
+        try:
+            return decode_audio_file(path, sample_rate)
+        finally:
+            os.remove(path)
+
+
+def encode_wav(samples, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Encode mono float32 samples as 16-bit PCM WAV bytes."""
+    import numpy as np
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype("<i2")
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm.tobytes())
+    return buffer.getvalue()
@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from services.executors import PoolSaturated
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Groups concurrent submissions into a single batched call.
+
+    The first item to arrive opens a window of ``max_wait_ms``; everything
+    submitted before the window closes (up to ``max_batch_size`` items) is
+    handed to ``process_batch`` in one worker-thread call, and each caller
+    receives the result at its own position in the returned list. ``runner``
+    decides where that call runs (``asyncio.to_thread`` by default); once
+    ``max_pending`` items are waiting, new submissions are rejected.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int,
+        max_wait_ms: float,
+        runner: Optional[Callable[..., Awaitable[Any]]] = None,
+        max_pending: int = 0,
+    ):
+        self.name = name
+        self._process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._runner = runner or asyncio.to_thread
+        self.max_pending = max_pending
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_worker(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._worker is None or self._worker.done() or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_worker()
+        if self.max_pending and self._queue.qsize() >= self.max_pending:
+            raise PoolSaturated(self.name)
+        future = self._loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # Callers that gave up while waiting don't need a slot in the batch
+        return [(item, future) for item, future in batch if not future.done()]
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._collect()
+            if not batch:
+                continue
+            items = [item for item, _ in batch]
+            try:
+                results = await self._runner(self._process_batch, items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"{self.name} batch returned {len(results)} results for {len(items)} inputs"
+                    )
+            except Exception as exc:
+                logger.warning(f"{self.name} batch of {len(items)} failed: {exc}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            logger.debug(f"{self.name} processed a batch of {len(items)}")
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
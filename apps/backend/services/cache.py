@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+CacheValue = Union[str, bytes]
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys: Unicode NFKC and collapsed whitespace.
+
+    Case is preserved because the translation model is case-sensitive.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def make_key(*parts) -> str:
+    """Build a content-addressed key from JSON-serializable parts."""
+    payload = json.dumps(parts, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _encode(value: CacheValue) -> Tuple[str, bytes]:
+    if isinstance(value, bytes):
+        return "bytes", value
+    return "str", value.encode("utf-8")
+
+
+def _decode(kind: str, data: bytes) -> CacheValue:
+    return bytes(data) if kind == "bytes" else bytes(data).decode("utf-8")
+
+
+class _DiskTier:
+    """SQLite-backed cache tier that survives restarts.
+
+    Calls block on disk I/O; async code reaches it through ResponseCache.aget
+    and aset, which run it in a worker thread.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT PRIMARY KEY, kind TEXT NOT NULL, value BLOB NOT NULL, expires_at REAL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes, Optional[float]]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, value, expires_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            kind, data, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return kind, data, expires_at
+
+    def set(self, key: str, kind: str, data: bytes, expires_at: Optional[float]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, kind, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, kind, sqlite3.Binary(data), expires_at),
+            )
+            self._conn.commit()
+
+
+class ResponseCache:
+    """Content-addressed result cache with an in-memory LRU and optional disk tier.
+
+    The memory tier is bounded by entry count and total value bytes; the least
+    recently used entries are evicted first. Entries expire after
+    ``ttl_seconds`` (0 disables expiry). When ``disk_path`` is set, every write
+    also goes to SQLite and memory misses are served from disk; async callers
+    use aget and aset so that disk I/O stays off the event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float = 0,
+        disk_path: Optional[Path] = None,
+    ):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, bytes, Optional[float]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._disk = _DiskTier(disk_path) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CacheValue]:
+        value = self._get_memory(key)
+        if value is None and self._disk is not None:
+            value = self._load(key)
+        if value is None:
+            self._count_miss()
+        return value
+
+    async def aget(self, key: str) -> Optional[CacheValue]:
+        """Like get, but a disk lookup runs in a worker thread instead of on the event loop."""
+        value = self._get_memory(key)
+        if value is None and self._disk is not None:
+            value = await asyncio.to_thread(self._load, key)
+        if value is None:
+            self._count_miss()
+        return value
+
+    def set(self, key: str, value: CacheValue) -> None:
+        entry = self._put_memory(key, value)
+        if self._disk is not None:
+            self._save(key, *entry)
+
+    async def aset(self, key: str, value: CacheValue) -> None:
+        """Like set, but the disk write runs in a worker thread instead of on the event loop."""
+        entry = self._put_memory(key, value)
+        if self._disk is not None:
+            await asyncio.to_thread(self._save, key, *entry)
+
+    def _get_memory(self, key: str) -> Optional[CacheValue]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            kind, data, expires_at = entry
+            if expires_at is None or expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _decode(kind, data)
+            self._remove(key)
+            return None
+
+    def _put_memory(self, key: str, value: CacheValue) -> Tuple[str, bytes, Optional[float]]:
+        kind, data = _encode(value)
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._store(key, kind, data, expires_at)
+        return kind, data, expires_at
+
+    def _count_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def _load(self, key: str) -> Optional[CacheValue]:
+        """Serve a memory miss from disk, promoting the entry into memory."""
+        try:
+            entry = self._disk.get(key)
+        except sqlite3.Error as exc:
+            logger.warning(f"Cache {self.name}: disk read failed: {exc}")
+            return None
+        if entry is None:
+            return None
+        with self._lock:
+            self._store(key, *entry)
+            self.disk_hits += 1
+        return _decode(entry[0], entry[1])
+
+    def _save(self, key: str, kind: str, data: bytes, expires_at: Optional[float]) -> None:
+        try:
+            self._disk.set(key, kind, data, expires_at)
+        except sqlite3.Error as exc:
+            logger.warning(f"Cache {self.name}: disk write failed: {exc}")
+
+    def _store(self, key: str, kind: str, data: bytes, expires_at: Optional[float]) -> None:
+        if len(data) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (kind, data, expires_at)
+        self._bytes += len(data)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, data, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk": self._disk is not None,
+        }
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name: str) -> ResponseCache:
+    """Return the process-wide cache for ``name``, creating it from config on first use."""
+    with _caches_lock:
+        cache = _caches.get(name)
+        if cache is None:
+            disk_path = Path(config.CACHE_DIR) / f"{name}.sqlite3" if config.CACHE_DIR else None
+            cache = ResponseCache(
+                name,
+                max_entries=config.CACHE_MAX_ENTRIES,
+                max_bytes=config.CACHE_MAX_BYTES,
+                ttl_seconds=config.CACHE_TTL_SECONDS,
+                disk_path=disk_path,
+            )
+            _caches[name] = cache
+        return cache
+
+
+def cache_stats() -> Dict[str, dict]:
+    return {name: cache.stats() for name, cache in _caches.items()}
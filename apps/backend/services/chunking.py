@@ -0,0 +1,134 @@
+import asyncio
+import re
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from services.audio import SAMPLE_RATE
+from services.transcript import build_transcript
+
+_WORD_RE = re.compile(r"\w+(?:'\w+)*")
+
+
+def _quietest_point(samples: np.ndarray, start: int, end: int, frame_size: int) -> int:
+    """Sample index of the lowest-energy frame in [start, end)."""
+    window = samples[start:end]
+    frames = len(window) // frame_size
+    if frames < 2:
+        return (start + end) // 2
+    energy = np.square(window[:frames * frame_size].reshape(frames, frame_size)).mean(axis=1)
+    return start + int(np.argmin(energy)) * frame_size + frame_size // 2
+
+
+def plan_chunks(
+    samples: np.ndarray,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float,
+    sample_rate: int = SAMPLE_RATE,
+    frame_ms: int = 30,
+) -> List[Tuple[int, int, int]]:
+    """Split audio into overlapping windows whose cut points fall in pauses.
+
+    Every ``chunk_seconds`` the cut point is moved to the quietest frame
+    within ``search_seconds`` either side. Returns ``(start, boundary, end)``
+    sample indices per chunk: the chunk is transcribed from ``start`` (which
+    reaches ``overlap_seconds`` back into the previous chunk, for context) and
+    owns the speech from ``boundary`` to ``end``.
+    """
+    total = len(samples)
+    chunk = int(chunk_seconds * sample_rate)
+    search = int(search_seconds * sample_rate)
+    overlap = int(overlap_seconds * sample_rate)
+    frame_size = max(1, int(sample_rate * frame_ms / 1000))
+
+    boundaries = [0]
+    while total - boundaries[-1] > chunk + search:
+        target = boundaries[-1] + chunk
+        boundaries.append(_quietest_point(samples, target - search, min(total, target + search), frame_size))
+    boundaries.append(total)
+    return [
+        (max(0, boundary - overlap if i else 0), boundary, boundaries[i + 1])
+        for i, boundary in enumerate(boundaries[:-1])
+    ]
+
+
+def _shift(segment: dict, seconds: float) -> dict:
+    segment = dict(segment, start=round(segment["start"] + seconds, 3), end=round(segment["end"] + seconds, 3))
+    if "words" in segment:
+        segment["words"] = [
+            dict(word, start=round(word["start"] + seconds, 3), end=round(word["end"] + seconds, 3))
+            for word in segment["words"]
+        ]
+    return segment
+
+
+def _drop_repeated_words(previous: str, text: str, max_words: int = 12) -> str:
+    """Remove the leading words of ``text`` that repeat the end of ``previous``."""
+    before = [w.casefold() for w in _WORD_RE.findall(previous)][-max_words:]
+    matches = list(_WORD_RE.finditer(text))
+    after = [m.group().casefold() for m in matches]
+    for size in range(min(len(before), len(after)), 0, -1):
+        if before[-size:] == after[:size]:
+            return text[matches[size - 1].end():].lstrip(" ,;:.!?")
+    return text
+
+
+def stitch_segments(chunk_segments: List[List[dict]], boundaries: List[float]) -> List[dict]:
+    """Merge per-chunk segments (already on the global timeline) into one list.
+
+    A segment of chunk ``i`` is kept only when its midpoint lies at or after
+    the chunk's boundary, so the overlap is taken from the previous chunk; any
+    words repeated across the cut are removed from the later segment.
+    """
+    merged: List[dict] = []
+    for i, segments in enumerate(chunk_segments):
+        for segment in segments:
+            if i and (segment["start"] + segment["end"]) / 2 < boundaries[i]:
+                continue
+            if merged and i and segment["start"] < boundaries[i] + 1.0:
+                text = _drop_repeated_words(" ".join(s["text"] for s in merged[-3:]), segment["text"])
+                if text != segment["text"]:
+                    removed = len(_WORD_RE.findall(segment["text"])) - len(_WORD_RE.findall(text))
+                    segment = dict(segment, text=text)
+                    if "words" in segment:
+                        segment["words"] = segment["words"][removed:]
+            if segment["text"]:
+                merged.append(segment)
+    return merged
+
+
+async def transcribe_chunked(
+    samples: np.ndarray,
+    transcribe_chunk: Callable[[np.ndarray], Awaitable[dict]],
+    chunk_seconds: float,
+    overlap_seconds: float,
+    search_seconds: float,
+    max_parallel: int,
+    language: Optional[str] = None,
+    sample_rate: int = SAMPLE_RATE,
+) -> dict:
+    """Transcribe long audio as parallel overlapping chunks and stitch the segments.
+
+    ``transcribe_chunk`` takes a chunk's samples and returns a transcript
+    dict (see ``services.transcript.build_transcript``) with chunk-relative
+    times. At most ``max_parallel`` chunks are transcribed at once.
+    """
+    chunks = plan_chunks(samples, chunk_seconds, overlap_seconds, search_seconds, sample_rate)
+    slots = asyncio.Semaphore(max(1, max_parallel))
+
+    async def run(start: int, end: int) -> dict:
+        async with slots:
+            return await transcribe_chunk(samples[start:end])
+
+    results = await asyncio.gather(*(run(start, end) for start, _, end in chunks))
+    chunk_segments = [
+        [_shift(segment, start / sample_rate) for segment in result["segments"]]
+        for (start, _, _), result in zip(chunks, results)
+    ]
+    boundaries = [boundary / sample_rate for _, boundary, _ in chunks]
+    segments = [
+        {key: value for key, value in segment.items() if key not in ("text_start", "text_end")}
+        for segment in stitch_segments(chunk_segments, boundaries)
+    ]
+    return build_transcript(segments, language or next((r.get("language") for r in results if r.get("language")), None))
@@ -0,0 +1,91 @@
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class PoolSaturated(HTTPException):
+    """Raised when a pool already has its maximum number of jobs queued or running."""
+
+    def __init__(self, name: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Server busy: the {name} pool is saturated, please retry shortly.",
+            headers={"Retry-After": str(config.POOL_RETRY_AFTER_SECONDS)},
+        )
+
+
+class BoundedPool:
+    """An executor that refuses work instead of queueing it without limit.
+
+    At most ``max_pending`` jobs may be running or waiting at once; further
+    submissions fail immediately with ``PoolSaturated`` (HTTP 503 with
+    Retry-After) so a backlog in one workload class cannot stall the others.
+    """
+
+    def __init__(self, name: str, executor: Executor, max_workers: int, max_pending: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max(max_pending, max_workers)
+        self._executor = executor
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PoolSaturated(self.name)
+            self._pending += 1
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the pool and await its result."""
+        self._acquire()
+        try:
+            future = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _thread_pool(name: str, max_workers: int, max_pending: int) -> BoundedPool:
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+    return BoundedPool(name, executor, max_workers, max_pending)
+
+
+# CPU-bound model inference (Sockeye translation)
+inference_pool = _thread_pool("inference", config.INFERENCE_POOL_WORKERS, config.INFERENCE_POOL_MAX_PENDING)
+# Blocking I/O such as ffmpeg decode subprocesses
+io_pool = _thread_pool("io", config.IO_POOL_WORKERS, config.IO_POOL_MAX_PENDING)
+
+pools: Dict[str, BoundedPool] = {pool.name: pool for pool in (inference_pool, io_pool)}
+
+
+def pool_stats() -> Dict[str, dict]:
+    return {name: pool.stats() for name, pool in pools.items()}
@@ -0,0 +1,222 @@
+import asyncio
+import importlib.util
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+from fastapi import HTTPException
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# Upstream answers worth retrying: rate limiting and transient gateway errors
+RETRYABLE_STATUS = {429, 502, 503, 504}
+# Request errors caused by our side (e.g. an empty or malformed URL): retrying
+# cannot help and they say nothing about the upstream's health
+NON_TRANSIENT_ERRORS = (httpx.UnsupportedProtocol, httpx.LocalProtocolError)
+
+
+class CircuitOpen(HTTPException):
+    """Raised instead of calling an upstream that has been failing."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(
+            status_code=503,
+            detail=f"Upstream {name} is unavailable, failing fast.",
+            headers={"Retry-After": str(max(1, int(retry_after)))},
+        )
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open, calls fail immediately. After ``reset_seconds`` a single trial
+    call is let through (half-open); its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self._trial_in_flight = False
+
+    def before_call(self) -> bool:
+        """Raise CircuitOpen unless the call may go ahead; True when it is the half-open trial."""
+        if self.state == "closed":
+            return False
+        remaining = self.opened_at + self.reset_seconds - time.monotonic()
+        if self.state == "open" and remaining <= 0:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        raise CircuitOpen(self.name, remaining if remaining > 0 else self.reset_seconds)
+
+    def end_trial(self) -> None:
+        """Let another trial through after one ended without an outcome (cancelled or a local error)."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled client (keep-alive, HTTP/2 when `h2` is installed)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            http2=importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(
+                max_connections=config.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=config.HTTP_MAX_CONNECTIONS,
+            ),
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class Upstream:
+    """An external service reached through the shared client.
+
+    Each upstream has its own timeout, a cap on concurrent requests, retries
+    with jittered exponential backoff for transport errors and retryable
+    statuses, and a circuit breaker.
+    """
+
+    def __init__(self, name: str, timeout: float, max_concurrency: int, retries: int):
+        self.name = name
+        self.timeout = httpx.Timeout(timeout, connect=min(timeout, config.HTTP_CONNECT_TIMEOUT_SECONDS))
+        self.retries = retries
+        self.max_concurrency = max_concurrency
+        self.breaker = CircuitBreaker(name, config.CIRCUIT_FAILURE_THRESHOLD, config.CIRCUIT_RESET_SECONDS)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.requests = 0
+        self.retried = 0
+        self.in_flight = 0
+
+    def _backoff(self, attempt: int) -> float:
+        base = config.HTTP_RETRY_BACKOFF_MS / 1000 * (2 ** attempt)
+        return random.uniform(0, base)
+
+    @asynccontextmanager
+    async def _call(self) -> AsyncIterator[None]:
+        """Pass the circuit breaker and take a concurrency slot for one call."""
+        trial = self.breaker.before_call()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        try:
+            async with self._semaphore:
+                self.in_flight += 1
+                try:
+                    yield
+                finally:
+                    self.in_flight -= 1
+        finally:
+            # However the trial ended; a recorded outcome has already cleared it
+            if trial:
+                self.breaker.end_trial()
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send a request and return the response; raises httpx.HTTPError on failure."""
+        async with self._call():
+            return await self._send(method, url, stream=False, **kwargs)
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Like ``request``, but the body is left unread so it can be relayed chunk by chunk.
+
+        Retries only happen before the first byte of a successful response.
+        """
+        async with self._call():
+            response = await self._send(method, url, stream=True, **kwargs)
+            try:
+                yield response
+            finally:
+                await response.aclose()
+
+    async def _send(self, method: str, url: str, stream: bool, **kwargs) -> httpx.Response:
+        client = get_client()
+        for attempt in range(self.retries + 1):
+            self.requests += 1
+            try:
+                request = client.build_request(method, url, timeout=self.timeout, **kwargs)
+                response = await client.send(request, stream=stream)
+            except NON_TRANSIENT_ERRORS:
+                raise
+            except httpx.TransportError:
+                if attempt >= self.retries:
+                    self.breaker.record_failure()
+                    raise
+            else:
+                server_error = response.status_code >= 500 or response.status_code == 429
+                retry = response.status_code in RETRYABLE_STATUS and attempt < self.retries
+                if not retry:
+                    if server_error:
+                        self.breaker.record_failure()
+                    else:
+                        self.breaker.record_success()
+                    if response.is_error:
+                        await response.aclose()
+                        response.raise_for_status()
+                    return response
+                await response.aclose()
+            self.retried += 1
+            await asyncio.sleep(self._backoff(attempt))
+        raise RuntimeError("unreachable")
+
+    def stats(self) -> dict:
+        return {
+            "circuit": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "times_opened": self.breaker.times_opened,
+            "requests": self.requests,
+            "retried": self.retried,
+            "in_flight": self.in_flight,
+        }
+
+
+def _upstream(name: str, timeout: float) -> Upstream:
+    return Upstream(name, timeout, config.UPSTREAM_MAX_CONCURRENCY, config.HTTP_RETRIES)
+
+
+groq_chat = _upstream("groq_chat", config.GROQ_TIMEOUT_SECONDS)
+groq_transcription = _upstream("groq_transcription", config.GROQ_TRANSCRIBE_TIMEOUT_SECONDS)
+pose_api = _upstream("pose_api", config.POSE_TIMEOUT_SECONDS)
+
+upstreams: Dict[str, Upstream] = {u.name: u for u in (groq_chat, groq_transcription, pose_api)}
+
+
+def upstream_stats() -> Dict[str, dict]:
+    return {name: upstream.stats() for name, upstream in upstreams.items()}
@@ -0,0 +1,182 @@
+import asyncio
+import itertools
+import logging
+import threading
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection
+from typing import Any, Dict, Optional, Tuple, Union
+
+from fastapi import HTTPException
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceServerUnavailable(HTTPException):
+    """The inference server could not be reached or the connection to it was lost."""
+
+    def __init__(self, reason: str):
+        super().__init__(
+            status_code=503,
+            detail=f"Inference server unavailable: {reason}",
+            headers={"Retry-After": str(config.POOL_RETRY_AFTER_SECONDS)},
+        )
+
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    """``host:port`` for TCP (e.g. on Windows), anything else is a Unix socket path."""
+    host, _, port = address.rpartition(":")
+    if host and port.isdigit() and "/" not in address:
+        return host, int(port)
+    return address
+
+
+_LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+def check_address(address: str) -> None:
+    """Refuse inference server addresses that would accept requests from anyone.
+
+    Requests and replies are pickled, so whoever can connect can run code in
+    the server. Unix sockets are limited to the owner (see
+    services.inference_server); TCP needs INFERENCE_SERVER_AUTHKEY and, unless
+    INFERENCE_SERVER_ALLOW_REMOTE is set, a loopback host. Raises ValueError.
+    """
+    parsed = parse_address(address)
+    if isinstance(parsed, str):
+        return
+    host, _ = parsed
+    if not config.INFERENCE_SERVER_AUTHKEY:
+        raise ValueError(f"INFERENCE_SERVER_AUTHKEY must be set to use a TCP inference server address ({address})")
+    if host not in _LOOPBACK_HOSTS and not config.INFERENCE_SERVER_ALLOW_REMOTE:
+        raise ValueError(
+            f"Inference server address {address} is not a loopback host; "
+            "set INFERENCE_SERVER_ALLOW_REMOTE=true to allow it"
+        )
+
+
+def authkey() -> Optional[bytes]:
+    return config.INFERENCE_SERVER_AUTHKEY.encode() if config.INFERENCE_SERVER_AUTHKEY else None
+
+
+class InferenceClient:
+    """Forwards model calls to the inference server (services.inference_server).
+
+    Each process keeps one connection, opened on first use; concurrent calls
+    are multiplexed over it by request id and a reader thread hands replies
+    back to the waiting coroutines. A lost connection fails the calls in
+    flight with 503 and is reopened by the next call.
+    """
+
+    def __init__(self, address: str, timeout: float):
+        self.address = address
+        self.timeout = timeout
+        self._conn: Optional[Connection] = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._ids = itertools.count()
+        self._pending: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self.calls = 0
+        self.failures = 0
+
+    def _connect(self) -> Connection:
+        with self._lock:
+            if self._conn is None:
+                self._conn = Client(parse_address(self.address), authkey=authkey())
+                threading.Thread(target=self._read, args=(self._conn,), daemon=True, name="inference-client").start()
+                logger.info(f"Connected to inference server at {self.address}")
+            return self._conn
+
+    def _send(self, message) -> None:
+        conn = self._connect()
+        with self._send_lock:
+            conn.send(message)
+
+    def _read(self, conn: Connection) -> None:
+        try:
+            while True:
+                request_id, ok, payload = conn.recv()
+                waiter = self._pending.pop(request_id, None)
+                if waiter is not None:
+                    loop, future = waiter
+                    loop.call_soon_threadsafe(_resolve, future, ok, payload)
+        except (EOFError, OSError) as exc:
+            logger.warning(f"Lost connection to inference server: {exc!r}")
+        finally:
+            with self._lock:
+                if self._conn is conn:
+                    self._conn = None
+            conn.close()
+            for request_id in list(self._pending):
+                waiter = self._pending.pop(request_id, None)
+                if waiter is not None:
+                    loop, future = waiter
+                    loop.call_soon_threadsafe(_fail, future, "connection lost")
+
+    async def call(self, method: str, **kwargs) -> Any:
+        """Run ``method`` on the inference server and return its result."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request_id = next(self._ids)
+        self._pending[request_id] = (loop, future)
+        self.calls += 1
+        try:
+            # Connecting and pickling audio can block, so both happen off the event loop
+            await asyncio.to_thread(self._send, (request_id, method, kwargs))
+            return await asyncio.wait_for(future, self.timeout)
+        except (OSError, EOFError, AuthenticationError) as exc:
+            self.failures += 1
+            raise InferenceServerUnavailable(str(exc) or type(exc).__name__)
+        except asyncio.TimeoutError:
+            self.failures += 1
+            raise InferenceServerUnavailable(f"no reply within {self.timeout:.0f}s")
+        finally:
+            self._pending.pop(request_id, None)
+
+    def stats(self) -> dict:
+        return {
+            "address": self.address,
+            "connected": self._conn is not None,
+            "in_flight": len(self._pending),
+            "calls": self.calls,
+            "failures": self.failures,
+        }
+
+
+def _resolve(future: asyncio.Future, ok: bool, payload) -> None:
+    if future.done():
+        return
+    if ok:
+        future.set_result(payload)
+    else:
+        status_code, detail = payload
+        future.set_exception(HTTPException(status_code=status_code, detail=detail))
+
+
+def _fail(future: asyncio.Future, reason: str) -> None:
+    if not future.done():
+        future.set_exception(InferenceServerUnavailable(reason))
+
+
+_client: Optional[InferenceClient] = None
+_client_lock = threading.Lock()
+
+
+def get_inference_client() -> Optional[InferenceClient]:
+    """The process-wide client, or None when models run in this process.
+
+    Raises ValueError when INFERENCE_SERVER_ADDRESS is not allowed (see check_address).
+    """
+    global _client
+    if not config.INFERENCE_SERVER_ADDRESS:
+        return None
+    with _client_lock:
+        if _client is None:
+            check_address(config.INFERENCE_SERVER_ADDRESS)
+            _client = InferenceClient(config.INFERENCE_SERVER_ADDRESS, config.INFERENCE_SERVER_TIMEOUT_SECONDS)
+        return _client
+
+
+def inference_client_stats() -> Optional[dict]:
+    return _client.stats() if _client is not None else None
@@ -0,0 +1,196 @@
+"""
+Central inference server: one process that owns the Sockeye translator and
+the Whisper worker pool, serving every HTTP worker over a local socket.
+
+HTTP workers started with INFERENCE_SERVER_ADDRESS set load no models; their
+translation and transcription calls are forwarded here (see
+services.inference_client). Translation requests from all workers meet in the
+same micro-batcher, so concurrent requests share Sockeye calls across
+processes, and model memory no longer grows with the number of HTTP workers.
+
+Usage (from apps/backend):
+    python -m services.inference_server --address /tmp/signcast-inference.sock
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import threading
+from multiprocessing.connection import Connection, Listener
+
+from fastapi import HTTPException
+
+from config import config
+from services import whisper_pool
+from services.inference_client import authkey, check_address, parse_address
+from services.translator_registry import translator_registry
+
+logger = logging.getLogger(__name__)
+
+
+def _error(exc: Exception):
+    if isinstance(exc, HTTPException):
+        return exc.status_code, exc.detail
+    if isinstance(exc, ImportError):
+        return 503, f"Not available on the inference server: {exc}"
+    return 500, f"{type(exc).__name__}: {exc}"
+
+
+class InferenceServer:
+    """Accepts client connections and runs their requests on one event loop.
+
+    Each connection gets a reader thread; requests carry an id so a client
+    can have many in flight at once, and replies are sent as they finish.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self.loop = asyncio.new_event_loop()
+        self.ready = asyncio.Event()
+        self.warm_up_error = None
+        self.connections = 0
+        self._closing = False
+
+    async def _warm_up(self) -> None:
+        try:
+            if config.SIGNWRITING_WARMUP:
+                await asyncio.to_thread(translator_registry.warm_up)
+                # warm_up logs load failures instead of raising them
+                if translator_registry.warm_up_error:
+                    raise RuntimeError(f"SignWriting translator: {translator_registry.warm_up_error}")
+            if config.WHISPER_WARMUP and whisper_pool.whisper_available():
+                await whisper_pool.warm_up()
+            logger.info("Inference server ready")
+        except Exception as exc:
+            # Release the clients waiting on "ready" with the error instead of leaving them hanging
+            logger.exception("Inference server warm-up failed")
+            self.warm_up_error = f"{type(exc).__name__}: {exc}"
+        self.ready.set()
+
+    async def handle(self, method: str, kwargs: dict):
+        if method == "translate":
+            entry = await translator_registry.get_async(
+                kwargs.get("model_path"), kwargs.get("spoken_language"), kwargs.get("signed_language")
+            )
+            return await entry.translate_batched(kwargs["texts"])
+        if method == "transcribe":
+            return await whisper_pool.transcribe(kwargs["audio"], kwargs.get("initial_prompt"))
+        if method == "transcribe_segments":
+            return await whisper_pool.transcribe_segments(
+                kwargs["audio"], kwargs.get("word_timestamps", False), kwargs.get("initial_prompt")
+            )
+        if method == "ready":
+            await self.ready.wait()
+            if self.warm_up_error:
+                raise HTTPException(status_code=500, detail=f"Inference server warm-up failed: {self.warm_up_error}")
+            return self.status()
+        if method == "status":
+            return self.status()
+        raise HTTPException(status_code=400, detail=f"Unknown inference server method: {method}")
+
+    def status(self) -> dict:
+        return {
+            "ready": self.ready.is_set() and not self.warm_up_error,
+            "warm_up_error": self.warm_up_error,
+            "connections": self.connections,
+            "signwriting": translator_registry.status(),
+            "whisper": whisper_pool.whisper_available(),
+        }
+
+    async def _respond(self, conn: Connection, send_lock: threading.Lock, request_id, method: str, kwargs: dict):
+        try:
+            reply = (request_id, True, await self.handle(method, kwargs))
+        except Exception as exc:
+            if not isinstance(exc, HTTPException):
+                logger.exception(f"Inference server {method} failed")
+            reply = (request_id, False, _error(exc))
+
+        def send():
+            with send_lock:
+                conn.send(reply)
+
+        try:
+            await asyncio.to_thread(send)
+        except (OSError, EOFError):
+            pass  # the client went away; its reader already failed the request
+
+    def _serve_connection(self, conn: Connection) -> None:
+        send_lock = threading.Lock()
+        self.connections += 1
+        try:
+            while True:
+                request_id, method, kwargs = conn.recv()
+                asyncio.run_coroutine_threadsafe(self._respond(conn, send_lock, request_id, method, kwargs), self.loop)
+        except (EOFError, OSError):
+            pass
+        finally:
+            self.connections -= 1
+            conn.close()
+
+    def _accept(self, listener: Listener) -> None:
+        while True:
+            try:
+                conn = listener.accept()
+            except OSError:
+                if self._closing:
+                    return
+                logger.exception("Failed to accept an inference client")
+                continue
+            except Exception:
+                # e.g. a client with the wrong authkey
+                logger.warning("Rejected an inference client", exc_info=True)
+                continue
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def serve_forever(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        address = parse_address(self.address)
+        if isinstance(address, str) and os.path.exists(address):
+            os.remove(address)  # stale socket from a previous run
+        # Create the socket file owner-only from the start: a chmod after bind
+        # would leave a window in which other users could connect
+        previous_umask = os.umask(0o177)
+        try:
+            listener = Listener(address, authkey=authkey())
+        finally:
+            os.umask(previous_umask)
+        logger.info(f"Inference server listening on {self.address}")
+
+        stop = self.loop.stop
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                self.loop.add_signal_handler(signum, stop)
+            except (NotImplementedError, RuntimeError):
+                signal.signal(signum, lambda *_: self.loop.call_soon_threadsafe(stop))
+
+        threading.Thread(target=self._accept, args=(listener,), daemon=True).start()
+        self.loop.create_task(self._warm_up())
+        try:
+            self.loop.run_forever()
+        finally:
+            self._closing = True
+            listener.close()
+            whisper_pool.reset_whisper_pool()
+            if isinstance(address, str) and os.path.exists(address):
+                os.remove(address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the SignWriting and Whisper models to the HTTP workers")
+    parser.add_argument("--address", default=config.INFERENCE_SERVER_ADDRESS or "/tmp/signcast-inference.sock",
+                        help="Unix socket path, or host:port")
+    args = parser.parse_args()
+    logging.basicConfig(level=getattr(logging, config.LOG_LEVEL))
+    try:
+        check_address(args.address)
+    except ValueError as exc:
+        raise SystemExit(str(exc))
+    # This process runs the models itself rather than forwarding to a server
+    config.INFERENCE_SERVER_ADDRESS = ""
+    InferenceServer(args.address).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
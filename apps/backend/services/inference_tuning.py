@@ -0,0 +1,138 @@
+import logging
+from typing import List, Optional, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+INFERENCE_MODES = ("fp32", "int8", "compile", "int8+compile")
+# SockeyeModel methods the beam search calls for every batch
+COMPILED_METHODS = ("encode_and_initialize", "decode_step")
+
+
+def configure_torch_threads(threads: int) -> None:
+    """Cap torch intra-op threads (0 keeps torch's default of one per core)."""
+    if threads > 0:
+        import torch
+
+        torch.set_num_threads(threads)
+
+
+def _models(translator) -> list:
+    return list(getattr(translator, "models", None) or [])
+
+
+def quantize_translator(translator) -> bool:
+    """Replace the Linear layers of every model with dynamic int8 versions, in place."""
+    import torch
+
+    models = _models(translator)
+    if not models:
+        return False
+    quantize_dynamic = torch.ao.quantization.quantize_dynamic
+    for index, model in enumerate(models):
+        translator.models[index] = quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return True
+
+
+def compile_translator(translator) -> bool:
+    """Compile the model methods Sockeye's search calls, in place, when this torch build supports it.
+
+    The search keeps its own references to the models the translator was
+    built with and calls their encode_and_initialize/decode_step directly, so
+    replacing the models (or compiling only their forward) would change
+    nothing; the methods are swapped on the model objects instead.
+    """
+    import torch
+
+    models = _models(translator)
+    if not models or not hasattr(torch, "compile"):
+        return False
+    compiled = False
+    for model in models:
+        for name in COMPILED_METHODS:
+            method = getattr(model, name, None)
+            if method is not None:
+                setattr(model, name, torch.compile(method, dynamic=True))
+                compiled = True
+    return compiled
+
+
+def rebuild_translator(translator, beam_size: int, max_output_length: int):
+    """Return a Sockeye translator over the same loaded models with different search settings.
+
+    Sockeye fixes beam size and output length when the translator is built,
+    so changing them means building a new one. Settings the translator keeps
+    are carried over; the ones it does not store (ensemble mode, output
+    scores) are those signwriting_translation loads with. Returns the original
+    translator when nothing needs to change.
+    """
+    changes = {}
+    if beam_size and getattr(translator, "beam_size", beam_size) != beam_size:
+        changes["beam_size"] = beam_size
+    if max_output_length:
+        changes["max_output_length"] = max_output_length
+    if not changes:
+        return translator
+
+    from sockeye.inference import Translator
+
+    kwargs = dict(
+        device=translator.device,
+        ensemble_mode="linear",
+        scorer=translator._scorer,
+        output_scores=True,
+        batch_size=translator.batch_size,
+        beam_size=translator.beam_size,
+        beam_search_stop=translator.beam_search_stop,
+        nbest_size=translator.nbest_size,
+        restrict_lexicon=translator.restrict_lexicon,
+        strip_unknown_words=translator.unk_id in translator.strip_ids,
+        models=translator.models,
+        source_vocabs=translator.source_vocabs,
+        target_vocabs=translator.vocab_targets,
+    )
+    kwargs.update(changes)
+    return Translator(**kwargs)
+
+
+def optimize_translator(translator, mode: Optional[str] = None) -> Tuple[object, List[str]]:
+    """Apply the configured CPU inference settings to a freshly loaded translator.
+
+    Every step is optional: a step this torch/Sockeye build cannot do is
+    logged and skipped, leaving the fp32 model in place. The translator is
+    only rebuilt when SIGNWRITING_BEAM_SIZE or SIGNWRITING_MAX_OUTPUT_LENGTH
+    is set, so the default fp32 mode returns it untouched. Returns the
+    (possibly new) translator and the names of the steps that were applied.
+    """
+    mode = (mode or config.SIGNWRITING_INFERENCE_MODE).lower()
+    if mode not in INFERENCE_MODES:
+        logger.warning(f"Unknown SIGNWRITING_INFERENCE_MODE {mode!r}, using fp32")
+        mode = "fp32"
+    applied = []
+    configure_torch_threads(config.SIGNWRITING_TORCH_THREADS)
+
+    try:
+        rebuilt = rebuild_translator(
+            translator,
+            beam_size=config.SIGNWRITING_BEAM_SIZE,
+            max_output_length=config.SIGNWRITING_MAX_OUTPUT_LENGTH,
+        )
+        if rebuilt is not translator:
+            translator = rebuilt
+            applied.append("search_settings")
+    except Exception as exc:
+        logger.warning(f"Could not apply Sockeye search settings: {exc}")
+
+    steps = {"int8": quantize_translator, "compile": compile_translator}
+    for step in mode.split("+"):
+        if step not in steps:
+            continue
+        try:
+            if steps[step](translator):
+                applied.append(step)
+            else:
+                logger.warning(f"Inference optimization {step} is not supported by this build")
+        except Exception as exc:
+            logger.warning(f"Inference optimization {step} failed, keeping the fp32 model: {exc}")
+    return translator, applied
@@ -0,0 +1,245 @@
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Seconds; covers cache hits (ms) through long transcriptions (minutes)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+PREFIX = "signcast"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"] + self.samples()
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = list(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in values]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # label values -> (per-bucket counts, sum)
+        self._values: Dict[Tuple, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+                    break
+            self._values[key] = (counts, total + value)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = [(key, list(counts), total) for key, (counts, total) in self._values.items()]
+        lines = []
+        names = self.labelnames + ("le",)
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, key + (_number(bound),))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+_metrics: Dict[str, _Metric] = {}
+_collectors: List[Callable[[], Iterable[str]]] = []
+_registry_lock = threading.Lock()
+
+
+def _register(cls, name: str, help: str, labelnames: Sequence[str], **kwargs):
+    """Return the process-wide metric called ``name``, creating it on first use."""
+    with _registry_lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = cls(name, help, labelnames, **kwargs)
+        return metric
+
+
+def counter(name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _register(Counter, name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge, name, help, labelnames)
+
+
+def histogram(name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _register(Histogram, name, help, labelnames, buckets=buckets)
+
+
+stage_seconds = histogram(f"{PREFIX}_stage_duration_seconds", "Time spent in each processing stage.", ("stage",))
+stage_errors = counter(f"{PREFIX}_stage_errors_total", "Processing stages that raised an exception.", ("stage",))
+
+
+@contextmanager
+def span(stage: str):
+    """Time the enclosed block as ``stage``; works around sync code and awaits alike."""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        stage_errors.inc(stage=stage)
+        raise
+    finally:
+        stage_seconds.observe(time.perf_counter() - started, stage=stage)
+
+
+def register_collector(collect: Callable[[], Iterable[str]]) -> None:
+    """Add a callback that returns exposition lines, evaluated on every scrape."""
+    _collectors.append(collect)
+
+
+def stats_collector(name: str, stats: Callable[[], Optional[Dict]], label: Optional[str] = None, help: str = "") -> Callable[[], List[str]]:
+    """Expose an existing ``*_stats()`` dict as ``{PREFIX}_{name}_{field}`` samples.
+
+    With ``label`` the dict maps an instance name (a cache, a pool...) to its
+    stats and each instance becomes a label value. Numbers and booleans are
+    exported; other fields (names, lists, states) are skipped.
+    """
+
+    def collect() -> List[str]:
+        data = stats() or {}
+        instances = data.items() if label else [(None, data)]
+        fields: Dict[str, List[str]] = {}
+        for instance, values in instances:
+            if not isinstance(values, dict):
+                continue
+            labels = _labels((label,), (instance,)) if label else ""
+            for field, value in values.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                elif not isinstance(value, (int, float)):
+                    continue
+                metric = f"{PREFIX}_{name}_{_NAME_RE.sub('_', field)}"
+                if metric not in fields:
+                    fields[metric] = [f"# HELP {metric} {help or name}: {field}", f"# TYPE {metric} untyped"]
+                fields[metric].append(f"{metric}{labels} {_number(value)}")
+        return [line for lines in fields.values() for line in lines]
+
+    return collect
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_metrics.values())
+    lines: List[str] = []
+    for metric in metrics:
+        lines += metric.render()
+    for collect in list(_collectors):
+        lines += collect()
+    return "\n".join(lines) + "\n"
+
+
+http_seconds = histogram(
+    f"{PREFIX}_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
+)
+http_in_flight = gauge(f"{PREFIX}_http_requests_in_flight", "HTTP requests currently being handled.")
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template and requests in flight.
+
+    Streaming responses are timed until their last chunk is sent. Requests
+    that match no route are grouped under ``route="unmatched"`` to keep label
+    cardinality bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            http_seconds.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"],
+            )
@@ -0,0 +1,188 @@
+import argparse
+import json
+import logging
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+LEXICON_VERSION = 1
+_WORD_RE = re.compile(r"\w+(?:'\w+)*")
+_END = ""  # trie key marking the end of a phrase
+
+
+class Piece(NamedTuple):
+    """A stretch of a sentence: known phrases carry their FSW, unknown ones their text."""
+    text: str
+    signwriting: Optional[str]
+
+
+def phrase_key(text: str) -> str:
+    """Normalized lookup form of a phrase: NFKC, case-folded words, no punctuation."""
+    return " ".join(word.casefold() for word in _WORD_RE.findall(unicodedata.normalize("NFKC", text)))
+
+
+class PhraseLexicon:
+    """Known phrase -> FSW table with longest-match segmentation.
+
+    Phrases are stored in a word trie, so segmenting a sentence costs one
+    dictionary step per word regardless of the lexicon size.
+    """
+
+    def __init__(self, phrases: Dict[str, str], spoken_language: str = "en", signed_language: str = "ase", source: str = ""):
+        self.spoken_language = spoken_language
+        self.signed_language = signed_language
+        self.source = source
+        self._trie: dict = {}
+        self._longest = 0
+        for phrase, signwriting in phrases.items():
+            self.add(phrase, signwriting)
+        self.size = len(phrases)
+        self.full_hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Path) -> "PhraseLexicon":
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        if data.get("version") != LEXICON_VERSION:
+            raise ValueError(f"Unsupported phrase lexicon version: {data.get('version')}")
+        return cls(data["phrases"], data.get("spoken_language", "en"), data.get("signed_language", "ase"), str(path))
+
+    def add(self, phrase: str, signwriting: str) -> None:
+        words = phrase_key(phrase).split()
+        if not words or not signwriting.strip():
+            return
+        node = self._trie
+        for word in words:
+            node = node.setdefault(word, {})
+        node[_END] = signwriting.strip()
+        self._longest = max(self._longest, len(words))
+
+    def lookup(self, text: str) -> Optional[str]:
+        """FSW for text that is exactly one known phrase."""
+        node = self._trie
+        for word in phrase_key(text).split():
+            node = node.get(word)
+            if node is None:
+                return None
+        return node.get(_END)
+
+    def segment(self, text: str, allow_partial: bool = True) -> List[Piece]:
+        """Split text into known phrases (longest match first) and the unknown stretches between them.
+
+        Unknown stretches keep the original text between their first and last
+        word. Text with no known phrase comes back as a single unknown piece
+        with its punctuation intact; so does any text when ``allow_partial``
+        is off and it is not fully covered.
+        """
+        normalized = unicodedata.normalize("NFKC", text)
+        words = list(_WORD_RE.finditer(normalized))
+        pieces: List[Piece] = []
+        gap_start = None
+        i = 0
+        while i < len(words):
+            node = self._trie
+            match_end, match = 0, None
+            for j in range(i, min(len(words), i + self._longest)):
+                node = node.get(words[j].group().casefold())
+                if node is None:
+                    break
+                if _END in node:
+                    match_end, match = j + 1, node[_END]
+            if match is None:
+                if gap_start is None:
+                    gap_start = i
+                i += 1
+                continue
+            if gap_start is not None:
+                pieces.append(Piece(normalized[words[gap_start].start():words[i - 1].end()], None))
+                gap_start = None
+            pieces.append(Piece(normalized[words[i].start():words[match_end - 1].end()], match))
+            i = match_end
+        if gap_start is not None:
+            pieces.append(Piece(normalized[words[gap_start].start():words[-1].end()], None))
+
+        known = sum(piece.signwriting is not None for piece in pieces)
+        if known == 0 or (known < len(pieces) and not allow_partial):
+            self.misses += 1
+            return [Piece(text, None)]
+        if known == len(pieces):
+            self.full_hits += 1
+        else:
+            self.partial_hits += 1
+        return pieces
+
+    def stats(self) -> dict:
+        return {
+            "source": self.source,
+            "phrases": self.size,
+            "full_hits": self.full_hits,
+            "partial_hits": self.partial_hits,
+            "misses": self.misses,
+        }
+
+
+_lexicon: Optional[PhraseLexicon] = None
+_lexicon_loaded = False
+_lexicon_lock = threading.Lock()
+
+
+def get_phrase_lexicon() -> Optional[PhraseLexicon]:
+    """Return the lexicon at PHRASE_LEXICON_PATH, loading it on first use; None when unset or unreadable."""
+    global _lexicon, _lexicon_loaded
+    if not config.PHRASE_LEXICON_PATH:
+        return None
+    with _lexicon_lock:
+        if not _lexicon_loaded:
+            _lexicon_loaded = True
+            try:
+                _lexicon = PhraseLexicon.load(Path(config.PHRASE_LEXICON_PATH))
+                logger.info(f"Loaded {_lexicon.size} phrases from {config.PHRASE_LEXICON_PATH}")
+            except Exception as exc:
+                logger.error(f"Failed to load phrase lexicon from {config.PHRASE_LEXICON_PATH}: {exc}")
+        return _lexicon
+
+
+def phrase_lexicon_stats() -> Optional[dict]:
+    return _lexicon.stats() if _lexicon is not None else None
+
+
+def build_phrase_lexicon(phrases: List[str], output: Path, batch_size: int = 32) -> int:
+    """Translate ``phrases`` with the default Sockeye translator and write the lexicon JSON."""
+    from services.translator_registry import translator_registry
+
+    entry = translator_registry.get()
+    unique = list(dict.fromkeys(phrase.strip() for phrase in phrases if phrase_key(phrase)))
+    table: Dict[str, str] = {}
+    for start in range(0, len(unique), batch_size):
+        batch = unique[start:start + batch_size]
+        for phrase, signwriting in zip(batch, entry.translate(batch)):
+            table[phrase_key(phrase)] = signwriting.strip()
+        logger.info(f"Translated {min(start + batch_size, len(unique))}/{len(unique)} phrases")
+    data = {
+        "version": LEXICON_VERSION,
+        "model_path": entry.model.model_path,
+        "spoken_language": entry.spoken_language,
+        "signed_language": entry.signed_language,
+        "phrases": table,
+    }
+    Path(output).write_text(json.dumps(data, ensure_ascii=False, indent=1), encoding="utf-8")
+    return len(table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a phrase -> SignWriting lexicon with the Sockeye model")
+    parser.add_argument("phrases", type=Path, help="text file with one phrase per line")
+    parser.add_argument("output", type=Path, help="lexicon JSON to write")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    lines = args.phrases.read_text(encoding="utf-8").splitlines()
+    count = build_phrase_lexicon(lines, args.output, args.batch_size)
+    print(f"Wrote {count} phrases to {args.output}")
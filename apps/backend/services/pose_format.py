@@ -0,0 +1,106 @@
+import struct
+from typing import List, Tuple
+
+import numpy as np
+
+# Reader/writer for version 0.1 of the binary `.pose` format (pose-format
+# library), which is what the pose API and the frontend pose viewer use.
+POSE_FORMAT_VERSION = 0.1
+
+_FLOAT = struct.Struct("<f")
+_USHORT = struct.Struct("<H")
+_DOUBLE_USHORT = struct.Struct("<HH")
+_TRIPLE_USHORT = struct.Struct("<HHH")
+
+
+class _Reader:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        values = fmt.unpack_from(self.data, self.offset)
+        self.offset += fmt.size
+        return values
+
+    def string(self) -> str:
+        (length,) = self.unpack(_USHORT)
+        value = bytes(self.data[self.offset:self.offset + length]).decode("utf-8")
+        self.offset += length
+        return value
+
+    def floats(self, count: int) -> np.ndarray:
+        values = np.frombuffer(self.data, dtype="<f4", count=count, offset=self.offset)
+        self.offset += count * 4
+        return values
+
+
+def _pack_string(value: str) -> bytes:
+    encoded = value.encode("utf-8")
+    return _USHORT.pack(len(encoded)) + encoded
+
+
+def header_dims(header: dict) -> int:
+    """Spatial dimensions per point (the component format minus its confidence channel)."""
+    return len(header["components"][0]["format"]) - 1
+
+
+def header_points(header: dict) -> int:
+    return sum(len(component["points"]) for component in header["components"])
+
+
+def read_pose(data: bytes) -> Tuple[dict, float, np.ndarray, np.ndarray]:
+    """Parse a `.pose` file into (header, fps, data[frames, people, points, dims], confidence[frames, people, points])."""
+    reader = _Reader(data)
+    (version,) = reader.unpack(_FLOAT)
+    width, height, depth = reader.unpack(_TRIPLE_USHORT)
+    (num_components,) = reader.unpack(_USHORT)
+    components = []
+    for _ in range(num_components):
+        name = reader.string()
+        point_format = reader.string()
+        num_points, num_limbs, num_colors = reader.unpack(_TRIPLE_USHORT)
+        points = [reader.string() for _ in range(num_points)]
+        limbs = [list(reader.unpack(_DOUBLE_USHORT)) for _ in range(num_limbs)]
+        colors = [list(reader.unpack(_TRIPLE_USHORT)) for _ in range(num_colors)]
+        components.append({"name": name, "format": point_format, "points": points, "limbs": limbs, "colors": colors})
+    header = {
+        "version": round(version, 3),
+        "dimensions": {"width": width, "height": height, "depth": depth},
+        "components": components,
+    }
+
+    fps, _ = reader.unpack(_DOUBLE_USHORT)
+    (people,) = reader.unpack(_USHORT)
+    points = header_points(header)
+    dims = header_dims(header)
+    # The stored frame count is a ushort and can overflow, so derive it from the body size
+    frames = (len(data) - reader.offset) // (people * points * (dims + 1) * 4)
+    body = reader.floats(frames * people * points * dims).reshape(frames, people, points, dims)
+    confidence = reader.floats(frames * people * points).reshape(frames, people, points)
+    return header, float(fps), body, confidence
+
+
+def write_pose(header: dict, fps: float, data: np.ndarray, confidence: np.ndarray) -> bytes:
+    """Serialize pose data (frames, people, points, dims) and confidence (frames, people, points)."""
+    frames, people, points, dims = data.shape
+    if points != header_points(header) or dims != header_dims(header):
+        raise ValueError("Pose data shape does not match the header")
+    dimensions = header["dimensions"]
+    parts: List[bytes] = [
+        _FLOAT.pack(POSE_FORMAT_VERSION),
+        _TRIPLE_USHORT.pack(dimensions["width"], dimensions["height"], dimensions["depth"]),
+        _USHORT.pack(len(header["components"])),
+    ]
+    for component in header["components"]:
+        parts.append(_pack_string(component["name"]))
+        parts.append(_pack_string(component["format"]))
+        parts.append(_TRIPLE_USHORT.pack(len(component["points"]), len(component["limbs"]), len(component["colors"])))
+        parts.extend(_pack_string(point) for point in component["points"])
+        parts.extend(_DOUBLE_USHORT.pack(*limb) for limb in component["limbs"])
+        parts.extend(_TRIPLE_USHORT.pack(*color) for color in component["colors"])
+    parts.append(_DOUBLE_USHORT.pack(int(round(fps)), min(frames, 0xFFFF)))
+    parts.append(_USHORT.pack(people))
+    parts.append(np.ascontiguousarray(data, dtype="<f4").tobytes())
+    parts.append(np.ascontiguousarray(confidence, dtype="<f4").tobytes())
+    return b"".join(parts)
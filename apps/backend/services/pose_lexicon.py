@@ -0,0 +1,119 @@
+import argparse
+import logging
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from config import config
+from services.pose_format import header_dims, header_points, read_pose
+from services.pose_store import STORE_DTYPES, PoseStore, PoseStoreWriter
+
+logger = logging.getLogger(__name__)
+
+
+class PoseLexicon(PoseStore):
+    """A pose store of per-sign clips, keyed by FSW sign or symbol key.
+
+    The store metadata carries the `.pose` header shared by every clip, the
+    output frame rate and the signed language. Clips keep their recorded frame
+    rate and are resampled while composing (see ``services.pose_synthesis``).
+    """
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.header = self.metadata["header"]
+        self.fps = float(self.metadata["fps"])
+        self.signed_language = self.metadata.get("signed_language", "ase")
+
+    def status(self) -> dict:
+        return {
+            "path": str(self.path),
+            "signs": len(self),
+            "fps": self.fps,
+            "signed_language": self.signed_language,
+            "dtype": str(self.dtype),
+            "bytes": self.nbytes,
+        }
+
+
+_lexicon: Optional[PoseLexicon] = None
+_lexicon_error: Optional[str] = None
+_lexicon_lock = threading.Lock()
+
+
+def get_pose_lexicon() -> Optional[PoseLexicon]:
+    """Return the lexicon at POSE_LEXICON_PATH, loading it on first use; None when unavailable."""
+    global _lexicon, _lexicon_error
+    if not config.POSE_LEXICON_PATH:
+        return None
+    with _lexicon_lock:
+        if _lexicon is None and _lexicon_error is None:
+            try:
+                _lexicon = PoseLexicon(Path(config.POSE_LEXICON_PATH))
+                logger.info(f"Loaded pose lexicon with {len(_lexicon)} signs from {config.POSE_LEXICON_PATH}")
+            except Exception as exc:
+                _lexicon_error = str(exc)
+                logger.error(f"Failed to load pose lexicon from {config.POSE_LEXICON_PATH}: {exc}")
+        return _lexicon
+
+
+def lexicon_status() -> dict:
+    """Report the lexicon as it stands; never loads it, since health probes call this."""
+    if not config.POSE_LEXICON_PATH:
+        state = "disabled"
+    elif _lexicon_error:
+        state = "error"
+    else:
+        state = "loaded" if _lexicon is not None else "not_loaded"
+    status = {"engine": config.POSE_ENGINE, "state": state, "lexicon": _lexicon.status() if _lexicon else None}
+    if _lexicon_error:
+        status["error"] = _lexicon_error
+    return status
+
+
+def build_lexicon(
+    source_dir: Path,
+    output_dir: Path,
+    fps: Optional[float] = None,
+    signed_language: str = "ase",
+    dtype: str = "float16",
+) -> int:
+    """Build a lexicon from a directory of ``<sign key>.pose`` files.
+
+    Only the first person of each file is kept, and every file must share the
+    first file's skeleton. ``fps`` is the output frame rate (default: that of
+    the first file). Returns the number of signs written.
+    """
+    writer = None
+    header = None
+    for pose_path in sorted(Path(source_dir).glob("*.pose")):
+        clip_header, clip_fps, data, confidence = read_pose(pose_path.read_bytes())
+        if header is None:
+            header = clip_header
+            fps = fps or clip_fps
+            writer = PoseStoreWriter(output_dir, header_points(header), header_dims(header) + 1, dtype)
+        elif header_points(clip_header) != header_points(header):
+            logger.warning(f"Skipping {pose_path.name}: skeleton does not match the lexicon")
+            continue
+        if data.shape[0] == 0:
+            continue
+        writer.add(pose_path.stem, np.concatenate([data[:, 0], confidence[:, 0, :, None]], axis=-1), clip_fps)
+
+    if writer is None:
+        raise ValueError(f"No .pose files found in {source_dir}")
+    writer.close({"header": header, "fps": fps, "signed_language": signed_language})
+    return len(writer)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build an offline pose lexicon from per-sign .pose files")
+    parser.add_argument("source_dir", type=Path, help="directory of <FSW sign or symbol key>.pose files")
+    parser.add_argument("output_dir", type=Path)
+    parser.add_argument("--fps", type=float, default=None)
+    parser.add_argument("--signed-language", default="ase")
+    parser.add_argument("--dtype", choices=STORE_DTYPES, default="float16")
+    args = parser.parse_args()
+    count = build_lexicon(args.source_dir, args.output_dir, args.fps, args.signed_language, args.dtype)
+    print(f"Wrote {count} signs to {args.output_dir}")
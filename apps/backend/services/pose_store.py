@@ -0,0 +1,171 @@
+import json
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+DATA_FILE = "clips.bin"
+INDEX_FILE = "index.json"
+STORE_VERSION = 2
+STORE_DTYPES = ("float16", "float32")
+
+
+class ClipRef(NamedTuple):
+    offset: int  # first frame in the data file
+    frames: int
+    fps: float
+
+
+def resampled_length(frames: int, source_fps: float, target_fps: float) -> int:
+    if frames < 2 or source_fps == target_fps:
+        return frames
+    return max(2, int(round((frames - 1) / source_fps * target_fps)) + 1)
+
+
+def resample_into(clip: np.ndarray, out: np.ndarray) -> None:
+    """Linearly resample ``clip`` along its first axis to fill ``out``."""
+    if len(out) == len(clip):
+        out[:] = clip
+        return
+    positions = np.linspace(0, len(clip) - 1, len(out))
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, len(clip) - 1)
+    weight = (positions - lower).astype(np.float32).reshape((-1,) + (1,) * (clip.ndim - 1))
+    np.multiply(clip[lower], 1 - weight, out=out, casting="unsafe")
+    out += clip[upper] * weight
+
+
+def blend_into(start: np.ndarray, end: np.ndarray, out: np.ndarray) -> None:
+    """Fill ``out`` with an eased (smoothstep) transition from ``start`` to ``end``, excluding both."""
+    t = np.linspace(0, 1, len(out) + 2, dtype=np.float32)[1:-1]
+    weight = (t * t * (3 - 2 * t)).reshape((-1,) + (1,) * start.ndim)
+    np.subtract(end, start, out=out, casting="unsafe")
+    out *= weight
+    out += start
+
+
+class PoseStore:
+    """Pose clips packed into one contiguous, memory-mapped array.
+
+    ``clips.bin`` holds every clip back to back as (frames, points, channels)
+    in float16 or float32; ``index.json`` maps each key to its frame offset,
+    frame count and frame rate, plus any metadata given at build time.
+    ``clip()`` returns a view into the mapping, so nothing is read or copied
+    until frames are used, and ``compose()`` writes a whole sequence into one
+    preallocated output array.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        index = json.loads((self.path / INDEX_FILE).read_text(encoding="utf-8"))
+        if index.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported pose store version {index.get('version')}; rebuild the store")
+        self.metadata: dict = index["metadata"]
+        self.points: int = index["points"]
+        self.channels: int = index["channels"]
+        self._refs: Dict[str, ClipRef] = {key: ClipRef(*ref) for key, ref in index["clips"].items()}
+        total_frames = index["frames"]
+        self._data = np.memmap(
+            self.path / DATA_FILE, dtype=index["dtype"], mode="r",
+            shape=(total_frames, self.points, self.channels),
+        )
+
+    def __len__(self) -> int:
+        return len(self._refs)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._refs
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._data.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self._data.nbytes
+
+    def ref(self, key: str) -> Optional[ClipRef]:
+        return self._refs.get(key)
+
+    def clip(self, key: str) -> Optional[np.ndarray]:
+        """Zero-copy view of a clip's frames, or None."""
+        ref = self._refs.get(key)
+        if ref is None:
+            return None
+        return self._data[ref.offset:ref.offset + ref.frames]
+
+    def compose(self, keys: List[Optional[str]], fps: float, transition_frames: int = 0, pause_frames: int = 0) -> np.ndarray:
+        """Build one float32 sequence from clips at ``fps``.
+
+        ``None`` entries are pauses that hold the previous frame for
+        ``pause_frames``. Consecutive clips are joined by ``transition_frames``
+        blended frames. Each source frame is copied exactly once, straight into
+        the output (resampled on the way when its frame rate differs).
+        """
+        plan = []  # (kind, key, frames)
+        total = 0
+        for key in keys:
+            if key is None:
+                if plan and pause_frames:
+                    plan.append(("pause", None, pause_frames))
+                    total += pause_frames
+                continue
+            ref = self._refs[key]
+            if plan and transition_frames:
+                plan.append(("transition", key, transition_frames))
+                total += transition_frames
+            length = resampled_length(ref.frames, ref.fps, fps)
+            plan.append(("clip", key, length))
+            total += length
+
+        out = np.empty((total, self.points, self.channels), dtype=np.float32)
+        position = 0
+        for kind, key, length in plan:
+            target = out[position:position + length]
+            if kind == "pause":
+                target[:] = out[position - 1]
+            elif kind == "transition":
+                blend_into(out[position - 1], self.clip(key)[0], target)
+            else:
+                resample_into(self.clip(key), target)
+            position += length
+        return out
+
+
+class PoseStoreWriter:
+    """Appends clips to a new store; call ``close()`` to write the index."""
+
+    def __init__(self, path: Path, points: int, channels: int, dtype: str = "float16"):
+        if dtype not in STORE_DTYPES:
+            raise ValueError(f"dtype must be one of {STORE_DTYPES}")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.points = points
+        self.channels = channels
+        self.dtype = dtype
+        self._file = open(self.path / DATA_FILE, "wb")
+        self._refs: Dict[str, list] = {}
+        self._frames = 0
+
+    def add(self, key: str, clip: np.ndarray, fps: float) -> None:
+        if clip.shape[1:] != (self.points, self.channels):
+            raise ValueError(f"Clip {key} has shape {clip.shape[1:]}, expected {(self.points, self.channels)}")
+        self._file.write(np.ascontiguousarray(clip, dtype=self.dtype).tobytes())
+        self._refs[key] = [self._frames, len(clip), float(fps)]
+        self._frames += len(clip)
+
+    def close(self, metadata: Optional[dict] = None) -> None:
+        self._file.close()
+        index = {
+            "version": STORE_VERSION,
+            "dtype": self.dtype,
+            "points": self.points,
+            "channels": self.channels,
+            "frames": self._frames,
+            "metadata": metadata or {},
+            "clips": self._refs,
+        }
+        (self.path / INDEX_FILE).write_text(json.dumps(index), encoding="utf-8")
+
+    def __len__(self) -> int:
+        return len(self._refs)
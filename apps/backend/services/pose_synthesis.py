@@ -0,0 +1,81 @@
+import re
+from typing import List, Optional, Tuple
+
+from config import config
+from services.pose_format import write_pose
+from services.pose_lexicon import PoseLexicon
+
+# One FSW sign: optional A-prefix (sequence), box marker with its position, then positioned symbols
+_SIGN_RE = re.compile(
+    r"(?:A(?:S[123][0-9a-f]{2}[0-5][0-9a-f])+)?"
+    r"[BLMR]\d{3}x\d{3}(?:S[123][0-9a-f]{2}[0-5][0-9a-f]\d{3}x\d{3})*"
+)
+# Punctuation symbols (S387-S38b) stand alone and become a pause
+_PUNCTUATION_RE = re.compile(r"S38[7-9ab][0-5][0-9a-f]\d{3}x\d{3}")
+_TOKEN_RE = re.compile(f"{_SIGN_RE.pattern}|{_PUNCTUATION_RE.pattern}")
+_BOX_RE = re.compile(r"[BLMR]\d{3}x\d{3}")
+_SYMBOL_RE = re.compile(r"S[123][0-9a-f]{2}[0-5][0-9a-f](?=\d{3}x\d{3})")
+
+
+def parse_fsw(fsw: str) -> List[str]:
+    """Split FSW text into signs and punctuation, in reading order."""
+    return _TOKEN_RE.findall(fsw)
+
+
+def is_punctuation(token: str) -> bool:
+    return _PUNCTUATION_RE.fullmatch(token) is not None
+
+
+def sign_keys(sign: str) -> Tuple[str, str]:
+    """Lexicon keys for a sign, most specific first.
+
+    The exact sign (without its sequence prefix) matches only that spelling;
+    the symbol key (its symbols, sorted) ignores symbol placement, which
+    varies between otherwise identical transcriptions.
+    """
+    sign = sign[_BOX_RE.search(sign).start():]
+    return sign, "".join(sorted(_SYMBOL_RE.findall(sign)))
+
+
+class MissingSigns(LookupError):
+    """Signs of the text that are not in the pose lexicon."""
+
+    def __init__(self, missing: List[str], total: int):
+        self.missing = missing
+        super().__init__(f"{len(missing)} of {total} signs are not in the pose lexicon: {' '.join(missing)}")
+
+
+def lexicon_keys(lexicon: PoseLexicon, fsw: str) -> Tuple[List[Optional[str]], List[str]]:
+    """Lexicon key of each sign in ``fsw`` (None for punctuation), and the signs it lacks."""
+    keys: List[Optional[str]] = []
+    missing: List[str] = []
+    for token in parse_fsw(fsw):
+        if is_punctuation(token):
+            keys.append(None)
+            continue
+        key = next((key for key in sign_keys(token) if key in lexicon), None)
+        if key is None:
+            missing.append(token)
+            continue
+        keys.append(key)
+    return keys, missing
+
+
+def synthesize_pose(lexicon: PoseLexicon, fsw: str, allow_missing: bool = True) -> bytes:
+    """Compose lexicon clips for the signs in ``fsw`` into a `.pose` file.
+
+    Consecutive clips are joined by POSE_TRANSITION_FRAMES blended frames;
+    punctuation holds the previous pose for POSE_PAUSE_MS. Signs that are not
+    in the lexicon are skipped when ``allow_missing`` is set. Raises
+    MissingSigns when none are found, or when any is missing otherwise.
+    """
+    keys, missing = lexicon_keys(lexicon, fsw)
+    found = sum(key is not None for key in keys)
+    if not found or (missing and not allow_missing):
+        raise MissingSigns(missing, found + len(missing))
+
+    pause_frames = int(round(config.POSE_PAUSE_MS / 1000 * lexicon.fps))
+    frames = lexicon.compose(keys, lexicon.fps, config.POSE_TRANSITION_FRAMES, pause_frames)
+    data = frames[:, None, :, :-1]
+    confidence = frames[:, None, :, -1]
+    return write_pose(lexicon.header, lexicon.fps, data, confidence)
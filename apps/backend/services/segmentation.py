@@ -0,0 +1,55 @@
+import re
+from typing import List, NamedTuple
+
+from config import config
+
+# Sentence-final punctuation followed by whitespace (or the end of the text), or a line break
+_SENTENCE_END_RE = re.compile(r"[.!?]+[\"')\]]*(?=\s|$)|\n+")
+# Clause boundaries used to break up sentences that are still too long
+_CLAUSE_END_RE = re.compile(r"[,;:]+(?=\s)")
+_ABBREVIATIONS = {"mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "vs.", "etc.", "e.g.", "i.e.", "jr.", "sr."}
+
+
+class TextSegment(NamedTuple):
+    text: str
+    start: int
+    end: int
+
+
+def _split_at(text: str, offset: int, pattern: re.Pattern, skip_abbreviations: bool) -> List[TextSegment]:
+    segments = []
+    cursor = 0
+    for match in pattern.finditer(text):
+        if skip_abbreviations:
+            words = text[cursor:match.end()].split()
+            if words and words[-1].lower() in _ABBREVIATIONS:
+                continue
+        segments.append((cursor, match.end()))
+        cursor = match.end()
+    segments.append((cursor, len(text)))
+
+    result = []
+    for start, end in segments:
+        chunk = text[start:end]
+        stripped = chunk.strip()
+        if not stripped:
+            continue
+        start += len(chunk) - len(chunk.lstrip())
+        result.append(TextSegment(stripped, offset + start, offset + start + len(stripped)))
+    return result
+
+
+def split_sentences(text: str, max_chars: int = None) -> List[TextSegment]:
+    """Split text into sentences, breaking sentences longer than ``max_chars`` at clauses.
+
+    Offsets are character positions in the original ``text`` so callers can
+    map each segment back to the input.
+    """
+    max_chars = config.SEGMENT_MAX_CHARS if max_chars is None else max_chars
+    segments = []
+    for sentence in _split_at(text, 0, _SENTENCE_END_RE, skip_abbreviations=True):
+        if max_chars and len(sentence.text) > max_chars:
+            segments.extend(_split_at(sentence.text, sentence.start, _CLAUSE_END_RE, skip_abbreviations=False))
+        else:
+            segments.append(sentence)
+    return segments
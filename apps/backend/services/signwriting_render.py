@@ -0,0 +1,237 @@
+"""
+Server-side rendering of FSW (Formal SignWriting) to SVG and PNG.
+
+Symbols are drawn with the Sutton SignWriting TrueType fonts, the same ones
+the frontend loads: every symbol key maps to a private-use code point in the
+Line font (outlines) and the Fill font (interior), and at 30px one FSW
+coordinate unit is one pixel. SVG output references the fonts by family name,
+so the viewer needs them installed or loaded (as the frontend does); PNG
+output rasterizes them here and needs Pillow plus SIGNWRITING_FONT_DIR.
+"""
+
+import functools
+import io
+import math
+import re
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
+
+from config import config
+from services.pose_synthesis import is_punctuation, parse_fsw
+
+try:
+    from PIL import Image, ImageColor, ImageDraw, ImageFont
+    import PIL
+except ImportError:
+    PIL = None
+
+LINE_FONT = "SuttonSignWritingLine.ttf"
+FILL_FONT = "SuttonSignWritingFill.ttf"
+FONT_SIZE = 30  # one FSW coordinate unit per pixel
+# Size assumed for a standalone punctuation symbol when its glyph cannot be measured
+_DEFAULT_SYMBOL_SIZE = (30, 30)
+
+_SYMBOL_RE = re.compile(r"(S[123][0-9a-f]{2}[0-5][0-9a-f])(\d{3})x(\d{3})")
+_BOX_RE = re.compile(r"[BLMR](\d{3})x(\d{3})")
+_COLOR_RE = re.compile(r"#[0-9a-fA-F]{3,8}|[a-zA-Z]{3,20}")
+
+
+class Sign(NamedTuple):
+    fsw: str  # without the sequence prefix, which does not affect drawing
+    symbols: List[Tuple[str, int, int]]
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+    @property
+    def width(self) -> int:
+        return self.right - self.left
+
+    @property
+    def height(self) -> int:
+        return self.bottom - self.top
+
+
+class RenderOptions(NamedTuple):
+    scale: float = 1.0
+    padding: int = 0
+    line_color: str = "black"
+    fill_color: str = "white"
+    background: str = "transparent"
+
+
+def symbol_id(key: str) -> int:
+    """Glyph number of a symbol key (e.g. ``S14c20``) in the Sutton fonts."""
+    base, fill, rotation = int(key[1:4], 16), int(key[4], 16), int(key[5], 16)
+    return (base - 0x100) * 96 + fill * 16 + rotation + 1
+
+
+def line_char(key: str) -> str:
+    return chr(0xF0000 + symbol_id(key))
+
+
+def fill_char(key: str) -> str:
+    return chr(0x100000 + symbol_id(key))
+
+
+@functools.lru_cache(maxsize=None)
+def _font(filename: str, size: int):
+    path = Path(config.SIGNWRITING_FONT_DIR) / filename
+    if PIL is None or not path.is_file():
+        return None
+    return ImageFont.truetype(str(path), size)
+
+
+def png_unavailable_reason() -> Optional[str]:
+    """Why PNG output cannot be rendered here, or None when it can."""
+    if PIL is None:
+        return "PNG rendering requires Pillow (pip install pillow)"
+    if _font(LINE_FONT, FONT_SIZE) is None:
+        return f"PNG rendering requires {LINE_FONT} in SIGNWRITING_FONT_DIR ({config.SIGNWRITING_FONT_DIR})"
+    return None
+
+
+def font_version() -> str:
+    """Identifies the installed fonts and Pillow, so cached images change when they do."""
+    parts = [getattr(PIL, "__version__", "none")]
+    for filename in (LINE_FONT, FILL_FONT):
+        try:
+            stat = (Path(config.SIGNWRITING_FONT_DIR) / filename).stat()
+            parts.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+        except OSError:
+            parts.append("-")
+    return "/".join(parts)
+
+
+@functools.lru_cache(maxsize=4096)
+def symbol_size(key: str) -> Tuple[int, int]:
+    font = _font(LINE_FONT, FONT_SIZE)
+    if font is None:
+        return _DEFAULT_SYMBOL_SIZE
+    _, _, right, bottom = font.getbbox(line_char(key), anchor="ls")
+    return right, bottom
+
+
+def parse_sign(token: str) -> Sign:
+    """Symbols and bounding box of one FSW sign or standalone punctuation symbol."""
+    if is_punctuation(token):
+        key, x, y = _SYMBOL_RE.fullmatch(token).groups()
+        x, y = int(x), int(y)
+        width, height = symbol_size(key)
+        return Sign(token, [(key, x, y)], x, y, x + width, y + height)
+
+    box = _BOX_RE.search(token)
+    fsw = token[box.start():]
+    symbols = [(key, int(x), int(y)) for key, x, y in _SYMBOL_RE.findall(fsw)]
+    right, bottom = int(box.group(1)), int(box.group(2))
+    left = min((x for _, x, _ in symbols), default=right)
+    top = min((y for _, _, y in symbols), default=bottom)
+    return Sign(fsw, symbols, min(left, right), min(top, bottom), right, bottom)
+
+
+def parse_signs(fsw: str) -> List[Sign]:
+    return [parse_sign(token) for token in parse_fsw(fsw)]
+
+
+def check_color(color: str, allow_transparent: bool = False) -> str:
+    """Accept CSS color names and hex colors; raises ValueError otherwise."""
+    color = color.lower()
+    if allow_transparent and color == "transparent":
+        return color
+    if not _COLOR_RE.fullmatch(color):
+        raise ValueError(f"Invalid color: {color!r}")
+    if PIL is not None:
+        ImageColor.getrgb(color)  # raises ValueError for unknown names
+    return color
+
+
+def layout_signs(signs: List[Sign], padding: int, columns: int = 0) -> Tuple[List[Tuple[int, int]], int, int]:
+    """Place signs left to right in rows of ``columns`` (0: one row), each in a padded cell.
+
+    Returns the top-left corner of each cell and the sheet size, in FSW units.
+    """
+    columns = columns or len(signs) or 1
+    positions = []
+    width = height = 0
+    for row_start in range(0, len(signs), columns):
+        row = signs[row_start:row_start + columns]
+        x = 0
+        for sign in row:
+            positions.append((x, height))
+            x += sign.width + 2 * padding
+        width = max(width, x)
+        height += max(sign.height for sign in row) + 2 * padding
+    return positions, width, height
+
+
+def render_svg(signs: List[Sign], positions: List[Tuple[int, int]], width: int, height: int,
+               options: RenderOptions) -> str:
+    scale = options.scale
+    parts = [
+        f'<svg version="1.1" xmlns="http://www.w3.org/2000/svg" '
+        f'width="{_px(width * scale)}" height="{_px(height * scale)}" viewBox="0 0 {width} {height}">'
+    ]
+    if options.background != "transparent":
+        parts.append(f'<rect width="100%" height="100%" fill="{options.background}"/>')
+    for sign, (x, y) in zip(signs, positions):
+        dx = x + options.padding - sign.left
+        dy = y + options.padding - sign.top
+        # The zero-size text keeps the FSW selectable and copyable, as in Sutton's own SVG output
+        parts.append(f'<g transform="translate({dx},{dy})"><text font-size="0">{sign.fsw}</text>')
+        for key, sx, sy in sign.symbols:
+            parts.append(
+                f'<g transform="translate({sx},{sy})">'
+                f'<text fill="{options.fill_color}" style="font-family:\'SuttonSignWritingFill\';font-size:{FONT_SIZE}px;">'
+                f'&#x{ord(fill_char(key)):x};</text>'
+                f'<text fill="{options.line_color}" style="font-family:\'SuttonSignWritingLine\';font-size:{FONT_SIZE}px;">'
+                f'&#x{ord(line_char(key)):x};</text></g>'
+            )
+        parts.append("</g>")
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+@functools.lru_cache(maxsize=config.RENDER_GLYPH_CACHE_SIZE)
+def _glyph(key: str, size: int, line_color: str, fill_color: str):
+    """One symbol rasterized at ``size`` px, cropped to its ink, with its offset from the symbol origin."""
+    line_font = _font(LINE_FONT, size)
+    fill_font = _font(FILL_FONT, size)
+    left, top, right, bottom = line_font.getbbox(line_char(key), anchor="ls")
+    image = Image.new("RGBA", (max(right - left, 1), max(bottom - top, 1)))
+    draw = ImageDraw.Draw(image)
+    if fill_font is not None:
+        draw.text((-left, -top), fill_char(key), font=fill_font, fill=fill_color, anchor="ls")
+    draw.text((-left, -top), line_char(key), font=line_font, fill=line_color, anchor="ls")
+    return image, left, top
+
+
+def render_png(signs: List[Sign], positions: List[Tuple[int, int]], width: int, height: int,
+               options: RenderOptions) -> bytes:
+    scale = options.scale
+    size = max(1, round(FONT_SIZE * scale))
+    background = (0, 0, 0, 0) if options.background == "transparent" else options.background
+    image = Image.new("RGBA", (_px(width * scale), _px(height * scale)), background)
+    for sign, (x, y) in zip(signs, positions):
+        dx = x + options.padding - sign.left
+        dy = y + options.padding - sign.top
+        for key, sx, sy in sign.symbols:
+            glyph, left, top = _glyph(key, size, options.line_color, options.fill_color)
+            gx = round((dx + sx) * scale) + left
+            gy = round((dy + sy) * scale) + top
+            # Clip the rare glyph whose ink reaches past the sign box
+            crop = (max(0, -gx), max(0, -gy), min(glyph.width, image.width - gx), min(glyph.height, image.height - gy))
+            if crop[0] < crop[2] and crop[1] < crop[3]:
+                image.alpha_composite(glyph, (max(gx, 0), max(gy, 0)), crop)
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def _px(value: float) -> int:
+    return max(1, math.ceil(value))
+
+
+def glyph_cache_stats() -> dict:
+    info = _glyph.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "entries": info.currsize, "max_entries": info.maxsize}
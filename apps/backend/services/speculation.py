@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+def _consume_result(task: asyncio.Task) -> None:
+    # Speculative work may never be claimed; don't let its errors be reported as unhandled
+    if not task.cancelled():
+        task.exception()
+
+
+class _Entry:
+    def __init__(self, tasks: Dict[str, Tuple[str, asyncio.Task]], expiry: asyncio.TimerHandle):
+        self.tasks = tasks
+        self.expiry = expiry
+
+
+class SpeculativeRunner:
+    """Work started ahead of the request that will (probably) need it.
+
+    ``start()`` launches one task per stage under a client-chosen request id,
+    each tagged with a key describing its input. A later request for the
+    same id and stage ``claim()``s the task: if its key matches, it gets the
+    speculative result (awaiting it if still running); otherwise the task is
+    cancelled and the caller does the work itself. Unclaimed tasks are
+    cancelled after ``ttl_seconds``.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, _Entry] = {}
+        self.started = 0
+        self.reused = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def start(self, request_id: str, jobs: Dict[str, Tuple[str, Callable[[], Awaitable[Any]]]]) -> None:
+        """Start ``jobs`` (stage -> (key, coroutine factory)) for ``request_id``."""
+        if not jobs or request_id in self._entries:
+            return
+        if len(self._entries) >= self.max_entries:
+            self.skipped += 1
+            return
+        tasks = {}
+        for stage, (key, factory) in jobs.items():
+            task = asyncio.create_task(factory())
+            task.add_done_callback(_consume_result)
+            tasks[stage] = (key, task)
+        expiry = asyncio.get_running_loop().call_later(self.ttl_seconds, self._expire, request_id)
+        self._entries[request_id] = _Entry(tasks, expiry)
+        self.started += len(tasks)
+
+    async def claim(self, request_id: str, stage: str, key: str) -> Tuple[bool, Optional[Any]]:
+        """Return (True, result) when a matching speculative result exists, else (False, None)."""
+        entry = self._entries.get(request_id)
+        if entry is None or stage not in entry.tasks:
+            return False, None
+        task_key, task = entry.tasks.pop(stage)
+        if not entry.tasks:
+            entry.expiry.cancel()
+            del self._entries[request_id]
+        if task_key != key:
+            task.cancel()
+            self.cancelled += 1
+            return False, None
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return False, None
+            raise
+        except Exception as exc:
+            # The caller repeats the work and reports the error itself
+            logger.info(f"Speculative {stage} for {request_id} failed: {exc}")
+            self.failed += 1
+            return False, None
+        self.reused += 1
+        return True, result
+
+    def _expire(self, request_id: str) -> None:
+        entry = self._entries.pop(request_id, None)
+        if entry is None:
+            return
+        for _, task in entry.tasks.values():
+            if not task.done():
+                task.cancel()
+            self.expired += 1
+
+    def stats(self) -> dict:
+        return {
+            "pending": sum(len(entry.tasks) for entry in self._entries.values()),
+            "started": self.started,
+            "reused": self.reused,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "failed": self.failed,
+            "skipped": self.skipped,
+        }
+
+
+speculation = SpeculativeRunner(config.SPECULATION_TTL_SECONDS, config.SPECULATION_MAX_PENDING)
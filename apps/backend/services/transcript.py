@@ -0,0 +1,61 @@
+import re
+from typing import Iterable, List, Optional
+
+# Whisper sometimes leaves "[00:00:01.000 --> 00:00:03.000]" markers in its text
+_TIMESTAMP_RE = re.compile(r"\[\d{2}:\d{2}:\d{2}\.\d{3} --> \d{2}:\d{2}:\d{2}\.\d{3}\]")
+
+TIMESTAMP_GRANULARITIES = ("segment", "word")
+
+
+def clean_text(text: str) -> str:
+    """Strip timestamp markers and join the remaining lines."""
+    lines = (_TIMESTAMP_RE.sub("", line).strip() for line in (text or "").splitlines())
+    return " ".join(line for line in lines if line)
+
+
+def make_word(word: dict) -> dict:
+    return {"word": word["word"].strip(), "start": round(float(word["start"]), 3), "end": round(float(word["end"]), 3)}
+
+
+def make_segment(start: float, end: float, text: str, words: Optional[Iterable[dict]] = None) -> dict:
+    segment = {"start": round(float(start), 3), "end": round(float(end), 3), "text": clean_text(text)}
+    if words is not None:
+        segment["words"] = [make_word(word) for word in words]
+    return segment
+
+
+def assign_words(segments: List[dict], words: Iterable[dict]) -> None:
+    """Attach top-level word timings (Groq/OpenAI verbose_json) to the segment each word starts in."""
+    for segment in segments:
+        segment["words"] = []
+    if not segments:
+        return
+    index = 0
+    for word in sorted((make_word(word) for word in words), key=lambda w: w["start"]):
+        while index + 1 < len(segments) and word["start"] >= segments[index + 1]["start"]:
+            index += 1
+        segments[index]["words"].append(word)
+
+
+def build_transcript(segments: List[dict], language: Optional[str] = None) -> dict:
+    """Transcript response: the joined text plus its non-empty timed segments.
+
+    Each segment also gets its character offsets (``text_start``/``text_end``)
+    in the joined text, matching how text input is split into sentences.
+    """
+    kept = []
+    position = 0
+    for segment in segments:
+        if not segment["text"]:
+            continue
+        if kept:
+            position += 1
+        segment["text_start"] = position
+        position += len(segment["text"])
+        segment["text_end"] = position
+        kept.append(segment)
+    return {
+        "text": " ".join(segment["text"] for segment in kept),
+        "language": language,
+        "segments": kept,
+    }
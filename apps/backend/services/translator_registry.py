@@ -0,0 +1,256 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import config
+from services.batching import MicroBatcher
+from services.executors import inference_pool
+from services.inference_client import InferenceClient, get_inference_client
+from services.inference_tuning import optimize_translator
+from services.metrics import PREFIX, counter, histogram, span
+
+logger = logging.getLogger(__name__)
+
+WARMUP_SENTENCE = "Hello, how are you?"
+
+model_loads = counter(f"{PREFIX}_model_loads_total", "Sockeye model loads by outcome.", ("model", "outcome"))
+batch_sizes = histogram(
+    f"{PREFIX}_translate_batch_size", "Inputs per Sockeye call.", buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+
+class LoadedModel:
+    """A deserialized Sockeye translator shared by every language pair that uses it."""
+
+    def __init__(self, model_path: str, translator, tokenizer_path: str, load_seconds: float, optimizations: Optional[List[str]] = None):
+        self.model_path = model_path
+        self.translator = translator
+        self.tokenizer_path = tokenizer_path
+        self.load_seconds = load_seconds
+        self.optimizations = optimizations or []
+        # Sockeye keeps per-call search state on the translator, so calls are serialized.
+        self._lock = threading.Lock()
+        # Concurrent requests for this model are merged into one Sockeye call
+        self.batcher = MicroBatcher(
+            f"sockeye:{model_path}",
+            self.translate,
+            max_batch_size=config.TRANSLATE_MAX_BATCH_SIZE,
+            max_wait_ms=config.TRANSLATE_MAX_WAIT_MS,
+            runner=inference_pool.run,
+            max_pending=config.TRANSLATE_MAX_PENDING,
+        )
+
+    def translate(self, model_inputs: List[str]) -> List[str]:
+        """Translate already tagged and tokenized inputs in a single Sockeye call."""
+        from signwriting_translation.bin import translate
+
+        batch_sizes.observe(len(model_inputs))
+        with self._lock, span("sockeye_translate"):
+            # Sockeye groups inputs into batches of translator.batch_size and pads
+            # short ones up to it; sizing it to this call decodes the whole
+            # micro-batch at once, and a single sentence only once
+            self.translator.batch_size = max(1, len(model_inputs))
+            return translate(self.translator, model_inputs)
+
+
+class TranslatorEntry:
+    """A loaded model bound to a spoken/signed language pair."""
+
+    def __init__(self, model: LoadedModel, spoken_language: str, signed_language: str):
+        self.model = model
+        self.spoken_language = spoken_language
+        self.signed_language = signed_language
+        self.warmed_up = False
+
+    def make_input(self, text: str) -> str:
+        """Tokenize text and prefix it with the language tags the model expects."""
+        from signwriting_translation.bin import tokenize_spoken_text
+
+        tokenized_text = tokenize_spoken_text(text)
+        return f"${self.spoken_language} ${self.signed_language} {tokenized_text}"
+
+    def translate(self, texts: List[str]) -> List[str]:
+        return self.model.translate([self.make_input(text) for text in texts])
+
+    async def translate_batched(self, texts: List[str]) -> List[str]:
+        """Translate texts through the model's micro-batcher, sharing calls with other requests."""
+        return list(await asyncio.gather(
+            *(self.model.batcher.submit(self.make_input(text)) for text in texts)
+        ))
+
+
+class RemoteModel:
+    def __init__(self, model_path: str):
+        self.model_path = model_path
+
+
+class RemoteTranslatorEntry:
+    """Stands in for a TranslatorEntry when the model lives in the inference server."""
+
+    def __init__(self, client: InferenceClient, model_path: str, spoken_language: str, signed_language: str):
+        self.client = client
+        self.model = RemoteModel(model_path)
+        self.spoken_language = spoken_language
+        self.signed_language = signed_language
+
+    async def translate_batched(self, texts: List[str]) -> List[str]:
+        with span("inference_server_translate"):
+            return await self.client.call(
+                "translate",
+                texts=texts,
+                model_path=self.model.model_path,
+                spoken_language=self.spoken_language,
+                signed_language=self.signed_language,
+            )
+
+
+class TranslatorRegistry:
+    """Process-wide registry of Sockeye translators.
+
+    Entries are keyed by (model_path, spoken_language, signed_language). Each
+    model path is deserialized at most once, and concurrent callers asking for
+    a model that is still loading wait for that load instead of starting another.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._models: Dict[str, LoadedModel] = {}
+        self._entries: Dict[Tuple[str, str, str], TranslatorEntry] = {}
+        self._errors: Dict[str, str] = {}
+        self.warm_up_error: Optional[str] = None
+
+    @staticmethod
+    def default_key() -> Tuple[str, str, str]:
+        return (
+            config.SIGNWRITING_MODEL_PATH,
+            config.SIGNWRITING_SPOKEN_LANGUAGE,
+            config.SIGNWRITING_SIGNED_LANGUAGE,
+        )
+
+    def get(
+        self,
+        model_path: Optional[str] = None,
+        spoken_language: Optional[str] = None,
+        signed_language: Optional[str] = None,
+    ) -> TranslatorEntry:
+        default_model, default_spoken, default_signed = self.default_key()
+        key = (
+            model_path or default_model,
+            spoken_language or default_spoken,
+            signed_language or default_signed,
+        )
+        entry = self._entries.get(key)
+        if entry is not None:
+            return entry
+
+        model = self._get_model(key[0])
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = TranslatorEntry(model, key[1], key[2])
+                self._entries[key] = entry
+        return entry
+
+    async def get_async(
+        self,
+        model_path: Optional[str] = None,
+        spoken_language: Optional[str] = None,
+        signed_language: Optional[str] = None,
+    ) -> TranslatorEntry:
+        """Like ``get``, but a model that still has to be loaded is loaded on the inference pool.
+
+        With INFERENCE_SERVER_ADDRESS set, returns an entry that forwards to the inference server.
+        """
+        client = get_inference_client()
+        if client is not None:
+            default_model, default_spoken, default_signed = self.default_key()
+            return RemoteTranslatorEntry(
+                client, model_path or default_model, spoken_language or default_spoken, signed_language or default_signed
+            )
+        if (model_path or config.SIGNWRITING_MODEL_PATH) in self._models:
+            return self.get(model_path, spoken_language, signed_language)
+        return await inference_pool.run(self.get, model_path, spoken_language, signed_language)
+
+    def _get_model(self, model_path: str) -> LoadedModel:
+        model = self._models.get(model_path)
+        if model is not None:
+            return model
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_path, threading.Lock())
+
+        with load_lock:
+            model = self._models.get(model_path)
+            if model is None:
+                model = self._load_model(model_path)
+                self._models[model_path] = model
+        return model
+
+    def _load_model(self, model_path: str) -> LoadedModel:
+        from signwriting_translation.bin import load_sockeye_translator
+
+        logger.info(f"Loading Sockeye translator from {model_path}")
+        started = time.perf_counter()
+        try:
+            with span("sockeye_load"):
+                translator, tokenizer_path = load_sockeye_translator(model_path)
+                translator, optimizations = optimize_translator(translator)
+        except Exception as exc:
+            self._errors[model_path] = str(exc)
+            model_loads.inc(model=model_path, outcome="error")
+            raise
+        load_seconds = time.perf_counter() - started
+        self._errors.pop(model_path, None)
+        model_loads.inc(model=model_path, outcome="success")
+        logger.info(
+            f"Loaded Sockeye translator from {model_path} in {load_seconds:.2f}s "
+            f"(optimizations: {', '.join(optimizations) or 'none'})"
+        )
+        return LoadedModel(model_path, translator, tokenizer_path, load_seconds, optimizations)
+
+    def warm_up(self) -> None:
+        """Load the default translator and run a dummy sentence through it.
+
+        The first Sockeye call pays for lazy torch initialization, so doing it
+        here keeps that cost out of the first real request. Failures are logged
+        and kept in ``warm_up_error`` (also in ``status()``) rather than
+        stopping the server, so /ready can report them.
+        """
+        self.warm_up_error = None
+        try:
+            entry = self.get()
+            entry.translate([WARMUP_SENTENCE])
+            entry.warmed_up = True
+        except Exception as exc:
+            self.warm_up_error = f"{type(exc).__name__}: {exc}"
+            logger.exception("SignWriting translator warm-up failed")
+
+    def is_ready(self) -> bool:
+        entry = self._entries.get(self.default_key())
+        return entry is not None and entry.warmed_up
+
+    def status(self) -> dict:
+        return {
+            "ready": self.is_ready(),
+            "models": {
+                path: {
+                    "load_seconds": round(model.load_seconds, 3),
+                    "optimizations": model.optimizations,
+                    "queue_depth": model.batcher.queue_depth(),
+                }
+                for path, model in self._models.items()
+            },
+            "language_pairs": [
+                {"model_path": key[0], "spoken_language": key[1], "signed_language": key[2], "warmed_up": entry.warmed_up}
+                for key, entry in self._entries.items()
+            ],
+            "errors": dict(self._errors),
+            "warm_up_error": self.warm_up_error,
+        }
+
+
+# Shared by every request handler in this process
+translator_registry = TranslatorRegistry()
@@ -0,0 +1,98 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from services.audio import SAMPLE_RATE
+
+
+class SpeechSegmenter:
+    """Energy-based voice activity segmentation for a rolling audio stream.
+
+    Samples are examined in ``frame_ms`` frames. A frame whose RMS exceeds
+    ``threshold`` is speech; a segment starts at the first speech frame (plus
+    ``pre_roll_ms`` of lead-in) and is closed after ``min_silence_ms`` of
+    silence or once it reaches ``max_segment_s``. Closed segments are returned
+    as ``(start_seconds, samples)`` pairs.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        min_silence_ms: int,
+        max_segment_s: float,
+        pre_roll_ms: int = 200,
+        frame_ms: int = 30,
+        sample_rate: int = SAMPLE_RATE,
+    ):
+        self.threshold = threshold
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.silence_frames = max(1, min_silence_ms // frame_ms)
+        self.max_segment_samples = int(max_segment_s * sample_rate)
+        self.pre_roll_frames = pre_roll_ms // frame_ms
+        self.sample_rate = sample_rate
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._pre_roll: List[np.ndarray] = []
+        self._frames: List[np.ndarray] = []
+        self._silent_run = 0
+        self._consumed = 0
+        self.segment_start = 0.0
+
+    @property
+    def in_speech(self) -> bool:
+        return bool(self._frames)
+
+    @property
+    def current(self) -> np.ndarray:
+        """Audio of the segment that is still open (empty when there is none)."""
+        if not self._frames:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(self._frames)
+
+    def feed(self, samples: np.ndarray) -> List[Tuple[float, np.ndarray]]:
+        """Add samples and return any segments that were closed by them."""
+        completed = []
+        audio = np.concatenate([self._pending, samples]) if len(self._pending) else samples
+        usable = len(audio) - len(audio) % self.frame_size
+        self._pending = audio[usable:]
+        for offset in range(0, usable, self.frame_size):
+            frame = audio[offset:offset + self.frame_size]
+            segment = self._process_frame(frame)
+            if segment is not None:
+                completed.append(segment)
+        return completed
+
+    def flush(self) -> Optional[Tuple[float, np.ndarray]]:
+        """Close the open segment, if any, at the end of the stream."""
+        if len(self._pending) and self._frames:
+            self._frames.append(self._pending)
+        self._pending = np.zeros(0, dtype=np.float32)
+        return self._close()
+
+    def _process_frame(self, frame: np.ndarray) -> Optional[Tuple[float, np.ndarray]]:
+        is_speech = float(np.sqrt(np.mean(frame ** 2))) >= self.threshold
+        self._consumed += len(frame)
+
+        if not self._frames:
+            if is_speech:
+                self.segment_start = (self._consumed - len(frame) - len(self._pre_roll) * self.frame_size) / self.sample_rate
+                self._frames = self._pre_roll + [frame]
+                self._pre_roll = []
+                self._silent_run = 0
+            elif self.pre_roll_frames:
+                self._pre_roll = (self._pre_roll + [frame])[-self.pre_roll_frames:]
+            return None
+
+        self._frames.append(frame)
+        self._silent_run = 0 if is_speech else self._silent_run + 1
+        if self._silent_run >= self.silence_frames or len(self._frames) * self.frame_size >= self.max_segment_samples:
+            return self._close()
+        return None
+
+    def _close(self) -> Optional[Tuple[float, np.ndarray]]:
+        if not self._frames:
+            return None
+        # Drop the trailing silence that closed the segment
+        frames = self._frames[:len(self._frames) - self._silent_run] or self._frames
+        self._frames = []
+        self._silent_run = 0
+        return self.segment_start, np.concatenate(frames)
@@ -0,0 +1,154 @@
+import importlib.util
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from config import config
+from services.audio import ensure_ffmpeg_on_path
+from services.executors import BoundedPool, pools
+from services.inference_client import get_inference_client
+from services.metrics import span
+from services.transcript import build_transcript, clean_text, make_segment
+
+logger = logging.getLogger(__name__)
+
+# Set once per worker process by _init_worker
+_model = None
+
+
+def _init_worker(model_name: str, device: str, torch_threads: int) -> None:
+    """Load the Whisper model once when a worker process starts."""
+    global _model
+    import torch
+    import whisper
+
+    if torch_threads > 0:
+        torch.set_num_threads(torch_threads)
+        try:
+            torch.set_num_interop_threads(1)
+        except RuntimeError:
+            pass
+    ensure_ffmpeg_on_path()
+    _model = whisper.load_model(model_name, device=device)
+
+
+def _ping() -> bool:
+    return _model is not None
+
+
+def transcribe_audio(audio, initial_prompt: Optional[str] = None) -> str:
+    """Transcribe a file path or 16 kHz float32 samples with this worker's model.
+
+    Runs in the worker process. ``initial_prompt`` carries the previous
+    segment's text when transcribing a stream piece by piece.
+    """
+    result = _model.transcribe(audio, initial_prompt=initial_prompt)
+    return clean_text(result["text"].strip())
+
+
+def transcribe_audio_segments(audio, word_timestamps: bool = False, initial_prompt: Optional[str] = None) -> dict:
+    """Like ``transcribe_audio`` but keeps Whisper's timed segments (and word timings if asked).
+
+    Runs in the worker process; returns a ``services.transcript.build_transcript`` dict.
+    """
+    result = _model.transcribe(audio, initial_prompt=initial_prompt, word_timestamps=word_timestamps)
+    segments = [
+        make_segment(s["start"], s["end"], s["text"], s.get("words", []) if word_timestamps else None)
+        for s in result["segments"]
+    ]
+    return build_transcript(segments, result.get("language"))
+
+
+_pool: Optional[BoundedPool] = None
+_pool_lock = threading.Lock()
+
+
+def whisper_available() -> bool:
+    # With an inference server, it decides (and reports) whether Whisper is installed
+    return get_inference_client() is not None or importlib.util.find_spec("whisper") is not None
+
+
+def get_whisper_pool() -> BoundedPool:
+    """Return the process pool that owns the local Whisper models, starting it on first use.
+
+    Workers are spawned (not forked) so each gets a clean torch runtime with
+    its own thread settings. Raises ImportError when openai-whisper is not
+    installed.
+    """
+    global _pool
+    if not whisper_available():
+        raise ImportError("openai-whisper is not installed")
+    with _pool_lock:
+        if _pool is None:
+            workers = max(1, config.WHISPER_WORKERS)
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(config.WHISPER_MODEL, config.WHISPER_DEVICE, config.WHISPER_TORCH_THREADS),
+            )
+            _pool = BoundedPool("whisper", executor, workers, config.WHISPER_MAX_PENDING)
+            pools[_pool.name] = _pool
+        return _pool
+
+
+def max_parallel() -> int:
+    """How many transcriptions can run at once (one per worker)."""
+    if get_inference_client() is not None:
+        # The server's pool is sized from the same setting
+        return max(1, config.WHISPER_WORKERS)
+    return get_whisper_pool().max_workers
+
+
+def reset_whisper_pool() -> None:
+    """Drop a pool whose worker died so the next request starts a fresh one."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            pools.pop(_pool.name, None)
+            _pool = None
+
+
+async def transcribe(audio, initial_prompt: Optional[str] = None) -> str:
+    """Transcribe a file path or 16 kHz float32 samples on the Whisper pool."""
+    client = get_inference_client()
+    try:
+        with span("whisper_transcribe"):
+            if client is not None:
+                return await client.call("transcribe", audio=audio, initial_prompt=initial_prompt)
+            return await get_whisper_pool().run(transcribe_audio, audio, initial_prompt)
+    except BrokenProcessPool:
+        reset_whisper_pool()
+        raise
+
+
+async def transcribe_segments(audio, word_timestamps: bool = False, initial_prompt: Optional[str] = None) -> dict:
+    """Transcribe on the Whisper pool, returning timed segments."""
+    client = get_inference_client()
+    try:
+        with span("whisper_transcribe"):
+            if client is not None:
+                return await client.call(
+                    "transcribe_segments", audio=audio, word_timestamps=word_timestamps, initial_prompt=initial_prompt
+                )
+            return await get_whisper_pool().run(transcribe_audio_segments, audio, word_timestamps, initial_prompt)
+    except BrokenProcessPool:
+        reset_whisper_pool()
+        raise
+
+
+async def warm_up() -> None:
+    """Start every worker and load its model before the first request arrives."""
+    if get_inference_client() is not None:
+        return
+    pool = get_whisper_pool()
+    try:
+        for _ in range(pool.max_workers):
+            await pool.run(_ping)
+    except BrokenProcessPool:
+        logger.exception("Whisper worker failed to start")
+        reset_whisper_pool()
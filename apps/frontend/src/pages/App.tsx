@@ -11,6 +11,18 @@ import ErrorDisplay from "../components/ErrorDisplay";
 import TranscriptionDisplay from "../components/TranscriptionDisplay";
 import SimplifyChoiceModal from "../components/SimplifyChoiceModal";
 
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost) and newer browsers
+function newRequestId(): string {
+  if (typeof crypto !== "undefined" && typeof crypto.randomUUID === "function") {
+    return crypto.randomUUID();
+  }
+  if (typeof crypto !== "undefined" && typeof crypto.getRandomValues === "function") {
+    const bytes = crypto.getRandomValues(new Uint8Array(16));
+    return Array.from(bytes, (byte) => byte.toString(16).padStart(2, "0")).join("");
+  }
+  return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
 function App() {
   const [inputText, setInputText] = useState("");
   const [transcription, setTranscription] = useState("");
@@ -29,6 +41,7 @@ function App() {
   const [showSimplifyModal, setShowSimplifyModal] = useState(false);
   const [simplifiedText, setSimplifiedText] = useState("");
   const [pendingOriginalText, setPendingOriginalText] = useState("");
+  const [pendingRequestId, setPendingRequestId] = useState<string | undefined>();
 
   const { theme, toggleTheme } = useTheme();
   const translationTimeout = useRef<NodeJS.Timeout | null>(null);
@@ -53,7 +66,7 @@ function App() {
     }
   }, [inputText]);
 
-  const triggerTranslation = async (text: string) => {
+  const triggerTranslation = async (text: string, requestId?: string) => {
     setIsTranslating(true);
     setIsGeneratingSigns(true);
     setIsGeneratingAnimation(true);
@@ -64,14 +77,15 @@ function App() {
 
     try {
       let textToTranslate = text;
-      if (simplifyText) {
-        const simplifyResponse = await ApiService.simplifyText(text);
+      if (simplifyText && !requestId) {
+        requestId = newRequestId();
+        const simplifyResponse = await ApiService.simplifyText(text, requestId, "en", "ase");
         textToTranslate = simplifyResponse.simplified_text || text;
       }
 
       // 1. Translate to SignWriting
       const translateResponse =
-        await ApiService.translateSignWriting(textToTranslate);
+        await ApiService.translateSignWriting(textToTranslate, requestId);
       const rawFsw = translateResponse.signwriting || "";
       const fswTokens = rawFsw
         .trim()
@@ -83,25 +97,13 @@ function App() {
       // 2. Generate pose file for animation
       if (fswTokens.length > 0) {
         try {
-          const poseResponse = await ApiService.generatePose(
+          const poseBlob = await ApiService.generatePoseBinary(
             textToTranslate,
             "en",
             "ase",
+            requestId,
           );
-          const { pose_data, data_format } = poseResponse;
-          if (data_format === "binary_base64" && pose_data) {
-            const binary = atob(pose_data);
-            const bytes = new Uint8Array(binary.length);
-            for (let i = 0; i < binary.length; i++) {
-              bytes[i] = binary.charCodeAt(i);
-            }
-            const blob = new Blob([bytes], {
-              type: "application/octet-stream",
-            });
-            setPoseFile(blob);
-          } else {
-            setPoseFile(null);
-          }
+          setPoseFile(poseBlob.size > 0 ? poseBlob : null);
         } catch {
           setPoseFile(null);
         }
@@ -147,9 +149,13 @@ function App() {
     setError(null);
     setIsTranslating(true);
     try {
-      const response = await ApiService.simplifyText(inputText);
+      // The backend translates the original text while it simplifies, so
+      // choosing "original" in the modal reuses that work
+      const requestId = newRequestId();
+      const response = await ApiService.simplifyText(inputText, requestId, "en", "ase");
       setSimplifiedText(response.simplified_text || inputText);
       setPendingOriginalText(inputText);
+      setPendingRequestId(requestId);
       setShowSimplifyModal(true);
     } catch {
       setError("Failed to simplify text.");
@@ -162,9 +168,9 @@ function App() {
     setShowSimplifyModal(false);
     if (choice === "simplified") {
       setInputText(simplifiedText);
-      setTimeout(() => triggerTranslation(simplifiedText), 0);
+      setTimeout(() => triggerTranslation(simplifiedText, pendingRequestId), 0);
     } else {
-      setTimeout(() => triggerTranslation(pendingOriginalText), 0);
+      setTimeout(() => triggerTranslation(pendingOriginalText, pendingRequestId), 0);
     }
   };
 
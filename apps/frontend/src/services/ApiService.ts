@@ -32,18 +32,21 @@ const ApiService = {
     return response.data;
   },
 
-  async simplifyText(text: string): Promise<SimplifyTextResponse> {
+  // With a requestId the backend starts translating/posing the original text
+  // while simplifying; pass the same id (and, for the pose, the same
+  // languages) to the follow-up calls to reuse it
+  async simplifyText(text: string, request_id?: string, spoken_language?: string, signed_language?: string): Promise<SimplifyTextResponse> {
     const response = await axios.post<SimplifyTextResponse>(
       API_ENDPOINTS.SIMPLIFY_TEXT,
-      { text }
+      { text, request_id, spoken_language, signed_language }
     );
     return response.data;
   },
 
-  async translateSignWriting(text: string): Promise<TranslateSignWritingResponse> {
+  async translateSignWriting(text: string, request_id?: string): Promise<TranslateSignWritingResponse> {
     const response = await axios.post<TranslateSignWritingResponse>(
       API_ENDPOINTS.TRANSLATE_SIGNWRITING,
-      { text }
+      { text, request_id }
     );
     return response.data;
   },
@@ -56,6 +59,16 @@ const ApiService = {
     );
     return response.data;
   },
+
+  // Binary pose file, streamed by the backend without the base64/JSON envelope
+  async generatePoseBinary(text: string, spoken_language = 'en', signed_language = 'ase', request_id?: string): Promise<Blob> {
+    const response = await axios.post<Blob>(
+      API_ENDPOINTS.GENERATE_POSE,
+      { text, spoken_language, signed_language, request_id },
+      { responseType: 'blob', headers: { Accept: 'application/pose' } }
+    );
+    return response.data;
+  },
 };
 
 export default ApiService; 
\ No newline at end of file
@@ -51,7 +51,7 @@ a = Analysis(
     ['run_backend.py'],
     pathex=[],
     binaries=[],
-    datas=[('main.py', '.'), ('api', 'api')],
+    datas=[('main.py', '.'), ('api', 'api'), ('services', 'services')],
     hiddenimports=[
         'fastapi', 'fastapi.middleware.cors', 'fastapi.middleware', 
         'fastapi.encoders', 'fastapi.dependencies', 'fastapi.security',
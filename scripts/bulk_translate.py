@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Bulk-translate a JSONL or CSV file of texts to SignWriting (FSW).
+
+Texts are sent in large batches to several worker processes, each with its
+own copy of the Sockeye model. Results are appended to a JSONL file as soon
+as each batch finishes, so an interrupted run can be restarted with the same
+command: records whose id is already in the output are skipped.
+
+Input formats:
+    JSONL: one object per line with a text field (and optionally an id field),
+           or one JSON string per line
+    CSV:   a header row with the text column (and optionally an id column)
+Records without an id are identified by their 1-based line/row number.
+
+Output lines: {"id": ..., "text": ..., "signwriting": ..., "segments": [...]}
+              or {"id": ..., "text": ..., "error": ...} for failed records
+
+Example (from the repository root, backend environment active):
+    python scripts/bulk_translate.py captions.jsonl captions.fsw.jsonl --workers 4 --batch-size 64
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import get_context
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+_entry = None
+
+
+def _init_worker(torch_threads):
+    """Load the translator once per worker process."""
+    global _entry
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ["SIGNWRITING_TORCH_THREADS"] = str(torch_threads)
+    from services.translator_registry import translator_registry
+
+    _entry = translator_registry.get()
+
+
+def _translate_batch(records):
+    """Translate [(id, text)] sentence by sentence in a single model call."""
+    from services.segmentation import split_sentences
+
+    sentences, spans = [], []
+    for _, text in records:
+        segments = split_sentences(text) or [(text, 0, len(text))]
+        spans.append((len(sentences), segments))
+        sentences.extend(segment[0] for segment in segments)
+    try:
+        outputs = _entry.translate(sentences) if sentences else []
+    except Exception as exc:
+        if len(records) == 1:
+            return [{"id": records[0][0], "text": records[0][1], "error": str(exc)}]
+        # Retry one by one so a single bad record does not fail its whole batch
+        return [result for record in records for result in _translate_batch([record])]
+
+    results = []
+    for (record_id, text), (offset, segments) in zip(records, spans):
+        segment_outputs = outputs[offset:offset + len(segments)]
+        results.append({
+            "id": record_id,
+            "text": text,
+            "signwriting": " ".join(output.strip() for output in segment_outputs if output.strip()),
+            "segments": [
+                {"text": segment_text, "start": start, "end": end, "signwriting": output}
+                for (segment_text, start, end), output in zip(segments, segment_outputs)
+            ],
+        })
+    return results
+
+
+def read_records(path, text_field, id_field):
+    """Yield (id, text) from a JSONL or CSV file."""
+    with open(path, newline="", encoding="utf-8") as handle:
+        if path.suffix.lower() == ".csv":
+            for row_number, row in enumerate(csv.DictReader(handle), start=1):
+                yield str(row.get(id_field) or row_number), row[text_field]
+            return
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if isinstance(record, str):
+                yield str(line_number), record
+            else:
+                yield str(record.get(id_field, line_number)), record[text_field]
+
+
+def completed_ids(output_path, include_errors):
+    """Ids already written by a previous run (a partially written last line is ignored)."""
+    done = set()
+    if output_path.exists():
+        with open(output_path, encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if include_errors or "error" not in record:
+                    done.add(str(record["id"]))
+    return done
+
+
+def ensure_trailing_newline(output_path):
+    """Terminate a line cut off by an interrupted run so appended results start on a new line."""
+    if output_path.exists() and output_path.stat().st_size:
+        with open(output_path, "rb+") as handle:
+            handle.seek(-1, os.SEEK_END)
+            if handle.read(1) != b"\n":
+                handle.write(b"\n")
+
+
+def batches(records, size):
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-translate a JSONL/CSV file of texts to SignWriting")
+    parser.add_argument("input", type=Path)
+    parser.add_argument("output", type=Path, help="JSONL file to append results to")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2))
+    parser.add_argument("--batch-size", type=int, default=64, help="texts per model call")
+    parser.add_argument("--torch-threads", type=int, default=0, help="per worker (default: cores / workers)")
+    parser.add_argument("--retry-errors", action="store_true", help="translate again records that failed before")
+    args = parser.parse_args()
+
+    torch_threads = args.torch_threads or max(1, (os.cpu_count() or 1) // args.workers)
+    done = completed_ids(args.output, include_errors=not args.retry_errors)
+    if done:
+        print(f"Resuming: skipping {len(done)} records already in {args.output}", file=sys.stderr)
+    pending = ((record_id, text) for record_id, text in read_records(args.input, args.text_field, args.id_field)
+               if record_id not in done)
+
+    ensure_trailing_newline(args.output)
+
+    started = time.perf_counter()
+    counts = {"translated": 0, "failed": 0}
+
+    def write(out, future):
+        for result in future.result():
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+            counts["failed" if "error" in result else "translated"] += 1
+        # Flushed per batch so an interrupted run loses at most the batches in flight
+        out.flush()
+        rate = counts["translated"] / (time.perf_counter() - started)
+        print(f"\r{counts['translated']} translated, {counts['failed']} failed, {rate:.1f} texts/s",
+              end="", file=sys.stderr)
+
+    with open(args.output, "a", encoding="utf-8") as out, ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(torch_threads,),
+    ) as pool:
+        in_flight = set()
+        for batch in batches(pending, args.batch_size):
+            in_flight.add(pool.submit(_translate_batch, batch))
+            # Keep every worker busy without reading the whole input into memory
+            if len(in_flight) >= args.workers * 2:
+                finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    write(out, future)
+        for future in in_flight:
+            write(out, future)
+
+    elapsed = time.perf_counter() - started
+    print(f"\nDone: {counts['translated']} translated, {counts['failed']} failed in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
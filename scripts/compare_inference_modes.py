@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Compare SignWriting translation speed and output across CPU inference modes.
+
+Loads the Sockeye model once, then for each mode (fp32 baseline, int8,
+torch.compile, ...) translates a fixed sentence set and reports latency,
+throughput and how closely the output matches the fp32 baseline.
+
+Run from the repository root with the backend environment active:
+    python scripts/compare_inference_modes.py --modes fp32 int8 --threads 4
+"""
+
+import argparse
+import copy
+import difflib
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+SENTENCES = [
+    "Hello, how are you?",
+    "My name is Sam.",
+    "Where is the bathroom?",
+    "Thank you very much.",
+    "I am learning sign language.",
+    "The meeting starts at nine in the morning.",
+    "Please turn off your phone.",
+    "What time is it?",
+    "We will take a short break now.",
+    "Can you repeat that, please?",
+    "The weather is nice today.",
+    "I need to go to the doctor tomorrow.",
+]
+
+SYMBOL_RE = re.compile(r"S[123][0-9a-f]{2}[0-5][0-9a-f]")
+
+
+def similarity(output: str, reference: str) -> float:
+    """Similarity of the SignWriting symbol sequences (ignores symbol positions)."""
+    return difflib.SequenceMatcher(None, SYMBOL_RE.findall(output), SYMBOL_RE.findall(reference)).ratio()
+
+
+def benchmark(entry, sentences, repeats):
+    # One untimed pass so lazy initialization (and torch.compile) is not measured
+    entry.translate(sentences[:1])
+    latencies = []
+    for _ in range(repeats):
+        for sentence in sentences:
+            started = time.perf_counter()
+            entry.translate([sentence])
+            latencies.append((time.perf_counter() - started) * 1000)
+    started = time.perf_counter()
+    outputs = entry.translate(sentences)
+    batch_seconds = time.perf_counter() - started
+    latencies.sort()
+    return outputs, {
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 1),
+        "batch_sentences_per_s": round(len(sentences) / batch_seconds, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modes", nargs="+", default=["fp32", "int8", "compile"])
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = default)")
+    parser.add_argument("--beam-size", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--sentences", type=Path, help="text file with one sentence per line")
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    args = parser.parse_args()
+
+    os.environ["SIGNWRITING_TORCH_THREADS"] = str(args.threads)
+    os.environ["SIGNWRITING_BEAM_SIZE"] = str(args.beam_size)
+
+    from signwriting_translation.bin import load_sockeye_translator
+    from config import config
+    from services.inference_tuning import optimize_translator
+    from services.translator_registry import LoadedModel, TranslatorEntry
+
+    sentences = SENTENCES
+    if args.sentences:
+        sentences = [line.strip() for line in args.sentences.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+    print(f"Loading {config.SIGNWRITING_MODEL_PATH}...")
+    base_translator, tokenizer_path = load_sockeye_translator(config.SIGNWRITING_MODEL_PATH)
+
+    results = {}
+    baseline = None
+    modes = ["fp32"] + [mode for mode in args.modes if mode != "fp32"]
+    for mode in modes:
+        translator, applied = optimize_translator(copy.deepcopy(base_translator), mode)
+        model = LoadedModel(config.SIGNWRITING_MODEL_PATH, translator, tokenizer_path, 0.0, applied)
+        entry = TranslatorEntry(model, config.SIGNWRITING_SPOKEN_LANGUAGE, config.SIGNWRITING_SIGNED_LANGUAGE)
+        outputs, timings = benchmark(entry, sentences, args.repeats)
+        if baseline is None:
+            baseline = outputs
+        result = dict(timings)
+        result["applied"] = applied
+        result["exact_match"] = round(sum(o == b for o, b in zip(outputs, baseline)) / len(sentences), 3)
+        result["symbol_similarity"] = round(statistics.mean(similarity(o, b) for o, b in zip(outputs, baseline)), 3)
+        results[mode] = result
+        print(f"{mode:>14}: {result}")
+
+    fp32 = results["fp32"]
+    print("\nSpeed-up over fp32 (p50 latency):")
+    for mode, result in results.items():
+        print(f"  {mode:>14}: x{fp32['p50_ms'] / result['p50_ms']:.2f}  (exact match {result['exact_match']:.0%})")
+
+    if args.json:
+        args.json.write_text(json.dumps({"sentences": len(sentences), "results": results}, indent=2))
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import asyncio
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.batching import MicroBatcher  # noqa: E402
+from services.executors import PoolSaturated  # noqa: E402
+
+def test_concurrent_submissions_share_a_batch():
+    batches = []
+
+    def process(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def run():
+        batcher = MicroBatcher("test", process, max_batch_size=4, max_wait_ms=20)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(6)))
+
+    results = asyncio.run(run())
+    print("Batches:", batches)
+    assert results == [0, 2, 4, 6, 8, 10], "Each caller gets the result at its own position"
+    assert [len(batch) for batch in batches] == [4, 2], "Batches are capped at max_batch_size"
+
+def test_batch_errors_reach_every_caller():
+    def process(items):
+        raise ValueError("model failed")
+
+    def short(items):
+        return items[:-1]
+
+    async def run():
+        for fn in (process, short):
+            batcher = MicroBatcher("test", fn, max_batch_size=4, max_wait_ms=5)
+            results = await asyncio.gather(batcher.submit(1), batcher.submit(2), return_exceptions=True)
+            print(fn.__name__, results)
+            assert all(isinstance(result, Exception) for result in results)
+
+    asyncio.run(run())
+
+def test_max_pending():
+    async def run():
+        batcher = MicroBatcher("test", lambda items: items, max_batch_size=1, max_wait_ms=0, max_pending=1)
+        batcher._ensure_worker()
+        batcher._queue.put_nowait((0, asyncio.get_running_loop().create_future()))
+        try:
+            await batcher.submit(1)
+            raise AssertionError("Expected PoolSaturated once max_pending items are waiting")
+        except PoolSaturated as exc:
+            assert exc.status_code == 503
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    test_concurrent_submissions_share_a_batch()
+    test_batch_errors_reach_every_caller()
+    test_max_pending()
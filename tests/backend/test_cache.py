@@ -0,0 +1,77 @@
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.cache import ResponseCache, make_key, normalize_text  # noqa: E402
+
+def test_keys():
+    assert normalize_text("  Hello   world ") == "Hello world"
+    assert make_key("a", 1) == make_key("a", 1)
+    assert make_key("a", 1) != make_key("a", "1")
+
+def test_memory_lru_and_ttl():
+    cache = ResponseCache("test", max_entries=2, max_bytes=10)
+    cache.set("a", "1")
+    cache.set("b", b"2")
+    assert cache.get("a") == "1", "str values round-trip"
+    cache.set("c", "3")
+    assert cache.get("b") is None, "The least recently used entry is evicted"
+    assert cache.get("c") == "3" and cache.get("a") == "1"
+    cache.set("big", "x" * 11)
+    assert cache.get("big") is None, "Values larger than max_bytes are not kept"
+
+    expiring = ResponseCache("test", max_entries=2, max_bytes=10, ttl_seconds=0.05)
+    expiring.set("a", "1")
+    time.sleep(0.06)
+    assert expiring.get("a") is None, "Expired entries are not served"
+    print("Stats:", cache.stats())
+    assert cache.stats()["evictions"] == 1
+
+def test_disk_tier():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "test.sqlite3"
+        ResponseCache("test", max_entries=2, max_bytes=100, disk_path=path).set("a", b"pose")
+
+        # A new cache (as after a restart) serves the entry from disk, then from memory
+        cache = ResponseCache("test", max_entries=2, max_bytes=100, disk_path=path)
+        assert cache.get("a") == b"pose"
+        assert cache.get("a") == b"pose"
+        stats = cache.stats()
+        print("Stats:", stats)
+        assert stats["disk_hits"] == 1 and stats["hits"] == 1
+
+def test_async_disk_tier_off_event_loop():
+    async def run(cache: ResponseCache) -> None:
+        loop_thread = threading.get_ident()
+        disk_threads = []
+        disk_get = cache._disk.get
+
+        def spy(key):
+            disk_threads.append(threading.get_ident())
+            return disk_get(key)
+
+        cache._disk.get = spy
+        await cache.aset("a", "text")
+        assert await cache.aget("a") == "text", "Memory hits are served inline"
+        assert not disk_threads
+
+        cache._entries.clear()
+        cache._bytes = 0
+        assert await cache.aget("a") == "text"
+        assert await cache.aget("missing") is None
+        assert disk_threads and loop_thread not in disk_threads, "Disk lookups run in a worker thread"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(ResponseCache("test", max_entries=2, max_bytes=100, disk_path=Path(tmp) / "test.sqlite3")))
+
+if __name__ == "__main__":
+    test_keys()
+    test_memory_lru_and_ttl()
+    test_disk_tier()
+    test_async_disk_tier_off_event_loop()
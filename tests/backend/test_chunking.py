@@ -0,0 +1,144 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from api import transcribe  # noqa: E402
+from config import config  # noqa: E402
+from services.audio import SAMPLE_RATE, decode_wav_bytes, encode_wav, probe_duration  # noqa: E402
+from services.chunking import plan_chunks, stitch_segments, transcribe_chunked  # noqa: E402
+from services.transcript import build_transcript, make_segment  # noqa: E402
+
+def _speech_with_pauses(seconds, pauses):
+    """A tone with silent gaps at the given (start, end) seconds."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    samples = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    for start, end in pauses:
+        samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)] = 0
+    return samples
+
+def test_cuts_move_into_pauses():
+    samples = _speech_with_pauses(25, [(11.0, 11.4), (19.6, 20.0)])
+    chunks = plan_chunks(samples, chunk_seconds=10, overlap_seconds=1, search_seconds=2)
+    print("Chunks:", [(start / SAMPLE_RATE, boundary / SAMPLE_RATE, end / SAMPLE_RATE) for start, boundary, end in chunks])
+    assert len(chunks) == 3
+    assert chunks[0][:2] == (0, 0) and chunks[-1][2] == len(samples)
+    for (_, _, end), (start, boundary, _) in zip(chunks, chunks[1:]):
+        assert end == boundary, "Chunks own consecutive stretches of audio"
+        assert boundary - start == SAMPLE_RATE, "Each chunk reaches back overlap_seconds for context"
+    assert 11.0 <= chunks[1][1] / SAMPLE_RATE <= 11.4, "The cut lands in the pause"
+    assert 19.6 <= chunks[2][1] / SAMPLE_RATE <= 20.0
+
+def test_short_audio_is_one_chunk():
+    samples = _speech_with_pauses(11, [])
+    assert plan_chunks(samples, chunk_seconds=10, overlap_seconds=1, search_seconds=2) == [(0, 0, len(samples))]
+
+def test_stitching_drops_the_overlap():
+    first = [make_segment(0.0, 4.0, "The quick brown fox"), make_segment(4.0, 9.8, "jumps over the lazy dog.")]
+    second = [
+        # Mostly before the cut at 10s: already covered by the first chunk
+        make_segment(9.0, 10.2, "lazy dog."),
+        # Starts just after the cut but repeats the last words of the first chunk
+        make_segment(10.1, 13.0, "the lazy dog. Then it ran off."),
+        make_segment(13.0, 15.0, "The end."),
+    ]
+    merged = stitch_segments([first, second], [0.0, 10.0])
+    print("Merged:", merged)
+    assert [segment["text"] for segment in merged] == [
+        "The quick brown fox", "jumps over the lazy dog.", "Then it ran off.", "The end.",
+    ]
+
+def test_stitching_trims_word_timings():
+    words = [{"word": w, "start": 10.1 + i * 0.3, "end": 10.3 + i * 0.3} for i, w in enumerate(["dog", "then", "it", "ran"])]
+    first = [make_segment(5.0, 9.9, "jumps over the lazy dog")]
+    second = [make_segment(10.1, 11.3, "dog then it ran", words)]
+    merged = stitch_segments([first, second], [0.0, 10.0])
+    assert merged[1]["text"] == "then it ran"
+    assert [word["word"] for word in merged[1]["words"]] == ["then", "it", "ran"]
+
+def test_transcribe_chunked_shifts_and_stitches():
+    samples = _speech_with_pauses(25, [(11.0, 11.4), (19.6, 20.0)])
+    active = []
+    peak = []
+
+    async def transcribe_chunk(chunk):
+        active.append(1)
+        peak.append(len(active))
+        await asyncio.sleep(0.01)
+        active.pop()
+        seconds = len(chunk) / SAMPLE_RATE
+        # Chunk-relative times; every chunk but the first opens with the overlap
+        segments = [make_segment(0.8, seconds, f"{seconds:.1f} seconds")]
+        if not np.array_equal(chunk, samples[:len(chunk)]):
+            segments.insert(0, make_segment(0.0, 0.8, "overlap"))
+        return build_transcript(segments, "en")
+
+    transcript = asyncio.run(transcribe_chunked(samples, transcribe_chunk, 10, 1, 2, max_parallel=2))
+    print("Transcript:", transcript)
+    segments = transcript["segments"]
+    assert max(peak) <= 2, "At most max_parallel chunks run at once"
+    assert transcript["language"] == "en"
+    assert "overlap" not in transcript["text"], "Segments inside the overlap come from the previous chunk"
+    assert [segment["start"] for segment in segments] == sorted(segment["start"] for segment in segments)
+    assert segments[-1]["end"] == 25.0, "Times are moved onto the global timeline"
+    assert transcript["text"][segments[1]["text_start"]:segments[1]["text_end"]] == segments[1]["text"]
+
+def test_probe_duration_reads_wav_headers():
+    wav = encode_wav(np.zeros(SAMPLE_RATE * 3, dtype=np.float32))
+    assert probe_duration(wav) == 3.0
+    assert probe_duration(encode_wav(np.zeros(48000 * 2, dtype=np.float32), sample_rate=48000)) == 2.0
+
+def test_groq_chunking_skips_short_uploads_without_decoding():
+    decoded = []
+    sent = []
+
+    def fake_decode(contents, suffix=".wav", sample_rate=SAMPLE_RATE):
+        decoded.append(len(contents))
+        return decode_wav_bytes(contents, sample_rate)
+
+    async def fake_groq_segments(content, filename, word_timestamps):
+        sent.append(filename)
+        seconds = len(decode_wav_bytes(content)) / SAMPLE_RATE
+        return build_transcript([make_segment(0.5, seconds, f"chunk {len(sent)}")], "en")
+
+    originals = (
+        transcribe.decode_audio_bytes, transcribe._transcribe_via_groq_segments, config.LONG_AUDIO_MIN_BYTES,
+        config.LONG_AUDIO_THRESHOLD_SECONDS, config.LONG_AUDIO_CHUNK_SECONDS,
+        config.LONG_AUDIO_OVERLAP_SECONDS, config.LONG_AUDIO_SEARCH_SECONDS,
+    )
+    transcribe.decode_audio_bytes = fake_decode
+    transcribe._transcribe_via_groq_segments = fake_groq_segments
+    config.LONG_AUDIO_MIN_BYTES = 0
+    config.LONG_AUDIO_THRESHOLD_SECONDS = 12
+    config.LONG_AUDIO_CHUNK_SECONDS, config.LONG_AUDIO_OVERLAP_SECONDS, config.LONG_AUDIO_SEARCH_SECONDS = 10, 1, 2
+    try:
+        short = encode_wav(_speech_with_pauses(8, []))
+        assert asyncio.run(transcribe._transcribe_via_groq_long(short, "short.wav", "segment")) is None
+        assert decoded == [], "Uploads probed as short are sent whole without decoding"
+
+        long = encode_wav(_speech_with_pauses(25, [(11.0, 11.4), (19.6, 20.0)]))
+        transcript = asyncio.run(transcribe._transcribe_via_groq_long(long, "long.wav", "segment"))
+    finally:
+        (
+            transcribe.decode_audio_bytes, transcribe._transcribe_via_groq_segments, config.LONG_AUDIO_MIN_BYTES,
+            config.LONG_AUDIO_THRESHOLD_SECONDS, config.LONG_AUDIO_CHUNK_SECONDS,
+            config.LONG_AUDIO_OVERLAP_SECONDS, config.LONG_AUDIO_SEARCH_SECONDS,
+        ) = originals
+
+    print("Transcript:", transcript)
+    assert decoded == [len(long)]
+    assert sent == ["chunk.wav"] * 3, "Each chunk is re-encoded as WAV"
+    assert [segment["text"] for segment in transcript["segments"]] == ["chunk 1", "chunk 2", "chunk 3"]
+
+if __name__ == "__main__":
+    test_cuts_move_into_pauses()
+    test_short_audio_is_one_chunk()
+    test_stitching_drops_the_overlap()
+    test_stitching_trims_word_timings()
+    test_transcribe_chunked_shifts_and_stitches()
+    test_probe_duration_reads_wav_headers()
+    test_groq_chunking_skips_short_uploads_without_decoding()
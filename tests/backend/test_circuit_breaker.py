@@ -0,0 +1,114 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from config import config  # noqa: E402
+from services import http_client  # noqa: E402
+from services.http_client import CircuitBreaker, CircuitOpen, Upstream  # noqa: E402
+
+URL = "http://upstream.test/pose"
+
+def _upstream(handler, failure_threshold: int = 2, reset_seconds: float = 0.05) -> Upstream:
+    """An upstream whose shared client answers every request with ``handler``."""
+    config.HTTP_RETRY_BACKOFF_MS = 0
+    http_client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    http_client._client_loop = asyncio.get_running_loop()
+    upstream = Upstream("test", timeout=1, max_concurrency=4, retries=1)
+    upstream.breaker = CircuitBreaker("test", failure_threshold, reset_seconds)
+    return upstream
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=0.05)
+    assert breaker.before_call() is False
+    breaker.record_failure()
+    assert breaker.state == "closed", "One failure is below the threshold"
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.times_opened == 1
+
+    try:
+        breaker.before_call()
+        raise AssertionError("Expected CircuitOpen while open")
+    except CircuitOpen as exc:
+        print("Open circuit:", exc.status_code, exc.headers)
+        assert exc.status_code == 503 and "Retry-After" in exc.headers
+
+    time.sleep(0.06)
+    assert breaker.before_call() is True, "Expected the half-open trial"
+    try:
+        breaker.before_call()
+        raise AssertionError("Only one trial may run at a time")
+    except CircuitOpen:
+        pass
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.failures == 0
+
+def test_half_open_trial_released_on_cancel():
+    async def run():
+        release = asyncio.Event()
+
+        async def handler(request):
+            if request.url.params.get("slow"):
+                await release.wait()
+            return httpx.Response(503)
+
+        upstream = _upstream(handler)
+        for _ in range(2):
+            try:
+                await upstream.request("GET", URL)
+            except httpx.HTTPStatusError:
+                pass
+        assert upstream.breaker.state == "open"
+
+        await asyncio.sleep(0.06)
+        trial = asyncio.create_task(upstream.request("GET", URL, params={"slow": "1"}))
+        await asyncio.sleep(0.01)
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        print("After a cancelled trial:", upstream.breaker.state, upstream.breaker._trial_in_flight)
+        assert not upstream.breaker._trial_in_flight, "A cancelled trial must not block later ones"
+
+        # The next call is let through as a new trial (it would raise CircuitOpen otherwise)
+        try:
+            await upstream.request("GET", URL)
+        except httpx.HTTPStatusError:
+            pass
+        assert upstream.breaker.state == "open", "The new trial failed and re-opened the circuit"
+
+    asyncio.run(run())
+
+def test_retries_and_local_errors():
+    async def run():
+        calls = []
+
+        def handler(request):
+            if request.url.host == "local.error":
+                raise httpx.UnsupportedProtocol("Request URL is missing a scheme", request=request)
+            calls.append(request.url)
+            return httpx.Response(200 if len(calls) > 1 else 503, content=b"ok")
+
+        upstream = _upstream(handler)
+        response = await upstream.request("GET", URL)
+        print("Retried:", upstream.retried, "calls:", len(calls))
+        assert response.status_code == 200 and len(calls) == 2 and upstream.retried == 1
+        assert upstream.breaker.failures == 0
+
+        try:
+            await upstream.request("GET", "http://local.error/")
+            raise AssertionError("Expected a local request error")
+        except httpx.UnsupportedProtocol:
+            pass
+        assert upstream.requests == 3, "Local errors are not retried"
+        assert upstream.breaker.failures == 0, "Local errors say nothing about the upstream"
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    test_circuit_breaker_states()
+    test_half_open_trial_released_on_cancel()
+    test_retries_and_local_errors()
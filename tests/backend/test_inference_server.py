@@ -0,0 +1,178 @@
+import asyncio
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from multiprocessing.connection import Listener
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi import HTTPException  # noqa: E402
+
+from config import config  # noqa: E402
+from services import inference_client, whisper_pool  # noqa: E402
+from services.inference_client import InferenceClient, InferenceServerUnavailable, check_address, get_inference_client  # noqa: E402
+from services.inference_server import InferenceServer  # noqa: E402
+
+class StubServer(InferenceServer):
+    """The real connection handling, with model calls answered by stubs."""
+
+    async def handle(self, method, kwargs):
+        if method == "transcribe":
+            await asyncio.sleep(kwargs.get("delay", 0))
+            return f"{len(kwargs['audio'])} samples, prompt={kwargs.get('initial_prompt')}"
+        if method == "fail":
+            raise RuntimeError("model crashed")
+        return await super().handle(method, kwargs)
+
+@contextmanager
+def _serve():
+    with tempfile.TemporaryDirectory() as tmp:
+        address = os.path.join(tmp, "inference.sock")
+        server = StubServer(address)
+        server.ready.set()
+        listener = Listener(address)
+        threading.Thread(target=server._accept, args=(listener,), daemon=True).start()
+        loop_thread = threading.Thread(target=server.loop.run_forever, daemon=True)
+        loop_thread.start()
+        try:
+            yield server, address
+        finally:
+            server._closing = True
+            listener.close()
+            server.loop.call_soon_threadsafe(server.loop.stop)
+            loop_thread.join(5)
+
+def test_round_trip_multiplexes_calls():
+    async def run(client):
+        audio = np.zeros(16000, dtype=np.float32)
+        # The slow call is sent first but must not hold up the others
+        slow = asyncio.create_task(client.call("transcribe", audio=audio, delay=0.2))
+        await asyncio.sleep(0.05)
+        started = time.perf_counter()
+        fast = await asyncio.gather(*(client.call("transcribe", audio=audio[:n], initial_prompt="hi") for n in (1, 2, 3)))
+        fast_seconds = time.perf_counter() - started
+        status = await client.call("status")
+        return await slow, fast, fast_seconds, status
+
+    with _serve() as (server, address):
+        client = InferenceClient(address, timeout=5)
+        slow, fast, fast_seconds, status = asyncio.run(run(client))
+        print("Replies:", slow, fast, "Status:", status, "Client:", client.stats())
+        assert slow == "16000 samples, prompt=None"
+        assert fast == [f"{n} samples, prompt=hi" for n in (1, 2, 3)]
+        assert fast_seconds < 0.15, "Replies come back as they finish, not in request order"
+        assert status["ready"] and status["connections"] == 1, "All calls share one connection"
+        assert client.stats()["calls"] == 5 and client.stats()["in_flight"] == 0
+
+def test_errors_come_back_as_http_exceptions():
+    async def run(client):
+        results = []
+        for method in ("fail", "no_such_method"):
+            try:
+                await client.call(method)
+            except HTTPException as exc:
+                results.append((exc.status_code, exc.detail))
+        return results
+
+    with _serve() as (server, address):
+        results = asyncio.run(run(InferenceClient(address, timeout=5)))
+    print("Errors:", results)
+    assert results == [(500, "RuntimeError: model crashed"), (400, "Unknown inference server method: no_such_method")]
+
+def test_unreachable_server_is_a_503():
+    async def run(client):
+        try:
+            await client.call("status")
+            raise AssertionError("Expected InferenceServerUnavailable")
+        except InferenceServerUnavailable as exc:
+            return exc
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = InferenceClient(os.path.join(tmp, "missing.sock"), timeout=5)
+        exc = asyncio.run(run(client))
+    print("Error:", exc.detail)
+    assert exc.status_code == 503 and "Retry-After" in exc.headers
+    assert client.stats()["failures"] == 1
+
+def test_whisper_calls_forward_only_when_an_address_is_set():
+    local_calls = []
+
+    class LocalPool:
+        async def run(self, fn, audio, initial_prompt):
+            local_calls.append(fn.__name__)
+            return "local"
+
+    originals = config.INFERENCE_SERVER_ADDRESS, inference_client._client, whisper_pool.get_whisper_pool
+    whisper_pool.get_whisper_pool = LocalPool
+    try:
+        config.INFERENCE_SERVER_ADDRESS = ""
+        inference_client._client = None
+        assert get_inference_client() is None
+        assert asyncio.run(whisper_pool.transcribe(np.zeros(4, dtype=np.float32))) == "local"
+        assert local_calls == ["transcribe_audio"], "Without an address models run in this process"
+
+        with _serve() as (server, address):
+            config.INFERENCE_SERVER_ADDRESS = address
+            assert get_inference_client() is get_inference_client(), "One client per process"
+            result = asyncio.run(whisper_pool.transcribe(np.zeros(4, dtype=np.float32), "prompt"))
+        assert result == "4 samples, prompt=prompt"
+        assert local_calls == ["transcribe_audio"], "With an address nothing runs locally"
+    finally:
+        config.INFERENCE_SERVER_ADDRESS, inference_client._client, whisper_pool.get_whisper_pool = originals
+
+def test_tcp_addresses_need_an_authkey_and_loopback():
+    originals = config.INFERENCE_SERVER_AUTHKEY, config.INFERENCE_SERVER_ALLOW_REMOTE
+    try:
+        config.INFERENCE_SERVER_AUTHKEY, config.INFERENCE_SERVER_ALLOW_REMOTE = "", False
+        check_address("/tmp/signcast-inference.sock")
+        for address in ("127.0.0.1:7000", "10.0.0.5:7000"):
+            try:
+                check_address(address)
+                raise AssertionError(f"Expected ValueError for {address}")
+            except ValueError as exc:
+                print("Rejected:", exc)
+        config.INFERENCE_SERVER_AUTHKEY = "secret"
+        check_address("127.0.0.1:7000")
+        config.INFERENCE_SERVER_ALLOW_REMOTE = True
+        check_address("10.0.0.5:7000")
+    finally:
+        config.INFERENCE_SERVER_AUTHKEY, config.INFERENCE_SERVER_ALLOW_REMOTE = originals
+
+def test_server_process_socket_is_owner_only():
+    with tempfile.TemporaryDirectory() as tmp:
+        address = os.path.join(tmp, "inference.sock")
+        env = dict(os.environ, SIGNWRITING_WARMUP="false", WHISPER_WARMUP="false", INFERENCE_SERVER_ADDRESS="")
+        process = subprocess.Popen(
+            [sys.executable, "-m", "services.inference_server", "--address", address],
+            cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = time.monotonic() + 30
+            while not os.path.exists(address):
+                assert process.poll() is None and time.monotonic() < deadline, "Inference server did not start"
+                time.sleep(0.05)
+            mode = stat.S_IMODE(os.stat(address).st_mode)
+            status = asyncio.run(InferenceClient(address, timeout=10).call("ready"))
+        finally:
+            process.terminate()
+            process.wait(10)
+    print("Socket mode:", oct(mode), "Status:", status)
+    assert mode & 0o077 == 0, "Other users cannot connect"
+    assert status["ready"] and status["warm_up_error"] is None
+
+if __name__ == "__main__":
+    test_round_trip_multiplexes_calls()
+    test_errors_come_back_as_http_exceptions()
+    test_unreachable_server_is_a_503()
+    test_whisper_calls_forward_only_when_an_address_is_set()
+    test_tcp_addresses_need_an_authkey_and_loopback()
+    test_server_process_socket_is_owner_only()
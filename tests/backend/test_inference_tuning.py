@@ -0,0 +1,70 @@
+import sys
+import types
+from contextlib import contextmanager
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services import inference_tuning  # noqa: E402
+
+class FakeModel:
+    def encode_and_initialize(self, inputs):
+        return "eager encode"
+
+    def decode_step(self, step_input):
+        return "eager decode"
+
+class FakeSearch:
+    """Holds its own model reference, as Sockeye's _SingleModelInference does."""
+
+    def __init__(self, model):
+        self._model = model
+
+    def __call__(self, inputs):
+        return self._model.encode_and_initialize(inputs), self._model.decode_step(inputs)
+
+class FakeTranslator:
+    def __init__(self):
+        self.models = [FakeModel()]
+        self._search = FakeSearch(self.models[0])
+
+@contextmanager
+def _torch(compile=None):
+    """Stand in for torch, whose compile is the only part compile_translator uses."""
+    torch = types.ModuleType("torch")
+    if compile is not None:
+        torch.compile = compile
+    original = sys.modules.get("torch")
+    sys.modules["torch"] = torch
+    try:
+        yield
+    finally:
+        if original is None:
+            del sys.modules["torch"]
+        else:
+            sys.modules["torch"] = original
+
+def _compile(fn, dynamic=False):
+    def compiled(*args, **kwargs):
+        return "compiled " + fn(*args, **kwargs).split()[-1]
+    return compiled
+
+def test_compile_reaches_the_search():
+    translator = FakeTranslator()
+    search = translator._search
+    with _torch(_compile):
+        assert inference_tuning.compile_translator(translator) is True
+    print("Search calls:", search("x"))
+    assert search("x") == ("compiled encode", "compiled decode"), "The search must run the compiled methods"
+    assert translator.models[0] is search._model, "The models are patched in place, not replaced"
+
+def test_compile_unsupported_build():
+    translator = FakeTranslator()
+    with _torch():
+        assert inference_tuning.compile_translator(translator) is False
+    assert translator._search("x") == ("eager encode", "eager decode")
+
+if __name__ == "__main__":
+    test_compile_reaches_the_search()
+    test_compile_unsupported_build()
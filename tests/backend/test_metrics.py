@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from services import metrics  # noqa: E402
+
+def test_counter_and_gauge_render():
+    requests = metrics.counter("test_requests_total", "Requests.", ("endpoint",))
+    assert metrics.counter("test_requests_total", "Requests.", ("endpoint",)) is requests, "Metrics are registered once"
+    requests.inc(endpoint="/a")
+    requests.inc(2, endpoint='say "hi"\n')
+    depth = metrics.gauge("test_queue_depth", "Queue depth.")
+    depth.set(5)
+    depth.dec()
+
+    lines = requests.render() + depth.render()
+    print("\n".join(lines))
+    assert lines[:2] == ["# HELP test_requests_total Requests.", "# TYPE test_requests_total counter"]
+    assert 'test_requests_total{endpoint="/a"} 1' in lines
+    assert 'test_requests_total{endpoint="say \\"hi\\"\\n"} 2' in lines, "Label values are escaped"
+    assert "# TYPE test_queue_depth gauge" in lines and "test_queue_depth 4" in lines
+
+def test_histogram_buckets_are_cumulative():
+    latency = metrics.histogram("test_latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, stage="asr")
+    lines = latency.samples()
+    print("\n".join(lines))
+    assert lines == [
+        'test_latency_seconds_bucket{stage="asr",le="0.1"} 1',
+        'test_latency_seconds_bucket{stage="asr",le="1.0"} 3',
+        'test_latency_seconds_bucket{stage="asr",le="+Inf"} 4',
+        'test_latency_seconds_sum{stage="asr"} 4.25',
+        'test_latency_seconds_count{stage="asr"} 4',
+    ]
+
+def test_span_times_stages_and_counts_errors():
+    with metrics.span("test_stage"):
+        pass
+    try:
+        with metrics.span("test_stage"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    rendered = metrics.render()
+    assert 'signcast_stage_duration_seconds_count{stage="test_stage"} 2' in rendered
+    assert 'signcast_stage_errors_total{stage="test_stage"} 1' in rendered
+
+def test_stats_collector_exports_numbers():
+    collect = metrics.stats_collector(
+        "test_cache", lambda: {"memory": {"hits": 3, "hit-rate": 0.75, "enabled": True, "path": "/tmp/x"}}, label="cache"
+    )
+    lines = collect()
+    print("\n".join(lines))
+    assert 'signcast_test_cache_hits{cache="memory"} 3' in lines
+    assert 'signcast_test_cache_hit_rate{cache="memory"} 0.75' in lines, "Field names are sanitized"
+    assert 'signcast_test_cache_enabled{cache="memory"} 1' in lines, "Booleans are exported as 0/1"
+    assert not any("path" in line for line in lines), "Non-numeric fields are skipped"
+    assert metrics.stats_collector("test_none", lambda: None)() == []
+
+def test_middleware_labels_route_templates():
+    app = FastAPI()
+    app.add_middleware(metrics.MetricsMiddleware)
+
+    @app.get("/test_items/{item_id}")
+    def item(item_id: int):
+        return {"id": item_id}
+
+    with TestClient(app) as client:
+        client.get("/test_items/1")
+        client.get("/test_items/2")
+        client.get("/test_missing")
+    rendered = metrics.render()
+    assert 'signcast_http_request_duration_seconds_count{method="GET",route="/test_items/{item_id}",status="200"} 2' in rendered
+    assert 'route="unmatched",status="404"} 1' in rendered, "Unknown paths share one label value"
+    assert "signcast_http_requests_in_flight 0" in rendered
+
+if __name__ == "__main__":
+    test_counter_and_gauge_render()
+    test_histogram_buckets_are_cumulative()
+    test_span_times_stages_and_counts_errors()
+    test_stats_collector_exports_numbers()
+    test_middleware_labels_route_templates()
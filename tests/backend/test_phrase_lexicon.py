@@ -0,0 +1,71 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.phrase_lexicon import LEXICON_VERSION, Piece, PhraseLexicon, phrase_key  # noqa: E402
+
+PHRASES = {
+    "thank you": "M518x529S14c20481x471",
+    "thank": "M507x515S14c20493x485",
+    "good morning": "M520x531S10e00480x470",
+    "how are you": "M530x520S20500470x480",
+}
+
+def test_phrase_key_normalizes():
+    assert phrase_key("  Thank YOU! ") == "thank you"
+    assert phrase_key("Ｇｏｏｄ morning,") == "good morning", "Full-width text is NFKC-normalized"
+    assert phrase_key("don't stop") == "don't stop", "Apostrophes stay inside words"
+
+def test_lookup_matches_whole_phrases_only():
+    lexicon = PhraseLexicon(PHRASES)
+    assert lexicon.lookup("Thank you.") == PHRASES["thank you"]
+    assert lexicon.lookup("thank") == PHRASES["thank"]
+    assert lexicon.lookup("thank you very much") is None
+    assert lexicon.lookup("good") is None, "A phrase prefix is not a phrase"
+
+def test_segment_takes_the_longest_match():
+    lexicon = PhraseLexicon(PHRASES)
+    pieces = lexicon.segment("Good morning, my friend! Thank you.")
+    print("Pieces:", pieces)
+    assert pieces == [
+        Piece("Good morning", PHRASES["good morning"]),
+        Piece("my friend", None),
+        Piece("Thank you", PHRASES["thank you"]),
+    ]
+    assert lexicon.segment("How are you thank") == [
+        Piece("How are you", PHRASES["how are you"]),
+        Piece("thank", PHRASES["thank"]),
+    ]
+    assert lexicon.stats()["partial_hits"] == 1 and lexicon.stats()["full_hits"] == 1
+
+def test_uncovered_text_comes_back_whole():
+    lexicon = PhraseLexicon(PHRASES)
+    assert lexicon.segment("Nothing known here!") == [Piece("Nothing known here!", None)]
+    assert lexicon.segment("Thank you, my friend.", allow_partial=False) == [Piece("Thank you, my friend.", None)]
+    assert lexicon.stats()["misses"] == 2
+
+def test_load_checks_the_version():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "phrases.json"
+        path.write_text(json.dumps({"version": LEXICON_VERSION, "signed_language": "gsg", "phrases": PHRASES}))
+        lexicon = PhraseLexicon.load(path)
+        assert lexicon.size == len(PHRASES) and lexicon.signed_language == "gsg"
+        assert lexicon.stats()["source"] == str(path)
+
+        path.write_text(json.dumps({"version": LEXICON_VERSION + 1, "phrases": PHRASES}))
+        try:
+            PhraseLexicon.load(path)
+            raise AssertionError("Expected ValueError for an unknown lexicon version")
+        except ValueError as exc:
+            print("Rejected:", exc)
+
+if __name__ == "__main__":
+    test_phrase_key_normalizes()
+    test_lookup_matches_whole_phrases_only()
+    test_segment_takes_the_longest_match()
+    test_uncovered_text_comes_back_whole()
+    test_load_checks_the_version()
@@ -0,0 +1,28 @@
+import json
+import requests
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def test_pipeline():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    url = f"{backend_url}/pipeline"
+    audio_path = "tests/test_file_converted.wav"
+
+    with open(audio_path, "rb") as f:
+        files = {"audio": ("test_file_converted.wav", f, "audio/wav")}
+        response = requests.post(url, files=files, data={"simplify_text": "false"}, stream=True)
+        print("Status Code:", response.status_code)
+        # Events arrive one per line as each stage finishes
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if "pose_data" in event:
+                event["pose_data"] = f"<{len(event['pose_data'])} base64 chars>"
+            print("Event:", event)
+
+if __name__ == "__main__":
+    test_pipeline()
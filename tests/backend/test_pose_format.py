@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.pose_format import read_pose, write_pose  # noqa: E402
+
+HEADER = {
+    "version": 0.1,
+    "dimensions": {"width": 640, "height": 480, "depth": 0},
+    "components": [
+        {
+            "name": "POSE_LANDMARKS",
+            "format": "XYZC",
+            "points": ["NOSE", "LEFT_WRIST", "RIGHT_WRIST"],
+            "limbs": [[0, 1], [0, 2]],
+            "colors": [[255, 0, 0]],
+        },
+        {
+            "name": "FACE_LANDMARKS",
+            "format": "XYZC",
+            "points": ["LIPS"],
+            "limbs": [],
+            "colors": [[0, 255, 0]],
+        },
+    ],
+}
+
+def test_pose_format_round_trip():
+    rng = np.random.default_rng(0)
+    data = rng.random((5, 1, 4, 3), dtype=np.float32)
+    confidence = rng.random((5, 1, 4), dtype=np.float32)
+
+    pose = write_pose(HEADER, 25, data, confidence)
+    header, fps, read_data, read_confidence = read_pose(pose)
+    print(f"{len(pose)} bytes, {read_data.shape[0]} frames at {fps} fps")
+    assert header == HEADER
+    assert fps == 25
+    assert np.array_equal(read_data, data) and np.array_equal(read_confidence, confidence)
+    assert write_pose(header, fps, read_data, read_confidence) == pose, "Writing is deterministic"
+
+def test_pose_format_long_and_mismatched():
+    # The stored frame count is a ushort; longer poses still read back in full
+    frames = 0x10000 + 3
+    data = np.zeros((frames, 1, 4, 3), dtype=np.float32)
+    _, _, read_data, _ = read_pose(write_pose(HEADER, 30, data, np.ones((frames, 1, 4), dtype=np.float32)))
+    assert read_data.shape[0] == frames
+
+    try:
+        write_pose(HEADER, 25, np.zeros((1, 1, 5, 3), dtype=np.float32), np.zeros((1, 1, 5), dtype=np.float32))
+        raise AssertionError("Expected a shape mismatch error")
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_pose_format_round_trip()
+    test_pose_format_long_and_mismatched()
@@ -0,0 +1,84 @@
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.pose_store import INDEX_FILE, PoseStore, PoseStoreWriter, resampled_length  # noqa: E402
+
+POINTS, CHANNELS = 3, 4
+
+def _clip(frames, start):
+    # Every value in frame i is start + i, so resampling is easy to check
+    values = np.arange(start, start + frames, dtype=np.float32)
+    return np.broadcast_to(values[:, None, None], (frames, POINTS, CHANNELS)).copy()
+
+def _build(path, dtype="float32"):
+    writer = PoseStoreWriter(path, POINTS, CHANNELS, dtype)
+    writer.add("a", _clip(5, 0), fps=25)
+    writer.add("b", _clip(3, 100), fps=50)
+    writer.close({"fps": 25})
+    return PoseStore(path)
+
+def test_round_trip():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _build(Path(tmp))
+        print("Refs:", store.ref("a"), store.ref("b"))
+        assert len(store) == 2 and "a" in store and "c" not in store
+        assert store.metadata == {"fps": 25}
+        assert store.ref("b").offset == 5, "Clips are packed back to back"
+        np.testing.assert_array_equal(store.clip("a"), _clip(5, 0))
+        np.testing.assert_array_equal(store.clip("b"), _clip(3, 100))
+        assert isinstance(store.clip("a"), np.memmap), "clip() is a view into the mapping"
+        assert store.clip("c") is None
+
+def test_writer_rejects_mismatched_clips():
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = PoseStoreWriter(Path(tmp), POINTS, CHANNELS)
+        try:
+            writer.add("bad", np.zeros((2, POINTS + 1, CHANNELS)), fps=25)
+            raise AssertionError("Expected ValueError for a clip with the wrong skeleton")
+        except ValueError as exc:
+            print("Rejected:", exc)
+        finally:
+            writer.close()
+
+def test_old_index_version_is_rejected():
+    with tempfile.TemporaryDirectory() as tmp:
+        _build(Path(tmp))
+        index_path = Path(tmp) / INDEX_FILE
+        index = json.loads(index_path.read_text())
+        index["version"] = 1
+        index_path.write_text(json.dumps(index))
+        try:
+            PoseStore(Path(tmp))
+            raise AssertionError("Expected ValueError for an old store version")
+        except ValueError as exc:
+            print("Rejected:", exc)
+
+def test_compose_resamples_blends_and_pauses():
+    assert resampled_length(5, 25, 25) == 5
+    assert resampled_length(3, 50, 25) == 2
+    assert resampled_length(5, 25, 50) == 9
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _build(Path(tmp), dtype="float16")
+        out = store.compose(["a", None, "b"], fps=25, transition_frames=2, pause_frames=3)
+        values = out[:, 0, 0].tolist()
+        print("Composed:", values)
+        assert out.dtype == np.float32
+        assert out.shape == (5 + 3 + 2 + 2, POINTS, CHANNELS)
+        assert values[:5] == [0, 1, 2, 3, 4], "Clips at the output rate are copied as-is"
+        assert values[5:8] == [4, 4, 4], "Pauses hold the previous frame"
+        assert 4 < values[8] < values[9] < 100, "Transitions ease from the last frame to the next clip"
+        assert values[10:] == [100, 102], "50 fps clips are resampled to 25 fps"
+        assert (out == out[:, :1, :1]).all(), "Every point and channel moves together"
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_writer_rejects_mismatched_clips()
+    test_old_index_version_is_rejected()
+    test_compose_resamples_blends_and_pauses()
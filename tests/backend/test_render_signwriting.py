@@ -0,0 +1,56 @@
+import requests
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+SIGN = "M518x529S14c20481x471S27106503x489"
+SENTENCE = f"{SIGN} M521x517S10000479x483S22a04492x501 S38800464x496"
+
+def test_render_signwriting():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    url = f"{backend_url}/render_signwriting"
+
+    response = requests.get(url, params={"fsw": SIGN})
+    print("Status Code:", response.status_code)
+    print("Content-Type:", response.headers.get("content-type"))
+    print("ETag:", response.headers.get("etag"))
+    print(response.text[:200])
+    assert response.status_code == 200, "Expected the SVG rendering"
+
+    # The same sign with a matching ETag is not sent again
+    cached = requests.get(url, params={"fsw": SIGN}, headers={"If-None-Match": response.headers["etag"]})
+    print("Revalidation Status Code:", cached.status_code)
+    assert cached.status_code == 304, "Expected 304 Not Modified"
+
+    png = requests.get(url, params={"fsw": SIGN, "format": "png", "scale": 2})
+    print("PNG Status Code:", png.status_code, "(503 without Pillow or the SignWriting fonts)")
+
+def test_render_signwriting_sprite():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    url = f"{backend_url}/render_signwriting/sprite"
+
+    response = requests.post(url, json={"fsw": SENTENCE, "padding": 5})
+    print("Status Code:", response.status_code)
+    try:
+        result = response.json()
+    except Exception as e:
+        print("Failed to parse JSON response:", e)
+        print("Response text:", response.text)
+        raise
+    assert response.status_code == 200, "Expected the sprite sheet"
+    print(f"{result['width']}x{result['height']} {result['format']} sheet")
+    for frame in result["frames"]:
+        print(f"  {frame['fsw']}: x={frame['x']} y={frame['y']} {frame['width']}x{frame['height']}")
+    assert len(result["frames"]) == 3, "Expected one frame per sign"
+
+    # POST responses are never 304; the ETag still identifies the sheet
+    again = requests.post(url, json={"fsw": SENTENCE, "padding": 5}, headers={"If-None-Match": response.headers["etag"]})
+    print("Repeat Status Code:", again.status_code)
+    assert again.status_code == 200, "Expected the sheet again"
+    assert again.headers["etag"] == response.headers["etag"], "Expected the same ETag"
+
+if __name__ == "__main__":
+    test_render_signwriting()
+    test_render_signwriting_sprite()
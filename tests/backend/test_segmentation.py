@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.segmentation import split_sentences  # noqa: E402
+
+def test_sentences_keep_offsets():
+    text = "Hello there.  How are you?\nFine!"
+    segments = split_sentences(text, max_chars=0)
+    print("Segments:", segments)
+    assert [segment.text for segment in segments] == ["Hello there.", "How are you?", "Fine!"]
+    for segment in segments:
+        assert text[segment.start:segment.end] == segment.text, "Offsets map back to the input"
+
+def test_abbreviations_do_not_end_sentences():
+    segments = split_sentences("Dr. Smith met Mr. Jones, e.g. at work. Then he left.", max_chars=0)
+    print("Segments:", segments)
+    assert [segment.text for segment in segments] == ["Dr. Smith met Mr. Jones, e.g. at work.", "Then he left."]
+
+def test_long_sentences_split_at_clauses():
+    text = "First we cook, then we eat; finally we sleep. Short."
+    segments = split_sentences(text, max_chars=20)
+    print("Segments:", segments)
+    assert [segment.text for segment in segments] == ["First we cook,", "then we eat;", "finally we sleep.", "Short."]
+    for segment in segments:
+        assert text[segment.start:segment.end] == segment.text
+
+def test_blank_text():
+    assert split_sentences("   \n  ", max_chars=0) == []
+
+if __name__ == "__main__":
+    test_sentences_keep_offsets()
+    test_abbreviations_do_not_end_sentences()
+    test_long_sentences_split_at_clauses()
+    test_blank_text()
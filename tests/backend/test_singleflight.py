@@ -0,0 +1,69 @@
+import asyncio
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from services.singleflight import SingleFlight, get_singleflight  # noqa: E402
+
+def test_concurrent_calls_share_one_execution():
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.02)
+        return "result"
+
+    async def run():
+        group = SingleFlight("test")
+        results = await asyncio.gather(*(group.do("key", work) for _ in range(5)), group.do("other", work))
+        assert not group.in_flight("key"), "Finished work is forgotten"
+        # Results are not kept: a later call runs again
+        await group.do("key", work)
+        return results, group.stats()
+
+    results, stats = asyncio.run(run())
+    print("Stats:", stats)
+    assert results == ["result"] * 6
+    assert len(calls) == 3, "One execution per key at a time"
+    assert stats == {"in_flight": 0, "executed": 3, "coalesced": 4, "coalesced_rate": 0.5714}
+
+def test_errors_reach_every_waiter():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    async def run():
+        group = SingleFlight("test")
+        return await asyncio.gather(group.do("key", fail), group.do("key", fail), return_exceptions=True)
+
+    results = asyncio.run(run())
+    print("Results:", results)
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def work():
+        await asyncio.sleep(0.05)
+        return "result"
+
+    async def run():
+        group = SingleFlight("test")
+        first = asyncio.create_task(group.do("key", work))
+        second = asyncio.create_task(group.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second, first.cancelled()
+
+    result, first_cancelled = asyncio.run(run())
+    assert first_cancelled and result == "result", "The shared task is shielded from one caller's cancellation"
+
+def test_groups_are_shared_per_name():
+    assert get_singleflight("test_group") is get_singleflight("test_group")
+    assert get_singleflight("test_group") is not get_singleflight("test_group_other")
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_execution()
+    test_errors_reach_every_waiter()
+    test_cancelled_caller_does_not_cancel_the_others()
+    test_groups_are_shared_per_name()
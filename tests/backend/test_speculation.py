@@ -0,0 +1,142 @@
+import asyncio
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from api import pose_generation, simplify_text  # noqa: E402
+from config import config  # noqa: E402
+from services.speculation import SpeculativeRunner  # noqa: E402
+
+def _job(key, result, delay=0.0, started=None):
+    async def run():
+        if started is not None:
+            started.append(key)
+        await asyncio.sleep(delay)
+        if isinstance(result, Exception):
+            raise result
+        return result
+    return key, run
+
+def test_matching_claim_reuses_the_result():
+    async def run():
+        runner = SpeculativeRunner(ttl_seconds=5, max_entries=10)
+        runner.start("r1", {"translate": _job("hello", "M500x500", delay=0.01), "pose": _job("hello", b"pose")})
+        claimed = await runner.claim("r1", "translate", "hello")
+        assert claimed == (True, "M500x500"), "A still-running task is awaited"
+        assert await runner.claim("r1", "pose", "hello") == (True, b"pose")
+        assert await runner.claim("r1", "pose", "hello") == (False, None), "Each result is claimed once"
+        return runner.stats()
+
+    stats = asyncio.run(run())
+    print("Stats:", stats)
+    assert stats["reused"] == 2 and stats["pending"] == 0
+
+def test_mismatched_key_cancels_the_task():
+    async def run():
+        runner = SpeculativeRunner(ttl_seconds=5, max_entries=10)
+        runner.start("r1", {"translate": _job("hello", "M500x500", delay=1)})
+        task = runner._entries["r1"].tasks["translate"][1]
+        assert await runner.claim("r1", "translate", "hello world") == (False, None)
+        await asyncio.sleep(0)
+        assert task.cancelled(), "The stale speculation is cancelled"
+        assert await runner.claim("unknown", "translate", "hello") == (False, None)
+        return runner.stats()
+
+    stats = asyncio.run(run())
+    print("Stats:", stats)
+    assert stats["cancelled"] == 1 and stats["reused"] == 0
+
+def test_failures_fall_back_to_the_caller():
+    async def run():
+        runner = SpeculativeRunner(ttl_seconds=5, max_entries=10)
+        runner.start("r1", {"translate": _job("hello", RuntimeError("model failed"))})
+        assert await runner.claim("r1", "translate", "hello") == (False, None)
+        return runner.stats()
+
+    stats = asyncio.run(run())
+    print("Stats:", stats)
+    assert stats["failed"] == 1
+
+def test_unclaimed_work_expires():
+    async def run():
+        runner = SpeculativeRunner(ttl_seconds=0.05, max_entries=10)
+        runner.start("r1", {"translate": _job("hello", "M500x500", delay=1)})
+        task = runner._entries["r1"].tasks["translate"][1]
+        await asyncio.sleep(0.1)
+        assert task.cancelled(), "Unclaimed work is cancelled after the TTL"
+        assert await runner.claim("r1", "translate", "hello") == (False, None)
+        return runner.stats()
+
+    stats = asyncio.run(run())
+    print("Stats:", stats)
+    assert stats["expired"] == 1 and stats["pending"] == 0
+
+def test_max_entries_and_duplicate_ids():
+    async def run():
+        started = []
+        runner = SpeculativeRunner(ttl_seconds=5, max_entries=1)
+        runner.start("r1", {"translate": _job("a", 1, started=started)})
+        runner.start("r1", {"translate": _job("b", 2, started=started)})
+        runner.start("r2", {"translate": _job("c", 3, started=started)})
+        await asyncio.sleep(0)
+        assert started == ["a"], "Repeated ids and work beyond max_entries are not started"
+        return runner.stats()
+
+    stats = asyncio.run(run())
+    print("Stats:", stats)
+    assert stats["started"] == 1 and stats["skipped"] == 1
+
+def test_simplify_text_speculates_the_pose():
+    calls = []
+
+    async def fake_fetch_pose_result(text, spoken_language, signed_language):
+        calls.append((text, spoken_language, signed_language))
+        return b"pose", ["M518x529S14c20481x471"]
+
+    originals = (
+        pose_generation.fetch_pose_result, simplify_text.signwriting_translation,
+        config.GROQ_API_KEY, config.POSE_API_URL, config.POSE_ENGINE,
+    )
+    pose_generation.fetch_pose_result = fake_fetch_pose_result
+    # Groq falls back to the original text and only the pose is speculated
+    simplify_text.signwriting_translation = None
+    config.GROQ_API_KEY, config.POSE_API_URL, config.POSE_ENGINE = "", "http://pose.invalid", "remote"
+    try:
+        app = FastAPI()
+        app.include_router(simplify_text.router)
+        app.include_router(pose_generation.router)
+        with TestClient(app) as client:
+            client.post("/simplify_text", json={"text": "speculated pose", "request_id": "spec-test-1"})
+            assert calls == [], "Nothing is speculated without the target languages"
+
+            client.post("/simplify_text", json={
+                "text": "speculated pose", "request_id": "spec-test-2",
+                "spoken_language": "de", "signed_language": "gsg",
+            })
+            response = client.post("/generate_pose", json={
+                "text": "speculated pose", "request_id": "spec-test-2",
+                "spoken_language": "de", "signed_language": "gsg",
+            })
+    finally:
+        (
+            pose_generation.fetch_pose_result, simplify_text.signwriting_translation,
+            config.GROQ_API_KEY, config.POSE_API_URL, config.POSE_ENGINE,
+        ) = originals
+
+    print("Response:", response.json(), "Calls:", calls)
+    assert response.status_code == 200
+    assert calls == [("speculated pose", "de", "gsg")], "The claimed pose is not fetched again"
+    assert response.json()["missing_signs"] == ["M518x529S14c20481x471"], "Missing signs survive the claim"
+
+if __name__ == "__main__":
+    test_matching_claim_reuses_the_result()
+    test_mismatched_key_cancels_the_task()
+    test_failures_fall_back_to_the_caller()
+    test_unclaimed_work_expires()
+    test_max_entries_and_duplicate_ids()
+    test_simplify_text_speculates_the_pose()
@@ -0,0 +1,34 @@
+import json
+import os
+import wave
+from dotenv import load_dotenv
+from websockets.sync.client import connect
+
+# Load environment variables
+load_dotenv()
+
+def test_transcribe_stream():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    ws_url = backend_url.replace("http", "ws", 1)
+    audio_path = "tests/test_file_converted.wav"
+
+    with wave.open(audio_path, "rb") as wav:
+        sample_rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+
+    url = f"{ws_url}/transcribe/stream?format=pcm16&sample_rate={sample_rate}"
+    with connect(url) as ws:
+        # Send 100 ms chunks, like a live microphone would
+        chunk_size = sample_rate // 10 * 2
+        for i in range(0, len(frames), chunk_size):
+            ws.send(frames[i:i + chunk_size])
+        ws.send(json.dumps({"type": "stop"}))
+
+        while True:
+            message = json.loads(ws.recv())
+            print("Message:", message)
+            if message["type"] in ("done", "error"):
+                break
+
+if __name__ == "__main__":
+    test_transcribe_stream()
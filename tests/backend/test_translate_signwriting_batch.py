@@ -0,0 +1,31 @@
+import requests
+import os
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+def test_translate_signwriting_batch():
+    backend_url = os.getenv("BACKEND_URL", "http://127.0.0.1:8000")
+    url = f"{backend_url}/translate_signwriting/batch"
+    texts = [
+        "My name is John.",
+        "Hello, how are you? I am fine.",
+        "Where is the library?",
+    ]
+
+    response = requests.post(url, json={"texts": texts})
+    print("Status Code:", response.status_code)
+    try:
+        results = response.json()["results"]
+    except Exception as e:
+        print("Failed to parse JSON response:", e)
+        print("Response text:", response.text)
+        raise
+    for text, result in zip(texts, results):
+        print(f"{text!r} -> {result['signwriting']} ({len(result['segments'])} segments)")
+    assert response.status_code == 200, "Expected a successful batch translation"
+    assert len(results) == len(texts), "Expected one result per text"
+
+if __name__ == "__main__":
+    test_translate_signwriting_batch()
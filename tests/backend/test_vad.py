@@ -0,0 +1,89 @@
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "apps" / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from api import transcribe_stream  # noqa: E402
+from config import config  # noqa: E402
+from services import whisper_pool  # noqa: E402
+from services.audio import SAMPLE_RATE  # noqa: E402
+from services.vad import SpeechSegmenter  # noqa: E402
+
+def _tone(seconds, amplitude=0.3):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+def _silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+def test_silence_closes_a_segment():
+    segmenter = SpeechSegmenter(threshold=0.01, min_silence_ms=300, max_segment_s=10, pre_roll_ms=0)
+    audio = np.concatenate([_silence(0.6), _tone(1.0), _silence(0.5)])
+    # Odd chunk sizes so frames straddle feed() calls
+    segments = []
+    for offset in range(0, len(audio), 1234):
+        segments.extend(segmenter.feed(audio[offset:offset + 1234]))
+    print("Segments:", [(start, len(samples)) for start, samples in segments])
+    assert len(segments) == 1
+    start, samples = segments[0]
+    assert abs(start - 0.6) < 0.03, "Segment starts at the first speech frame"
+    assert abs(len(samples) / SAMPLE_RATE - 1.0) < 0.03, "Trailing silence is dropped"
+    assert not segmenter.in_speech
+    assert segmenter.flush() is None
+
+def test_pre_roll_and_max_length():
+    segmenter = SpeechSegmenter(threshold=0.01, min_silence_ms=300, max_segment_s=1.0, pre_roll_ms=90)
+    segments = segmenter.feed(np.concatenate([_silence(0.6), _tone(2.5)]))
+    print("Segments:", [(start, len(samples)) for start, samples in segments])
+    assert len(segments) == 2, "Segments are cut at max_segment_s"
+    assert abs(segments[0][0] - 0.51) < 0.03, "The pre-roll is included before the first speech frame"
+    assert all(len(samples) < SAMPLE_RATE + segmenter.frame_size for _, samples in segments), "Cut within a frame of the limit"
+    assert segmenter.in_speech
+    closed = segmenter.flush()
+    assert closed is not None and len(closed[1]) > 0, "flush() returns the open segment"
+
+def test_stream_endpoint_with_stub_whisper():
+    calls = []
+
+    async def fake_transcribe(audio, initial_prompt=None):
+        calls.append((len(audio), initial_prompt))
+        return f"segment {len(calls)}"
+
+    originals = whisper_pool.transcribe, whisper_pool.whisper_available, config.STREAM_PARTIAL_INTERVAL_MS
+    whisper_pool.transcribe = fake_transcribe
+    whisper_pool.whisper_available = lambda: True
+    # Only final transcripts, so the stub sees one call per segment
+    config.STREAM_PARTIAL_INTERVAL_MS = 60_000
+    try:
+        app = FastAPI()
+        app.include_router(transcribe_stream.router)
+        pcm = (np.concatenate([_tone(1.0), _silence(1.0), _tone(0.8)]) * 32767).astype("<i2").tobytes()
+        with TestClient(app).websocket_connect("/transcribe/stream?format=pcm16") as websocket:
+            for offset in range(0, len(pcm), 8000):
+                websocket.send_bytes(pcm[offset:offset + 8000])
+            websocket.send_text(json.dumps({"type": "stop"}))
+            messages = []
+            while not messages or messages[-1]["type"] != "done":
+                messages.append(json.loads(websocket.receive_text()))
+    finally:
+        whisper_pool.transcribe, whisper_pool.whisper_available, config.STREAM_PARTIAL_INTERVAL_MS = originals
+
+    finals = [message for message in messages if message["type"] == "final"]
+    print("Finals:", finals)
+    assert [message["text"] for message in finals] == ["segment 1", "segment 2"]
+    assert [message["segment"] for message in finals] == [0, 1]
+    assert finals[0]["start"] < finals[0]["end"] <= finals[1]["start"]
+    assert messages[-1] == {"type": "done", "segments": 2}
+    assert calls[1][1] == "segment 1", "The previous segment is the next prompt"
+
+if __name__ == "__main__":
+    test_silence_closes_a_segment()
+    test_pre_roll_and_max_length()
+    test_stream_endpoint_with_stub_whisper()
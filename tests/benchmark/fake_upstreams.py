@@ -0,0 +1,161 @@
+"""
+Local stand-ins for the services the backend calls: Groq chat completions,
+Groq audio transcriptions and the pose API (POSE_API_URL).
+
+Each response is delayed according to a latency profile and fails with a 503
+at the profile's failure rate, so benchmarks are reproducible and never touch
+the real services.
+
+Run on its own (e.g. to benchmark a separately started backend):
+    python tests/benchmark/fake_upstreams.py --port 9900 --profile slow
+then point GROQ_API_URL, GROQ_TRANSCRIPTIONS_URL and POSE_API_URL at it
+(see `urls()`).
+"""
+
+import argparse
+import asyncio
+import random
+import socket
+import threading
+import time
+from pathlib import Path
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import PlainTextResponse
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+# latency_ms: median delay, jitter_ms: +/- uniform spread, failure_rate: share of 503s
+PROFILES = {
+    "instant": {"latency_ms": 0, "jitter_ms": 0, "failure_rate": 0.0},
+    "fast": {"latency_ms": 50, "jitter_ms": 20, "failure_rate": 0.0},
+    "realistic": {"latency_ms": 300, "jitter_ms": 150, "failure_rate": 0.0},
+    "slow": {"latency_ms": 1500, "jitter_ms": 500, "failure_rate": 0.0},
+    "flaky": {"latency_ms": 300, "jitter_ms": 150, "failure_rate": 0.05},
+}
+
+TRANSCRIPT = {
+    "text": "Hello there. How are you today? I am learning sign language.",
+    "language": "english",
+    "duration": 6.0,
+    "segments": [
+        {"id": 0, "start": 0.0, "end": 1.2, "text": " Hello there."},
+        {"id": 1, "start": 1.4, "end": 3.0, "text": " How are you today?"},
+        {"id": 2, "start": 3.2, "end": 6.0, "text": " I am learning sign language."},
+    ],
+}
+
+
+def _sample_pose() -> bytes:
+    path = TESTS_DIR / "test.pose"
+    return path.read_bytes() if path.exists() else b"\0" * 4096
+
+
+def create_app(latency_ms: float = 0, jitter_ms: float = 0, failure_rate: float = 0.0, seed: int = 0) -> FastAPI:
+    """Fake upstream app; `app.state.calls` counts requests per route."""
+    app = FastAPI()
+    app.state.calls = {"chat": 0, "transcriptions": 0, "pose": 0}
+    rng = random.Random(seed)
+    pose_data = _sample_pose()
+
+    async def delay(route: str):
+        """Sleep for the profile's latency; returns an error response when this call should fail."""
+        app.state.calls[route] += 1
+        seconds = max(0.0, latency_ms + rng.uniform(-jitter_ms, jitter_ms)) / 1000
+        if seconds:
+            await asyncio.sleep(seconds)
+        if failure_rate and rng.random() < failure_rate:
+            return Response(status_code=503, content=b"fake upstream failure")
+        return None
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat(request: Request):
+        failure = await delay("chat")
+        if failure is not None:
+            return failure
+        body = await request.json()
+        # Echo the text back so responses differ per input like the real service
+        prompt = body["messages"][-1]["content"]
+        return {"choices": [{"message": {"role": "assistant", "content": prompt.split(":", 1)[-1].strip()}}]}
+
+    @app.post("/openai/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        failure = await delay("transcriptions")
+        if failure is not None:
+            return failure
+        form = await request.form()
+        if form.get("response_format") == "text":
+            return PlainTextResponse(TRANSCRIPT["text"])
+        return TRANSCRIPT
+
+    @app.get("/pose")
+    async def pose():
+        failure = await delay("pose")
+        if failure is not None:
+            return failure
+        return Response(pose_data, media_type="application/pose")
+
+    return app
+
+
+def urls(base_url: str) -> dict:
+    """Backend environment variables that route every upstream call to the fakes at ``base_url``."""
+    return {
+        "GROQ_API_URL": f"{base_url}/openai/v1/chat/completions",
+        "GROQ_TRANSCRIPTIONS_URL": f"{base_url}/openai/v1/audio/transcriptions",
+        "POSE_API_URL": f"{base_url}/pose",
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class ServerThread:
+    """Serve an ASGI app with uvicorn on a background thread of this process."""
+
+    def __init__(self, app, port: int = 0):
+        self.port = port or free_port()
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", access_log=False)
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def start(self, timeout: float = 30) -> "ServerThread":
+        self.thread.start()
+        deadline = time.monotonic() + timeout
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError(f"Server on port {self.port} failed to start")
+            time.sleep(0.05)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve fake Groq and pose API upstreams")
+    parser.add_argument("--port", type=int, default=9900)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--jitter-ms", type=float)
+    parser.add_argument("--failure-rate", type=float)
+    args = parser.parse_args()
+
+    profile = dict(PROFILES[args.profile])
+    for name in profile:
+        if getattr(args, name) is not None:
+            profile[name] = getattr(args, name)
+    for name, value in urls(f"http://127.0.0.1:{args.port}").items():
+        print(f"{name}={value}")
+    uvicorn.run(create_app(**profile), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Benchmark the backend in-process against local fake upstreams.
+
+The FastAPI app is started with uvicorn on a background thread, with Groq and
+POSE_API_URL pointed at fake servers (fake_upstreams.py) that answer after a
+configurable latency and fail at a configurable rate. Each scenario is then
+driven over HTTP at a fixed concurrency and reported with:
+
+    p50/p95/p99 latency, throughput, status codes,
+    RSS (start/peak/end) and CPU seconds used by the process during the scenario,
+    and for the pipeline the per-stage timings from its event stream.
+
+CPU and RSS are for the whole process (backend, fakes and load generator),
+which keeps the numbers comparable between commits rather than absolute.
+
+Examples (from the repository root, backend environment active):
+    python tests/benchmark/run_benchmark.py --profile fast --concurrency 16 --requests 200
+    python tests/benchmark/run_benchmark.py --scenarios pose,pipeline --output before.json
+    python tests/benchmark/run_benchmark.py --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import httpx
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARK_DIR.parent.parent
+BACKEND_DIR = REPO_ROOT / "apps" / "backend"
+sys.path.insert(0, str(BENCHMARK_DIR))
+
+from fake_upstreams import PROFILES, ServerThread, create_app, urls  # noqa: E402
+
+SENTENCES = [
+    "Hello, how are you?",
+    "My name is John and I live in Boston.",
+    "Where is the nearest library?",
+    "The weather is nice today, so we are going to the park.",
+    "Please call me when you arrive at the station.",
+    "I am learning sign language with my friends.",
+]
+
+# Metrics where a higher value in the new run is a regression
+LOWER_IS_BETTER = ("p50_ms", "p95_ms", "p99_ms", "cpu_seconds", "rss_peak_mb")
+
+
+def _text(index: int, repeat_inputs: bool, sentences: int = 1) -> str:
+    parts = [SENTENCES[(index + i) % len(SENTENCES)] for i in range(sentences)]
+    if not repeat_inputs:
+        # A unique prefix per sentence keeps every request (and every pipeline segment)
+        # a cache miss unless caching is what is being measured
+        parts = [f"Request {index}-{i}: {part}" for i, part in enumerate(parts)]
+    return " ".join(parts)
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        # Not Linux: fall back to the peak, which is all getrusage reports
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class RssSampler:
+    """Track peak resident memory on a background thread."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = _rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_mb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _rss_mb())
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(latencies_ms):
+    return {
+        "p50_ms": round(percentile(latencies_ms, 0.50), 2) if latencies_ms else None,
+        "p95_ms": round(percentile(latencies_ms, 0.95), 2) if latencies_ms else None,
+        "p99_ms": round(percentile(latencies_ms, 0.99), 2) if latencies_ms else None,
+        "mean_ms": round(statistics.fmean(latencies_ms), 2) if latencies_ms else None,
+    }
+
+
+# Each scenario sends request ``index`` and returns its HTTP status code.
+# ``stages`` collects per-stage timings (milliseconds) where the endpoint reports them.
+
+async def simplify_scenario(client, index, args, stages):
+    response = await client.post("/simplify_text", json={"text": _text(index, args.repeat_inputs)})
+    return response.status_code
+
+
+async def translate_scenario(client, index, args, stages):
+    response = await client.post("/translate_signwriting", json={"text": _text(index, args.repeat_inputs, 2)})
+    return response.status_code
+
+
+async def pose_scenario(client, index, args, stages):
+    response = await client.post("/generate_pose", json={"text": _text(index, args.repeat_inputs)})
+    await response.aread()
+    return response.status_code
+
+
+async def transcribe_scenario(client, index, args, stages):
+    audio = args.audio_bytes
+    if not args.repeat_inputs:
+        # Different bytes per request so the transcription is not coalesced with another
+        audio = audio + index.to_bytes(4, "little", signed=True)
+    response = await client.post(
+        "/transcribe", files={"audio": ("audio.wav", audio, "audio/wav")}, data={"timestamps": "segment"}
+    )
+    return response.status_code
+
+
+async def pipeline_scenario(client, index, args, stages):
+    data = {"text": _text(index, args.repeat_inputs, 3), "simplify_text": "true", "generate_pose": "true"}
+    started = time.perf_counter()
+    async with client.stream("POST", "/pipeline", data=data) as response:
+        if response.status_code != 200:
+            await response.aread()
+            return response.status_code
+        first = {}
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            stage = event.get("stage")
+            if stage == "error":
+                return f"error:{event.get('failed_stage', 'pipeline')}"
+            if stage not in first:
+                first[stage] = event.get("elapsed_ms", (time.perf_counter() - started) * 1000)
+        for stage, elapsed_ms in first.items():
+            stages[f"first_{stage}_ms"].append(elapsed_ms)
+    return response.status_code
+
+
+SCENARIOS = {
+    "simplify": simplify_scenario,
+    "translate": translate_scenario,
+    "pose": pose_scenario,
+    "transcribe": transcribe_scenario,
+    "pipeline": pipeline_scenario,
+}
+
+
+async def run_scenario(base_url, name, args, first_index=0):
+    """Send ``args.requests`` requests with ``args.concurrency`` in flight and measure them.
+
+    Request indices start at ``first_index`` so scenarios never share inputs
+    (and so never hit each other's cache entries).
+    """
+    scenario = SCENARIOS[name]
+    latencies, statuses, stages = [], Counter(), defaultdict(list)
+    indices = iter(range(first_index, first_index + args.requests))
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        for index in range(min(args.warmup, args.requests)):
+            await scenario(client, -1 - index, args, defaultdict(list))
+
+        async def worker():
+            for index in indices:
+                started = time.perf_counter()
+                try:
+                    status = await scenario(client, index, args, stages)
+                except httpx.HTTPError as exc:
+                    status = type(exc).__name__
+                latencies.append((time.perf_counter() - started) * 1000)
+                statuses[str(status)] += 1
+
+        rss_start = _rss_mb()
+        cpu_start = time.process_time()
+        started = time.perf_counter()
+        with RssSampler() as sampler:
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        cpu = time.process_time() - cpu_start
+
+    result = {
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "statuses": dict(statuses),
+        "error_rate": round(1 - statuses.get("200", 0) / max(1, len(latencies)), 4),
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        **summarize(latencies),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_utilization": round(cpu / elapsed, 3) if elapsed else None,
+        "rss_start_mb": round(rss_start, 1),
+        "rss_peak_mb": round(sampler.peak, 1),
+        "rss_end_mb": round(_rss_mb(), 1),
+    }
+    if stages:
+        result["stages"] = {stage: summarize(values) for stage, values in sorted(stages.items())}
+    return result
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, max_regression):
+    """Print metric changes against a previous run; returns the regressions beyond ``max_regression``."""
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in LOWER_IS_BETTER + ("throughput_rps",):
+            old, new = previous.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = change > max_regression if metric in LOWER_IS_BETTER else change < -max_regression
+            marker = "  REGRESSION" if worse else ""
+            print(f"  {name:<11} {metric:<15} {old:>10} -> {new:>10} ({change:+.1%}){marker}")
+            if worse:
+                regressions.append(f"{name}.{metric}")
+    return regressions
+
+
+def print_table(results):
+    print(f"\n{'scenario':<11} {'req':>5} {'ok%':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'cpu s':>7} {'rss MB':>8}")
+    for name, r in results["scenarios"].items():
+        ok = 100 * (1 - r["error_rate"])
+        print(
+            f"{name:<11} {r['requests']:>5} {ok:>6.1f} {r['throughput_rps'] or 0:>8.1f} "
+            f"{r['p50_ms'] or 0:>9.1f} {r['p95_ms'] or 0:>9.1f} {r['p99_ms'] or 0:>9.1f} "
+            f"{r['cpu_seconds']:>7.2f} {r['rss_peak_mb']:>8.1f}"
+        )
+        for stage, summary in r.get("stages", {}).items():
+            print(f"  {stage:<24} p50 {summary['p50_ms']:>9.1f}  p95 {summary['p95_ms']:>9.1f}")
+
+
+def configure_environment(upstream_url, args):
+    """Point the backend at the fakes; must run before the backend's config is imported."""
+    os.environ.update(urls(upstream_url))
+    os.environ["GROQ_API_KEY"] = "benchmark"
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Persistent caches would let one run's results leak into the next
+    os.environ["CACHE_DIR"] = ""
+    if args.no_cache:
+        os.environ["CACHE_MAX_ENTRIES"] = "0"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the backend against local fake upstreams")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"comma-separated: {', '.join(SCENARIOS)}")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast", help="fake upstream latency/failure profile")
+    parser.add_argument("--latency-ms", type=float, help="override the profile's upstream latency")
+    parser.add_argument("--jitter-ms", type=float, help="override the profile's latency jitter")
+    parser.add_argument("--failure-rate", type=float, help="override the profile's upstream failure rate")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100, help="requests per scenario")
+    parser.add_argument("--warmup", type=int, default=2, help="untimed requests before each scenario")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--repeat-inputs", action="store_true", help="send identical inputs (measures caches/coalescing)")
+    parser.add_argument("--no-cache", action="store_true", help="disable the backend's response caches")
+    parser.add_argument("--audio", type=Path, default=REPO_ROOT / "tests" / "test_file_converted.wav")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="previous --output file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed relative change before failing")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    # The backend runs from its own directory; resolve paths given relative to the caller first
+    for name in ("output", "compare"):
+        if getattr(args, name):
+            setattr(args, name, getattr(args, name).resolve())
+    args.audio_bytes = args.audio.read_bytes() if args.audio.exists() else b"RIFF"
+
+    profile = dict(PROFILES[args.profile])
+    for name in profile:
+        if getattr(args, name) is not None:
+            profile[name] = getattr(args, name)
+
+    upstream = ServerThread(create_app(seed=args.seed, **profile)).start()
+    configure_environment(upstream.url, args)
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, str(BACKEND_DIR))
+    import main as backend  # noqa: E402  (imported after the environment is set)
+
+    started = time.perf_counter()
+    server = ServerThread(backend.app).start(timeout=600)
+    startup_seconds = time.perf_counter() - started
+
+    results = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "profile": {"name": args.profile, **profile},
+        "settings": {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "repeat_inputs": args.repeat_inputs,
+            "no_cache": args.no_cache,
+        },
+        "startup_seconds": round(startup_seconds, 3),
+        "scenarios": {},
+    }
+    try:
+        for position, name in enumerate(names):
+            print(f"Running {name} ({args.requests} requests, concurrency {args.concurrency})...", file=sys.stderr)
+            results["scenarios"][name] = asyncio.run(run_scenario(server.url, name, args, position * args.requests))
+        results["upstream_calls"] = dict(upstream.server.config.app.state.calls)
+    finally:
+        server.stop()
+        upstream.stop()
+
+    print_table(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+        print(f"\nWrote {args.output}")
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text()), args.max_regression)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.max_regression:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()